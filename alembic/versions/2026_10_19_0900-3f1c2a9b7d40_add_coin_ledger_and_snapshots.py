@@ -0,0 +1,92 @@
+"""add coin ledger and snapshots
+
+Revision ID: 3f1c2a9b7d40
+Revises: 05dc4f58d750
+Create Date: 2026-10-19 09:00:12.418302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9b7d40"
+down_revision: Union[str, None] = "05dc4f58d750"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "coin_ledger",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(length=20), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_coin_ledger_user_id_id", "coin_ledger", ["user_id", "id"], unique=False
+    )
+    op.create_table(
+        "coin_snapshots",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.Column("last_ledger_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+    # 기존 보유 코인을 초기 스냅샷으로 옮깁니다.
+    op.execute(
+        """
+        INSERT INTO coin_snapshots (user_id, balance, last_ledger_id)
+        SELECT id, coin, 0 FROM users
+        """
+    )
+    op.drop_column("users", "coin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("coin", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE users SET coin = COALESCE(s.balance, 0) + (
+            SELECT COALESCE(SUM(l.amount), 0) FROM coin_ledger l
+            WHERE l.user_id = users.id AND l.id > COALESCE(s.last_ledger_id, 0)
+        )
+        FROM (SELECT id FROM users) u
+        LEFT JOIN coin_snapshots s ON s.user_id = u.id
+        WHERE u.id = users.id
+        """
+    )
+    op.drop_table("coin_snapshots")
+    op.drop_index("ix_coin_ledger_user_id_id", table_name="coin_ledger")
+    op.drop_table("coin_ledger")
@@ -0,0 +1,29 @@
+"""add store catalog version sequence
+
+Revision ID: 8a4e6d21c5f3
+Revises: 3f1c2a9b7d40
+Create Date: 2026-10-19 10:30:47.905126
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4e6d21c5f3"
+down_revision: Union[str, None] = "3f1c2a9b7d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence("store_catalog_version_seq")))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence("store_catalog_version_seq")))
@@ -0,0 +1,41 @@
+"""add diaries user_id updated_at id index
+
+Revision ID: c71b90e4d2a8
+Revises: 8a4e6d21c5f3
+Create Date: 2026-10-19 11:45:03.211587
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c71b90e4d2a8"
+down_revision: Union[str, None] = "8a4e6d21c5f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_diaries_user_id_updated_at_id",
+            "diaries",
+            ["user_id", "updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_diaries_user_id_updated_at_id",
+            table_name="diaries",
+            postgresql_concurrently=True,
+        )
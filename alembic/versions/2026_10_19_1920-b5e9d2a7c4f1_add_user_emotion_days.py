@@ -0,0 +1,99 @@
+"""add user emotion days
+
+Revision ID: b5e9d2a7c4f1
+Revises: d6f1a3c9e7b2
+Create Date: 2026-10-19 19:20:41.318275
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e9d2a7c4f1"
+down_revision: Union[str, None] = "d6f1a3c9e7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# application.constants.Emotion 의 감정 코드
+EMOTION_CODES = {
+    "NEUTRAL": 1,
+    "HAPPY": 2,
+    "SAD": 3,
+    "ANXIOUS": 4,
+    "ANGRY": 5,
+    "TIRED": 6,
+    "LONELY": 7,
+    "BORED": 8,
+    "REGRETFUL": 9,
+    "HOPEFUL": 10,
+    "JEALOUS": 11,
+    "CONFUSED": 12,
+    "EMBARRASSED": 13,
+}
+PARTITION_MONTHS_AHEAD = 3
+
+
+def get_month_start(day: date, months: int = 0) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_emotion_days",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("emotion", sa.SmallInteger(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        postgresql_partition_by="RANGE (date)",
+    )
+    op.create_index(
+        "ix_user_emotion_days_user_id_date",
+        "user_emotion_days",
+        ["user_id", "date"],
+        unique=True,
+        postgresql_include=["emotion"],
+    )
+    op.execute(
+        "CREATE TABLE user_emotion_days_default PARTITION OF user_emotion_days DEFAULT"
+    )
+
+    # 기존 일기가 있는 달부터 앞으로 몇 달까지의 파티션을 만든 뒤 채웁니다.
+    first_date = op.get_bind().scalar(sa.text("SELECT min(date) FROM diaries"))
+    month_start = get_month_start(first_date or date.today())
+    last_month_start = get_month_start(date.today(), months=PARTITION_MONTHS_AHEAD)
+    while month_start <= last_month_start:
+        next_month_start = get_month_start(month_start, months=1)
+        op.execute(
+            f"CREATE TABLE user_emotion_days_{month_start:%Y_%m} "
+            f"PARTITION OF user_emotion_days "
+            f"FOR VALUES FROM ('{month_start.isoformat()}') "
+            f"TO ('{next_month_start.isoformat()}')"
+        )
+        month_start = next_month_start
+
+    emotion_cases = " ".join(
+        f"WHEN '{name}' THEN {code}" for name, code in EMOTION_CODES.items()
+    )
+    op.execute(
+        f"""
+        INSERT INTO user_emotion_days (user_id, date, emotion)
+        SELECT DISTINCT ON (user_id, date)
+            user_id, date, CASE analyzed_emotion {emotion_cases} END
+        FROM diaries
+        ORDER BY user_id, date, id DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_emotion_days_user_id_date", table_name="user_emotion_days")
+    # 파티션은 부모 테이블과 함께 삭제됩니다.
+    op.drop_table("user_emotion_days")
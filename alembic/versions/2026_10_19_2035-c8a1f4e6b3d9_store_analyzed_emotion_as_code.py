@@ -0,0 +1,123 @@
+"""store analyzed emotion as code
+
+Revision ID: c8a1f4e6b3d9
+Revises: b5e9d2a7c4f1
+Create Date: 2026-10-19 20:35:12.604837
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8a1f4e6b3d9"
+down_revision: Union[str, None] = "b5e9d2a7c4f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# application.constants.Emotion 의 감정 코드
+EMOTION_CODES = {
+    "NEUTRAL": 1,
+    "HAPPY": 2,
+    "SAD": 3,
+    "ANXIOUS": 4,
+    "ANGRY": 5,
+    "TIRED": 6,
+    "LONELY": 7,
+    "BORED": 8,
+    "REGRETFUL": 9,
+    "HOPEFUL": 10,
+    "JEALOUS": 11,
+    "CONFUSED": 12,
+    "EMBARRASSED": 13,
+}
+BATCH_SIZE = 5000
+
+
+def get_code_expression(column: str) -> str:
+    cases = " ".join(
+        f"WHEN '{name}' THEN {code}" for name, code in EMOTION_CODES.items()
+    )
+    return f"CASE {column} {cases} END"
+
+
+def get_name_expression(column: str) -> str:
+    cases = " ".join(
+        f"WHEN {code} THEN '{name}'" for name, code in EMOTION_CODES.items()
+    )
+    return f"CASE {column} {cases} END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "diaries", sa.Column("analyzed_emotion_code", sa.SmallInteger(), nullable=True)
+    )
+
+    # 채우는 동안 새로 쓰이는 감정도 코드로 함께 저장되도록 합니다.
+    op.execute(
+        f"""
+        CREATE FUNCTION diaries_sync_analyzed_emotion_code() RETURNS trigger AS $$
+        BEGIN
+            NEW.analyzed_emotion_code := {get_code_expression("NEW.analyzed_emotion")};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER diaries_sync_analyzed_emotion_code
+        BEFORE INSERT OR UPDATE OF analyzed_emotion ON diaries
+        FOR EACH ROW EXECUTE FUNCTION diaries_sync_analyzed_emotion_code()
+        """
+    )
+
+    # 기존 행은 ID 범위별로 나누어 배치마다 커밋하므로, 행 잠금이 짧게 유지됩니다.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        max_id = connection.scalar(sa.text("SELECT max(id) FROM diaries")) or 0
+        for start_id in range(0, max_id, BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    f"""
+                    UPDATE diaries
+                    SET analyzed_emotion_code = {get_code_expression("analyzed_emotion")}
+                    WHERE id > :start_id AND id <= :end_id
+                    AND analyzed_emotion IS NOT NULL
+                    AND analyzed_emotion_code IS NULL
+                    """
+                ),
+                {"start_id": start_id, "end_id": start_id + BATCH_SIZE},
+            )
+
+    # 컬럼 교체는 카탈로그만 변경하므로, 잠금을 오래 기다리지 않도록 제한합니다.
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute("DROP TRIGGER diaries_sync_analyzed_emotion_code ON diaries")
+    op.execute("DROP FUNCTION diaries_sync_analyzed_emotion_code()")
+    op.drop_column("diaries", "analyzed_emotion")
+    op.alter_column(
+        "diaries", "analyzed_emotion_code", new_column_name="analyzed_emotion"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "diaries",
+        sa.Column("analyzed_emotion_name", sa.String(length=20), nullable=True),
+    )
+    op.execute(
+        f"""
+        UPDATE diaries
+        SET analyzed_emotion_name = {get_name_expression("analyzed_emotion")}
+        WHERE analyzed_emotion IS NOT NULL
+        """
+    )
+    op.drop_column("diaries", "analyzed_emotion")
+    op.alter_column(
+        "diaries", "analyzed_emotion_name", new_column_name="analyzed_emotion"
+    )
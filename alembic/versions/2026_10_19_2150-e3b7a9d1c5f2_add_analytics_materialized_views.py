@@ -0,0 +1,73 @@
+"""add analytics materialized views
+
+Revision ID: e3b7a9d1c5f2
+Revises: c8a1f4e6b3d9
+Create Date: 2026-10-19 21:50:08.227514
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b7a9d1c5f2"
+down_revision: Union[str, None] = "c8a1f4e6b3d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY 를 사용하려면 각 뷰에 유니크 인덱스가 필요합니다.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_daily_emotion_counts AS
+        SELECT date, emotion, count(*) AS diary_count
+        FROM user_emotion_days
+        WHERE emotion IS NOT NULL
+        GROUP BY date, emotion
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ix_mv_daily_emotion_counts_date_emotion "
+        "ON mv_daily_emotion_counts (date, emotion)"
+    )
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_daily_active_users AS
+        SELECT date, count(*) AS active_users, count(emotion) AS analyzed_users
+        FROM user_emotion_days
+        GROUP BY date
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ix_mv_daily_active_users_date "
+        "ON mv_daily_active_users (date)"
+    )
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_report_counts AS
+        SELECT 'weekly' AS report_type, start_date, count(*) AS report_count
+        FROM weekly_reports
+        GROUP BY start_date
+        UNION ALL
+        SELECT 'monthly' AS report_type, start_date, count(*) AS report_count
+        FROM monthly_reports
+        GROUP BY start_date
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ix_mv_report_counts_report_type_start_date "
+        "ON mv_report_counts (report_type, start_date)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW mv_report_counts")
+    op.execute("DROP MATERIALIZED VIEW mv_daily_active_users")
+    op.execute("DROP MATERIALIZED VIEW mv_daily_emotion_counts")
@@ -0,0 +1,42 @@
+"""add diaries search text index
+
+Revision ID: f4c2d8e6a1b7
+Revises: e3b7a9d1c5f2
+Create Date: 2026-10-19 22:30:41.538902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f4c2d8e6a1b7"
+down_revision: Union[str, None] = "e3b7a9d1c5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm 은 트라이그램 연산자 클래스를, btree_gin 은 GIN 인덱스에서 정수 컬럼(user_id) 을 지원합니다.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    # 일기가 많으므로 쓰기를 막지 않도록 CONCURRENTLY 로 생성합니다.
+    # 인덱스 식은 application.models.diary_search_text 와 같아야 합니다.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_diaries_user_id_search_text
+            ON diaries USING gin (user_id, (title || ' ' || content) gin_trgm_ops)
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 확장은 다른 객체에서 사용할 수 있으므로 삭제하지 않습니다.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_diaries_user_id_search_text")
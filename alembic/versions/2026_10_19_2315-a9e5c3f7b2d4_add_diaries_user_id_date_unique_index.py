@@ -0,0 +1,58 @@
+"""add diaries user_id date unique index
+
+Revision ID: a9e5c3f7b2d4
+Revises: f4c2d8e6a1b7
+Create Date: 2026-10-19 23:15:27.880314
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9e5c3f7b2d4"
+down_revision: Union[str, None] = "f4c2d8e6a1b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 일기 작성 API 는 같은 날짜의 일기가 있는지 확인한 뒤 추가하므로, 동시에 요청한 경우에만 중복이 생길 수 있습니다.
+    # 중복된 일기는 어느 쪽을 남길지 정할 수 없으므로, 직접 정리한 뒤 다시 실행하도록 합니다.
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT user_id, date FROM diaries "
+                "GROUP BY user_id, date HAVING count(*) > 1 LIMIT 10"
+            )
+        )
+        .all()
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"같은 날짜에 작성된 일기가 있어 유니크 인덱스를 만들 수 없습니다: {duplicates}"
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_diaries_user_id_date",
+            "diaries",
+            ["user_id", "date"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_diaries_user_id_date",
+            table_name="diaries",
+            postgresql_concurrently=True,
+        )
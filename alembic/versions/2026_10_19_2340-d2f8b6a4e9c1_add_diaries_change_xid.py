@@ -0,0 +1,84 @@
+"""add diaries change xid
+
+Revision ID: d2f8b6a4e9c1
+Revises: a9e5c3f7b2d4
+Create Date: 2026-10-19 23:40:52.104733
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f8b6a4e9c1"
+down_revision: Union[str, None] = "a9e5c3f7b2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 상수 기본값이므로 테이블을 다시 쓰지 않습니다. 기존 일기는 0 이며, ID 순서로 조회됩니다.
+    op.add_column(
+        "diaries",
+        sa.Column(
+            "change_xid", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+
+    # ORM 을 거치지 않는 INSERT/UPDATE 에서도 빠짐없이 기록되도록 트리거로 채웁니다.
+    op.execute(
+        """
+        CREATE FUNCTION diaries_set_change_xid() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER diaries_set_change_xid
+        BEFORE INSERT OR UPDATE ON diaries
+        FOR EACH ROW EXECUTE FUNCTION diaries_set_change_xid()
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_diaries_user_id_change_xid_id",
+            "diaries",
+            ["user_id", "change_xid", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_diaries_user_id_updated_at_id",
+            table_name="diaries",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_diaries_user_id_updated_at_id",
+            "diaries",
+            ["user_id", "updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_diaries_user_id_change_xid_id",
+            table_name="diaries",
+            postgresql_concurrently=True,
+        )
+
+    op.execute("DROP TRIGGER diaries_set_change_xid ON diaries")
+    op.execute("DROP FUNCTION diaries_set_change_xid()")
+    op.drop_column("diaries", "change_xid")
@@ -0,0 +1,123 @@
+"""add coin ledger created xid
+
+Revision ID: b7d3e1f9a2c6
+Revises: d2f8b6a4e9c1
+Create Date: 2026-10-19 23:50:08.517236
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3e1f9a2c6"
+down_revision: Union[str, None] = "d2f8b6a4e9c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# application.coins.COIN_LEDGER_COMPACT_LOCK_KEY
+COIN_LEDGER_COMPACT_LOCK_KEY = 1001
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 압축 작업과 동시에 실행되지 않도록 하고, 컬럼을 추가하면서 원장을 잠가 커밋될 때까지 새 내역이 추가되지 않도록 합니다.
+    op.execute(f"SELECT pg_advisory_xact_lock({COIN_LEDGER_COMPACT_LOCK_KEY})")
+
+    # 기존 내역은 0 이며, 이후 추가되는 내역은 추가한 트랜잭션의 ID 를 기본값으로 가집니다.
+    op.add_column(
+        "coin_ledger",
+        sa.Column(
+            "created_xid", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.alter_column(
+        "coin_ledger",
+        "created_xid",
+        server_default=sa.text("pg_current_xact_id()::text::bigint"),
+    )
+
+    # 기존 스냅샷에 아직 반영되지 않은 내역까지 합산하여, 기존 내역(트랜잭션 ID 0) 이 모두 반영된 상태로 만듭니다.
+    # 스냅샷이 없는 사용자는 모든 내역이 합산되므로 그대로 둡니다.
+    op.add_column(
+        "coin_snapshots",
+        sa.Column(
+            "ledger_xmin", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.execute(
+        """
+        UPDATE coin_snapshots s SET
+            balance = s.balance + COALESCE(
+                (
+                    SELECT SUM(l.amount) FROM coin_ledger l
+                    WHERE l.user_id = s.user_id AND l.id > s.last_ledger_id
+                ),
+                0
+            ),
+            ledger_xmin = 1
+        """
+    )
+    op.drop_column("coin_snapshots", "last_ledger_id")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_coin_ledger_user_id_created_xid",
+            "coin_ledger",
+            ["user_id", "created_xid"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_coin_ledger_user_id_id",
+            table_name="coin_ledger",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_coin_ledger_user_id_id",
+            "coin_ledger",
+            ["user_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_coin_ledger_user_id_created_xid",
+            table_name="coin_ledger",
+            postgresql_concurrently=True,
+        )
+
+    op.execute(f"SELECT pg_advisory_xact_lock({COIN_LEDGER_COMPACT_LOCK_KEY})")
+    op.execute("LOCK TABLE coin_ledger IN EXCLUSIVE MODE")
+
+    # 아직 스냅샷에 반영되지 않은 내역까지 합산하여, 지금까지의 모든 내역이 반영된 스냅샷으로 되돌립니다.
+    op.add_column(
+        "coin_snapshots",
+        sa.Column(
+            "last_ledger_id", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    op.execute(
+        """
+        UPDATE coin_snapshots s SET
+            balance = s.balance + COALESCE(
+                (
+                    SELECT SUM(l.amount) FROM coin_ledger l
+                    WHERE l.user_id = s.user_id AND l.created_xid >= s.ledger_xmin
+                ),
+                0
+            ),
+            last_ledger_id = COALESCE(
+                (SELECT MAX(l.id) FROM coin_ledger l WHERE l.user_id = s.user_id), 0
+            )
+        """
+    )
+    op.drop_column("coin_snapshots", "ledger_xmin")
+    op.drop_column("coin_ledger", "created_xid")
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from sqladmin import Admin
@@ -8,26 +10,47 @@ from starlette.responses import JSONResponse
 
 from application.admin import (
     UserAdmin,
+    CoinLedgerAdmin,
     DiaryAdmin,
     StoreItemAdmin,
     UserItemAdmin,
     WeeklyReportAdmin,
     MonthlyReportAdmin,
     MindContentAdmin,
+    MetricsAdmin,
+    AnalyticsAdmin,
 )
 from application.monkeypatch import apply_monkeypatch
+from application.tasks import create_background_tasks
 from application.routers.users import router as users_router
 from application.routers.diaries import router as diaries_router
 from application.routers.analysis import router as day_analysis_router
 from application.routers.stores import router as stores_router
+from application.routers.images import router as images_router
+from application.routers.files import router as files_router
+from application.emotion_analysis import emotion_analysis_queue
+from application.images import image_variant_generator
 from config.db import engine
+from config.security import password_hasher, PasswordHasherBusy
 from config.settings import settings
 
 
 def create_app() -> FastAPI:
     apply_monkeypatch()
 
-    app = FastAPI(title=settings.PROJECT_NAME)
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        background_tasks = create_background_tasks()
+        for task in background_tasks:
+            task.start()
+        yield
+        for task in background_tasks:
+            task.stop()
+        password_hasher.shutdown()
+        image_variant_generator.shutdown()
+        emotion_analysis_queue.shutdown()
+
+    app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
     @app.exception_handler(Exception)
     async def internal_server_error(request: Request, exc: Exception) -> JSONResponse:
@@ -36,6 +59,16 @@ def create_app() -> FastAPI:
             content={"detail": "서버 내부 오류가 발생했습니다."},
         )
 
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy_handler(
+        request: Request, exc: PasswordHasherBusy
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "요청이 많아 잠시 후 다시 시도해주세요."},
+            headers={"Retry-After": "1"},
+        )
+
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
         request: Request, exc: RequestValidationError
@@ -58,12 +91,15 @@ def create_app() -> FastAPI:
     # Admin setup
     admin = Admin(app, engine=engine, title=settings.ADMIN_TITLE)
     admin.add_view(UserAdmin)
+    admin.add_view(CoinLedgerAdmin)
     admin.add_view(DiaryAdmin)
     admin.add_view(MindContentAdmin)
     admin.add_view(WeeklyReportAdmin)
     admin.add_view(MonthlyReportAdmin)
     admin.add_view(StoreItemAdmin)
     admin.add_view(UserItemAdmin)
+    admin.add_base_view(MetricsAdmin)
+    admin.add_base_view(AnalyticsAdmin)
 
     # Include routers
     app.include_router(
@@ -86,5 +122,15 @@ def create_app() -> FastAPI:
         prefix="/api/v1/stores",
         tags=["상점 API"],
     )
+    app.include_router(
+        router=images_router,
+        prefix="/api/v1/images",
+        tags=["이미지 API"],
+    )
+    app.include_router(
+        router=files_router,
+        prefix="/api/v1/files",
+        tags=["파일 API"],
+    )
 
     return app
@@ -2,9 +2,13 @@ from typing import Any
 
 from fastapi import UploadFile
 from markupsafe import Markup
-from sqladmin import ModelView
-from sqlalchemy.orm import object_session
+from sqladmin import ModelView, BaseView, expose
+from sqlalchemy import Select, select
+from sqlalchemy.orm import object_session, undefer, load_only, selectinload
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 from wtforms import (
     Form,
     StringField,
@@ -12,32 +16,62 @@ from wtforms import (
     TextAreaField,
     validators,
     FileField,
+    SelectField,
 )
 
+from application.admin_export import StreamingExportMixin
+from application.admin_pagination import LargeTableMixin
+from application.analytics import get_admin_analytics, get_analytics_metrics
+from application.catalog import bump_store_catalog_version
+from application.constants import Emotion
 from application.models import (
     User,
+    CoinLedger,
     Diary,
     StoreItem,
     UserItem,
     WeeklyReport,
     MonthlyReport,
     MindContent,
+    diary_search_text,
 )
-from application.utils import write_file, remove_file
+from application.crud import register_stored_files, release_stored_files
+from application.emotion_analysis import emotion_analysis_queue
+from application.images import image_variant_generator
+from application.storage import get_storage
+from application.upload_gc import get_upload_gc_metrics
+from application.utils import write_file, escape_like
+from config.db import SessionLocal
+from config.ratelimit import get_rate_limit_metrics
+from config.security import password_hasher
 from config.settings import settings
 
 
+def coerce_emotion(value: Emotion | str | None) -> Emotion | None:
+    if value is None or isinstance(value, Emotion):
+        return value
+    return Emotion.from_name(value) if value else None
+
+
+def format_emotion(emotion: Emotion | None) -> str:
+    return f"{emotion.emoji} {emotion.korean_name}" if emotion else ""
+
+
 class FileUploadField(FileField):
     def process_formdata(self, valuelist: list[UploadFile]):
         if valuelist:
             if isinstance(valuelist[0], str):
                 self.data = valuelist[0]
                 return
-            path = write_file("admin", valuelist[0])
-            self.data = path
+            stored_file = write_file(valuelist[0])
+            # 폼 저장과 별개로 등록하므로, 저장에 실패하면 참조 횟수가 남아 파일이 보존되는 쪽으로 어긋납니다.
+            with SessionLocal.begin() as db_session:
+                register_stored_files(db_session, [stored_file])
+            image_variant_generator.submit([stored_file.path])
+            self.data = stored_file.path
 
 
-class UserAdmin(ModelView, model=User):
+class UserAdmin(StreamingExportMixin, ModelView, model=User):
     name = "사용자"
     name_plural = "사용자 관리"
     icon = "fa-solid fa-user"
@@ -86,10 +120,12 @@ class UserAdmin(ModelView, model=User):
         User.login_id,
         User.nickname,
         User.diaries,
-        User.coin,
         User.items,
     ]
 
+    def list_query(self, request: Request) -> Select:
+        return select(User).options(undefer(User.coin))
+
     async def on_model_change(
         self, data: dict, model: User, is_created: bool, request: Request
     ) -> None:
@@ -103,7 +139,51 @@ class UserAdmin(ModelView, model=User):
                 session.delete(item)
 
 
-class DiaryAdmin(ModelView, model=Diary):
+class CoinLedgerAdmin(
+    StreamingExportMixin, LargeTableMixin, ModelView, model=CoinLedger
+):
+    name = "코인 내역"
+    name_plural = "코인 내역 관리"
+    icon = "fa-solid fa-coins"
+
+    can_create = False
+    can_edit = False
+    can_delete = False
+
+    column_labels = {
+        CoinLedger.id: "내역 ID",
+        CoinLedger.user: "사용자",
+        CoinLedger.amount: "금액",
+        CoinLedger.reason: "사유",
+        CoinLedger.created_at: "일시",
+    }
+    column_formatters = {
+        CoinLedger.amount: lambda m, _: f"{m.amount:+d} 코인",
+        CoinLedger.created_at: lambda m, _: m.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    column_list = [
+        CoinLedger.id,
+        CoinLedger.user,
+        CoinLedger.amount,
+        CoinLedger.reason,
+        CoinLedger.created_at,
+    ]
+    column_details_list = [
+        CoinLedger.id,
+        CoinLedger.user,
+        CoinLedger.amount,
+        CoinLedger.reason,
+        CoinLedger.created_at,
+    ]
+    column_default_sort = [(CoinLedger.id, True)]
+
+    def list_query(self, request: Request) -> Select:
+        return select(CoinLedger).options(
+            selectinload(CoinLedger.user).load_only(User.id, User.login_id)
+        )
+
+
+class DiaryAdmin(StreamingExportMixin, LargeTableMixin, ModelView, model=Diary):
     name = "일기"
     name_plural = "일기 관리"
     icon = "fa-solid fa-book"
@@ -133,6 +213,7 @@ class DiaryAdmin(ModelView, model=Diary):
         Diary.title,
         Diary.content,
     ]
+    column_default_sort = [(Diary.id, True)]
     column_details_list = [
         Diary.id,
         Diary.user,
@@ -146,23 +227,66 @@ class DiaryAdmin(ModelView, model=Diary):
         Diary.updated_at,
     ]
     column_formatters = {
+        Diary.analyzed_emotion: lambda m, _: format_emotion(m.analyzed_emotion),
         Diary.created_at: lambda m, _: m.created_at.strftime("%Y-%m-%d %H:%M:%S"),
         Diary.updated_at: lambda m, _: m.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
     }
     column_formatters_detail = {
+        Diary.analyzed_emotion: lambda m, _: format_emotion(m.analyzed_emotion),
         Diary.created_at: lambda m, _: m.created_at.strftime("%Y-%m-%d %H:%M:%S"),
         Diary.updated_at: lambda m, _: m.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
     }
+    # 변경 트랜잭션 ID 는 트리거가 채웁니다.
+    form_excluded_columns = [Diary.change_xid]
+    # 감정은 감정 코드로 저장되므로, 감정 이름으로 선택하도록 합니다.
+    form_overrides = {"analyzed_emotion": SelectField}
+    form_args = {
+        "analyzed_emotion": {
+            "choices": [("", "분석 전")]
+            + [(emotion.name, format_emotion(emotion)) for emotion in Emotion],
+            "coerce": coerce_emotion,
+        }
+    }
+
+    def list_query(self, request: Request) -> Select:
+        # 목록에 표시하지 않는 본문과 이미지 경로는 불러오지 않습니다.
+        return select(Diary).options(
+            load_only(
+                Diary.id,
+                Diary.user_id,
+                Diary.date,
+                Diary.title,
+                Diary.analyzed_emotion,
+                Diary.created_at,
+                Diary.updated_at,
+            ),
+            selectinload(Diary.user).load_only(User.id, User.login_id),
+        )
+
+    def search_query(self, stmt: Select, term: str) -> Select:
+        # 제목과 본문을 각각 ILIKE 로 검색하면 모든 일기 본문을 읽어야 하므로,
+        # 트라이그램 인덱스와 같은 식(제목 + 본문)으로 한 번에 검색합니다.
+        return stmt.filter(
+            diary_search_text.ilike(f"%{escape_like(term)}%", escape="\\")
+        )
+
+    async def on_model_delete(self, model: Any, request: Request) -> None:
+        """
+        일기가 삭제될 때, 일기에 첨부된 이미지 파일의 참조를 해제합니다.
+        """
+        release_stored_files(object_session(model), model.image_urls or [])
 
 
 def format_image_url(model, attribute) -> Markup:
+    image_url = get_storage().get_url(
+        getattr(model, attribute), f"http://{settings.SERVER_HOST}/"
+    )
     return Markup(
-        f'<img src="http://{settings.SERVER_HOST}/{getattr(model, attribute)}" '
-        f'style="max-width: 100px; max-height: 100px;" />'
+        f'<img src="{image_url}" ' f'style="max-width: 100px; max-height: 100px;" />'
     )
 
 
-class MindContentAdmin(ModelView, model=MindContent):
+class MindContentAdmin(StreamingExportMixin, ModelView, model=MindContent):
     name = "마음챙김 콘텐츠"
     name_plural = "마음챙김 콘텐츠 관리"
     icon = "fa-solid fa-heart"
@@ -187,7 +311,7 @@ class MindContentAdmin(ModelView, model=MindContent):
     ]
 
 
-class WeeklyReportAdmin(ModelView, model=WeeklyReport):
+class WeeklyReportAdmin(StreamingExportMixin, ModelView, model=WeeklyReport):
     name = "주간 리포트"
     name_plural = "주간 리포트 관리"
     icon = "fa-solid fa-calendar-week"
@@ -216,7 +340,7 @@ class WeeklyReportAdmin(ModelView, model=WeeklyReport):
     ]
 
 
-class MonthlyReportAdmin(ModelView, model=MonthlyReport):
+class MonthlyReportAdmin(StreamingExportMixin, ModelView, model=MonthlyReport):
     name = "월간 리포트"
     name_plural = "월간 리포트 관리"
     icon = "fa-solid fa-calendar-alt"
@@ -245,7 +369,7 @@ class MonthlyReportAdmin(ModelView, model=MonthlyReport):
     ]
 
 
-class StoreItemAdmin(ModelView, model=StoreItem):
+class StoreItemAdmin(StreamingExportMixin, ModelView, model=StoreItem):
     name = "상점 아이템"
     name_plural = "상점 아이템 관리"
     icon = "fa-solid fa-store"
@@ -276,12 +400,43 @@ class StoreItemAdmin(ModelView, model=StoreItem):
         StoreItem.applied_image_url,
     ]
 
+    async def on_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        """
+        아이템 이미지가 새 파일로 바뀌면, 이전 이미지 파일의 참조를 해제합니다.
+        """
+        if is_created:
+            return
+        replaced_paths = [
+            getattr(model, field)
+            for field in ("item_image_url", "applied_image_url")
+            if field in data and data[field] != getattr(model, field)
+        ]
+        release_stored_files(object_session(model), replaced_paths)
+
     async def on_model_delete(self, model: Any, request: Request) -> None:
         """
-        모델 삭제 시 호출되는 메서드로, 상점 아이템이 삭제될 때 관련된 이미지 파일도 삭제합니다.
+        모델 삭제 시 호출되는 메서드로, 상점 아이템이 삭제될 때 관련된 이미지 파일의 참조를 해제합니다.
+        다른 곳에서 참조하지 않는 파일은 유예 기간이 지난 뒤 삭제됩니다.
         """
-        if model.item_image_url:
-            remove_file(model.item_image_url)
+        release_stored_files(
+            object_session(model), [model.item_image_url, model.applied_image_url]
+        )
+
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        """
+        아이템이 생성/수정되어 커밋된 후, 상점 카탈로그 캐시를 무효화합니다.
+        """
+        bump_store_catalog_version()
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        """
+        아이템이 삭제되어 커밋된 후, 상점 카탈로그 캐시를 무효화합니다.
+        """
+        bump_store_catalog_version()
 
     column_formatters = {
         "item_image_url": format_image_url,
@@ -303,7 +458,7 @@ class StoreItemAdmin(ModelView, model=StoreItem):
     form = StoreItemForm
 
 
-class UserItemAdmin(ModelView, model=UserItem):
+class UserItemAdmin(StreamingExportMixin, LargeTableMixin, ModelView, model=UserItem):
     name = "사용자 아이템"
     name_plural = "사용자 아이템 관리"
     icon = "fa-solid fa-box"
@@ -337,3 +492,80 @@ class UserItemAdmin(ModelView, model=UserItem):
         UserItem.equipped,
         UserItem.created_at,
     ]
+    column_default_sort = [(UserItem.id, True)]
+
+    def list_query(self, request: Request) -> Select:
+        return select(UserItem).options(
+            selectinload(UserItem.user).load_only(
+                User.id, User.login_id, User.nickname
+            ),
+            selectinload(UserItem.item).load_only(
+                StoreItem.id, StoreItem.name, StoreItem.price
+            ),
+        )
+
+
+def get_server_metrics() -> dict[str, dict[str, int]]:
+    return {
+        "password_hasher": password_hasher.metrics(),
+        "image_variant_generator": image_variant_generator.metrics(),
+        "emotion_analysis_queue": emotion_analysis_queue.metrics(),
+        **get_rate_limit_metrics(),
+        **get_upload_gc_metrics(),
+        **get_analytics_metrics(),
+    }
+
+
+class MetricsAdmin(BaseView):
+    name = "서버 지표"
+    icon = "fa-solid fa-gauge"
+
+    @expose("/metrics", methods=["GET"])
+    async def metrics_page(self, request: Request):
+        return await self.templates.TemplateResponse(
+            request,
+            "sqladmin/metrics.html",
+            context={"metrics": get_server_metrics()},
+        )
+
+    @expose("/metrics/json", methods=["GET"])
+    async def metrics_json(self, request: Request):
+        return JSONResponse(get_server_metrics())
+
+
+def load_admin_analytics(days: int) -> dict[str, Any]:
+    with SessionLocal() as db_session:
+        return get_admin_analytics(db_session, days=days)
+
+
+class AnalyticsAdmin(BaseView):
+    name = "감정 통계"
+    icon = "fa-solid fa-chart-line"
+
+    @staticmethod
+    def get_days(request: Request) -> int:
+        try:
+            days = int(
+                request.query_params.get("days", settings.ANALYTICS_DASHBOARD_DAYS)
+            )
+        except ValueError:
+            days = settings.ANALYTICS_DASHBOARD_DAYS
+        return min(max(days, 1), 366)
+
+    @expose("/analytics", methods=["GET"])
+    async def analytics_page(self, request: Request):
+        analytics = await run_in_threadpool(
+            load_admin_analytics, self.get_days(request)
+        )
+        return await self.templates.TemplateResponse(
+            request,
+            "sqladmin/analytics.html",
+            context={"analytics": analytics, "emotions": list(Emotion)},
+        )
+
+    @expose("/analytics/json", methods=["GET"])
+    async def analytics_json(self, request: Request):
+        analytics = await run_in_threadpool(
+            load_admin_analytics, self.get_days(request)
+        )
+        return JSONResponse(jsonable_encoder(analytics))
@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+from typing import Any
+
+from sqladmin import ModelView
+from sqladmin.pagination import Pagination, PageControl
+from sqlalchemy import (
+    Select,
+    BigInteger,
+    select,
+    func,
+    case,
+    cast,
+    table,
+    column,
+    literal,
+)
+from sqlalchemy.orm import selectinload
+from starlette.datastructures import URL
+from starlette.requests import Request
+
+KEYSET_PARAMS = ("after", "before")
+
+pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
+@dataclass
+class KeysetPagination(Pagination):
+    """
+    이전/다음 페이지 URL 에 현재 페이지의 첫 번째/마지막 행의 기본 키를 함께 넣는 페이지네이션
+    인접한 페이지로 이동할 때는 OFFSET 없이 기본 키 인덱스로 바로 조회합니다.
+    """
+
+    first_key: Any = None
+    last_key: Any = None
+    has_more: bool = False
+
+    def __post_init__(self) -> None:
+        # 행 수가 추정치일 수 있으므로, 기본 구현처럼 현재 페이지를 행 수로 제한하지 않습니다.
+        pass
+
+    @property
+    def has_next(self) -> bool:
+        return self.has_more
+
+    def add_pagination_urls(self, base_url: URL) -> None:
+        super().add_pagination_urls(base_url)
+
+        # 기본 구현은 행 수로 다음 페이지 버튼을 만들기 때문에, 추정치가 실제보다 작으면 버튼이 빠집니다.
+        # 다음 행이 있으면 next_page 가 항상 찾을 수 있도록 다음 페이지 버튼을 추가합니다.
+        next_page = self.page + 1
+        if self.has_more and all(
+            page_control.number != next_page for page_control in self.page_controls
+        ):
+            self._add_page_control(base_url, next_page)
+            self.page_controls.sort(key=lambda page_control: page_control.number)
+
+    def _add_page_control(self, base_url: URL, page: int) -> None:
+        self.max_page_controls -= 1
+
+        url = base_url.remove_query_params(KEYSET_PARAMS)
+        if page == self.page + 1 and self.last_key is not None:
+            url = url.include_query_params(page=page, after=self.last_key)
+        elif page == self.page - 1 and self.first_key is not None:
+            url = url.include_query_params(page=page, before=self.first_key)
+        else:
+            url = url.include_query_params(page=page)
+        self.page_controls.append(PageControl(number=page, url=str(url)))
+
+
+class LargeTableMixin:
+    """
+    행이 많은 테이블의 관리자 목록 화면을 위한 ModelView 믹스인
+
+    - 검색하지 않을 때는 pg_class.reltuples 로 추정한 행 수를 사용하고,
+      추정치가 estimated_count_threshold 보다 작을 때만 정확한 COUNT(*) 를 실행합니다.
+    - 기본 키 순서로 정렬할 때는 after/before 파라미터의 기본 키를 기준으로 조회하는
+      키셋 페이지네이션을 사용합니다.
+    정수형 단일 기본 키를 가진 모델에만 사용할 수 있습니다.
+    """
+
+    estimated_count_threshold: int = 100_000
+
+    def count_query(self: ModelView, request: Request) -> Select:
+        table_name = self.model.__table__.name
+        reltuples = (
+            select(pg_class.c.reltuples)
+            .where(pg_class.c.oid == func.to_regclass(literal(table_name)))
+            .scalar_subquery()
+        )
+        exact_count = (
+            select(func.count()).select_from(self.model.__table__).scalar_subquery()
+        )
+        # reltuples 는 한 번도 ANALYZE 되지 않은 테이블에서 -1 입니다.
+        return select(
+            case(
+                (
+                    reltuples >= self.estimated_count_threshold,
+                    cast(reltuples, BigInteger),
+                ),
+                else_=exact_count,
+            )
+        )
+
+    def get_keyset_order(self: ModelView, request: Request) -> bool | None:
+        """
+        기본 키 순서로 정렬하는 경우 내림차순 여부를, 그 외의 정렬이면 None 을 반환합니다.
+        """
+        pk_name = self.pk_columns[0].name
+        sort_by = request.query_params.get("sortBy")
+        if sort_by:
+            sort_fields = [(sort_by, request.query_params.get("sort", "asc") == "desc")]
+        else:
+            sort_fields = self._get_default_sort()
+
+        if len(sort_fields) != 1 or self._get_prop_name(sort_fields[0][0]) != pk_name:
+            return None
+        return sort_fields[0][1]
+
+    @staticmethod
+    def get_keyset_value(request: Request, name: str) -> int | None:
+        try:
+            return int(request.query_params[name])
+        except (KeyError, ValueError):
+            return None
+
+    async def list(self: ModelView, request: Request) -> Pagination:
+        descending = self.get_keyset_order(request)
+        if descending is None:
+            return await super().list(request)
+
+        page = self.validate_page_number(request.query_params.get("page"), 1)
+        page_size = self.validate_page_number(request.query_params.get("pageSize"), 0)
+        page_size = min(page_size or self.page_size, max(self.page_size_options))
+        search = request.query_params.get("search", None)
+        pk = self.pk_columns[0]
+
+        stmt = self.list_query(request)
+        for relation in self._list_relations:
+            stmt = stmt.options(selectinload(relation))
+
+        if search:
+            stmt = self.search_query(stmt=stmt, term=search)
+            count = await self.count(request, select(func.count()).select_from(stmt))
+        else:
+            count = await self.count(request)
+
+        after = self.get_keyset_value(request, "after")
+        before = self.get_keyset_value(request, "before")
+        backward = after is None and before is not None
+        if after is not None:
+            stmt = stmt.where(pk < after if descending else pk > after)
+        elif before is not None:
+            stmt = stmt.where(pk > before if descending else pk < before)
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+
+        # 이전 페이지는 반대 방향으로 조회한 뒤 뒤집습니다.
+        stmt = stmt.order_by(pk.desc() if descending != backward else pk.asc())
+        rows = list(await self._run_query(stmt.limit(page_size + 1)))
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backward:
+            rows.reverse()
+
+        return KeysetPagination(
+            rows=rows,
+            page=page,
+            page_size=page_size,
+            count=count,
+            first_key=getattr(rows[0], pk.name) if rows else None,
+            last_key=getattr(rows[-1], pk.name) if rows else None,
+            has_more=True if backward else has_more,
+        )
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import (
+    MetaData,
+    Table,
+    Column,
+    Date,
+    SmallInteger,
+    BigInteger,
+    String,
+    select,
+    func,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from application.constants import Emotion
+
+logger = logging.getLogger(__name__)
+
+# 여러 워커가 동시에 뷰를 갱신하지 않도록 사용하는 advisory lock 키
+ANALYTICS_REFRESH_LOCK_KEY = 1003
+
+# 구체화된 뷰는 마이그레이션에서 직접 생성하므로, 모델과 다른 MetaData 에 정의합니다.
+analytics_metadata = MetaData()
+
+daily_emotion_counts = Table(
+    "mv_daily_emotion_counts",
+    analytics_metadata,
+    Column("date", Date),
+    Column("emotion", SmallInteger),
+    Column("diary_count", BigInteger),
+)
+daily_active_users = Table(
+    "mv_daily_active_users",
+    analytics_metadata,
+    Column("date", Date),
+    Column("active_users", BigInteger),
+    Column("analyzed_users", BigInteger),
+)
+report_counts = Table(
+    "mv_report_counts",
+    analytics_metadata,
+    Column("report_type", String),
+    Column("start_date", Date),
+    Column("report_count", BigInteger),
+)
+MATERIALIZED_VIEWS = (daily_emotion_counts, daily_active_users, report_counts)
+
+
+@dataclass
+class AnalyticsRefreshStats:
+    refreshed_at: str
+    elapsed_seconds: float
+
+
+_last_stats: AnalyticsRefreshStats | None = None
+_last_stats_lock = threading.Lock()
+
+
+def get_analytics_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    마지막 통계 뷰 갱신 작업의 결과를 반환합니다.
+    """
+    with _last_stats_lock:
+        if _last_stats is None:
+            return {}
+        return {"analytics_refresh": asdict(_last_stats)}
+
+
+def refresh_analytics_views(db_session: Session) -> bool:
+    """
+    관리자 통계용 구체화된 뷰를 갱신하고, 모두 갱신했는지 여부를 반환합니다.
+    CONCURRENTLY 로 갱신하므로 갱신하는 동안에도 뷰를 조회할 수 있습니다.
+
+    갱신하는 트랜잭션은 트랜잭션 ID 를 할당받으므로, 끝날 때까지 트랜잭션 ID 로 커밋 여부를 판단하는
+    일기 변경 내역 조회와 코인 원장 압축이 기다리게 됩니다. 이를 짧게 하도록 뷰마다 별도의 트랜잭션에서
+    갱신하고 커밋하며, 트랜잭션마다 advisory lock 을 다시 잡아 다른 워커와 동시에 갱신하지 않도록 합니다.
+    """
+    global _last_stats
+
+    started_at = time.monotonic()
+    for view in MATERIALIZED_VIEWS:
+        acquired = db_session.scalar(
+            select(func.pg_try_advisory_xact_lock(ANALYTICS_REFRESH_LOCK_KEY))
+        )
+        if not acquired:
+            return False
+
+        db_session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+        db_session.commit()
+
+    stats = AnalyticsRefreshStats(
+        refreshed_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+        elapsed_seconds=round(time.monotonic() - started_at, 3),
+    )
+    logger.info("관리자 통계 뷰 갱신 완료: %s", stats)
+    with _last_stats_lock:
+        _last_stats = stats
+    return True
+
+
+def get_admin_analytics(db_session: Session, days: int) -> Dict[str, Any]:
+    """
+    구체화된 뷰에서 최근 days 일 동안의 전체 사용자 통계를 조회합니다.
+    diaries 를 직접 조회하지 않으므로, 마지막 갱신 이후의 변경은 반영되지 않습니다.
+    """
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    week_start = end_date - timedelta(days=end_date.weekday())
+
+    daily: dict[date, dict[str, Any]] = {
+        start_date
+        + timedelta(days=offset): {
+            "date": start_date + timedelta(days=offset),
+            "active_users": 0,
+            "analyzed_users": 0,
+            "emotion_counts": {},
+        }
+        for offset in range(days)
+    }
+    stmt = select(daily_active_users).where(daily_active_users.c.date >= start_date)
+    for row in db_session.execute(stmt):
+        if row.date in daily:
+            daily[row.date]["active_users"] = row.active_users
+            daily[row.date]["analyzed_users"] = row.analyzed_users
+
+    week_emotion_counts = {emotion.name: 0 for emotion in Emotion}
+    stmt = select(daily_emotion_counts).where(
+        daily_emotion_counts.c.date >= min(start_date, week_start)
+    )
+    for row in db_session.execute(stmt):
+        emotion_name = Emotion.from_code(row.emotion).name
+        if row.date in daily:
+            daily[row.date]["emotion_counts"][emotion_name] = row.diary_count
+        if week_start <= row.date <= end_date:
+            week_emotion_counts[emotion_name] += row.diary_count
+
+    stmt = (
+        select(report_counts)
+        .where(report_counts.c.start_date >= start_date)
+        .order_by(report_counts.c.start_date, report_counts.c.report_type)
+    )
+    reports = [dict(row._mapping) for row in db_session.execute(stmt)]
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "week_start_date": week_start,
+        "week_emotion_counts": week_emotion_counts,
+        "daily": list(daily.values()),
+        "reports": reports,
+        **get_analytics_metrics(),
+    }
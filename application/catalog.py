@@ -0,0 +1,252 @@
+import logging
+import select as select_module
+import threading
+from dataclasses import dataclass, field
+
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import select, func, text
+from sqlalchemy.orm import Session
+
+from application.images import get_image_urls
+from application.storage import get_storage
+from application.models import StoreItem, UserItem, store_catalog_version_seq
+from config.cache import TTLCache
+from config.db import engine
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STORE_CATALOG_CHANNEL = "store_catalog"
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    id: int
+    name: str
+    category: str
+    description: str
+    price: int
+    item_image_url: str | None
+    applied_image_url: str | None
+
+
+@dataclass
+class StoreCatalog:
+    """
+    특정 버전의 상점 아이템 목록 스냅샷입니다. 생성 이후에는 변경되지 않습니다.
+    """
+
+    version: int
+    items_by_id: dict[int, CatalogItem]
+    items_by_category: dict[str, tuple[CatalogItem, ...]]
+    # base_url 은 클라이언트가 보낸 Host 헤더에서 만들어지므로, 캐시 크기를 제한합니다.
+    _absolute_urls: TTLCache[dict[int, tuple[str | None, str | None]]] = field(
+        default_factory=lambda: TTLCache(
+            max_size=settings.STORE_CATALOG_URL_CACHE_MAX_SIZE,
+            ttl=settings.STORE_CATALOG_URL_CACHE_TTL_SECONDS,
+        )
+    )
+    _image_urls: TTLCache[dict[int, tuple[dict | None, dict | None]]] = field(
+        default_factory=lambda: TTLCache(
+            max_size=settings.STORE_CATALOG_URL_CACHE_MAX_SIZE,
+            ttl=settings.STORE_CATALOG_URL_CACHE_TTL_SECONDS,
+        )
+    )
+
+    def get_absolute_urls(
+        self, base_url: str
+    ) -> dict[int, tuple[str | None, str | None]]:
+        """
+        base_url 별로 미리 만들어 둔 (상품 이미지 URL, 적용 이미지 URL) 목록을 반환합니다.
+        """
+        urls = self._absolute_urls.get(base_url)
+        if urls is None:
+            storage = get_storage()
+            urls = {
+                item.id: (
+                    (
+                        storage.get_url(item.item_image_url, base_url)
+                        if item.item_image_url
+                        else None
+                    ),
+                    (
+                        storage.get_url(item.applied_image_url, base_url)
+                        if item.applied_image_url
+                        else None
+                    ),
+                )
+                for item in self.items_by_id.values()
+            }
+            self._absolute_urls.set(base_url, urls)
+        return urls
+
+    def get_image_urls(
+        self, base_url: str
+    ) -> dict[int, tuple[dict | None, dict | None]]:
+        """
+        base_url 별로 미리 만들어 둔 (상품 이미지, 적용 이미지) 의 원본/크기별 URL 목록을 반환합니다.
+        """
+        urls = self._image_urls.get(base_url)
+        if urls is None:
+            urls = {
+                item.id: (
+                    (
+                        get_image_urls(base_url, item.item_image_url)
+                        if item.item_image_url
+                        else None
+                    ),
+                    (
+                        get_image_urls(base_url, item.applied_image_url)
+                        if item.applied_image_url
+                        else None
+                    ),
+                )
+                for item in self.items_by_id.values()
+            }
+            self._image_urls.set(base_url, urls)
+        return urls
+
+
+class StoreCatalogCache:
+    """
+    상점 아이템 목록을 프로세스 메모리에 캐시합니다.
+    관리자 페이지에서 아이템이 변경되면 카탈로그 버전이 올라가고,
+    LISTEN/NOTIFY 를 통해 모든 워커의 캐시가 무효화됩니다.
+    """
+
+    def __init__(self):
+        self._catalog: StoreCatalog | None = None
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def get(self, db_session: Session) -> StoreCatalog:
+        catalog = self._catalog
+        if catalog is not None and not self._stale:
+            return catalog
+
+        with self._lock:
+            if self._catalog is None or self._stale:
+                # 다시 불러오는 도중 무효화되면 다음 요청에서 한 번 더 불러옵니다.
+                self._stale = False
+                self._catalog = load_store_catalog(db_session)
+            return self._catalog
+
+    def invalidate(self, version: int | None = None) -> None:
+        catalog = self._catalog
+        if version is not None and catalog is not None and catalog.version >= version:
+            return
+        self._stale = True
+
+
+store_catalog_cache = StoreCatalogCache()
+
+
+def get_store_catalog_version(db_session: Session) -> int:
+    """
+    현재 카탈로그 버전을 반환합니다. 버전이 한 번도 올라가지 않았다면 0 입니다.
+    """
+    stmt = text(
+        "SELECT CASE WHEN is_called THEN last_value ELSE 0 END "
+        f"FROM {store_catalog_version_seq.name}"
+    )
+    return db_session.scalar(stmt)
+
+
+def load_store_catalog(db_session: Session) -> StoreCatalog:
+    """
+    DB 에서 현재 버전의 상점 아이템 목록을 불러옵니다.
+    """
+    version = get_store_catalog_version(db_session)
+    store_items = db_session.scalars(select(StoreItem).order_by(StoreItem.id)).all()
+
+    items_by_id: dict[int, CatalogItem] = {}
+    items_by_category: dict[str, list[CatalogItem]] = {}
+    for store_item in store_items:
+        item = CatalogItem(
+            id=store_item.id,
+            name=store_item.name,
+            category=store_item.category,
+            description=store_item.description,
+            price=store_item.price,
+            item_image_url=store_item.item_image_url or None,
+            applied_image_url=store_item.applied_image_url or None,
+        )
+        items_by_id[item.id] = item
+        items_by_category.setdefault(item.category, []).append(item)
+
+    return StoreCatalog(
+        version=version,
+        items_by_id=items_by_id,
+        items_by_category={
+            category: tuple(items) for category, items in items_by_category.items()
+        },
+    )
+
+
+def bump_store_catalog_version() -> int:
+    """
+    카탈로그 버전을 올리고, 모든 워커에 변경 사실을 알립니다.
+    """
+    with engine.begin() as connection:
+        version = connection.scalar(select(store_catalog_version_seq.next_value()))
+        connection.execute(select(func.pg_notify(STORE_CATALOG_CHANNEL, str(version))))
+    store_catalog_cache.invalidate(version)
+    return version
+
+
+def get_owned_items(db_session: Session, user_id: int) -> dict[int, bool]:
+    """
+    사용자가 보유한 아이템의 {아이템 ID: 장착 여부} 를 반환합니다.
+    """
+    stmt = select(UserItem.item_id, UserItem.equipped).where(
+        UserItem.user_id == user_id
+    )
+    return {item_id: equipped for item_id, equipped in db_session.execute(stmt)}
+
+
+class StoreCatalogListener(threading.Thread):
+    """
+    카탈로그 변경 알림을 LISTEN 하여 캐시를 무효화하는 백그라운드 스레드입니다.
+    연결이 끊기면 다시 연결하며, 그 사이의 알림을 놓쳤을 수 있으므로 캐시를 무효화합니다.
+    """
+
+    def __init__(self, poll_interval: float = 5.0, reconnect_interval: float = 5.0):
+        super().__init__(name="store-catalog-listener", daemon=True)
+        self.poll_interval = poll_interval
+        self.reconnect_interval = reconnect_interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("상점 카탈로그 알림 수신 중 오류 발생")
+            store_catalog_cache.invalidate()
+            self._stop_event.wait(self.reconnect_interval)
+
+    def _listen(self) -> None:
+        raw_connection = engine.raw_connection()
+        raw_connection.detach()
+        connection = raw_connection.driver_connection
+        try:
+            connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {STORE_CATALOG_CHANNEL}")
+            store_catalog_cache.invalidate()
+
+            while not self._stop_event.is_set():
+                readable, _, _ = select_module.select(
+                    [connection], [], [], self.poll_interval
+                )
+                if not readable:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    store_catalog_cache.invalidate(int(notify.payload))
+        finally:
+            raw_connection.close()
+
+    def stop(self) -> None:
+        self._stop_event.set()
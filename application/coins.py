@@ -0,0 +1,52 @@
+from sqlalchemy import select, func, literal, BigInteger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from application.models import CoinLedger, CoinSnapshot, get_completed_xid
+
+# 여러 워커가 동시에 압축 작업을 수행하지 않도록 사용하는 advisory lock 키
+COIN_LEDGER_COMPACT_LOCK_KEY = 1001
+
+
+def compact_coin_ledger(db_session: Session) -> int:
+    """
+    스냅샷 이후에 쌓인 원장 내역을 사용자별 스냅샷에 반영하고, 갱신된 스냅샷 수를 반환합니다.
+    원장 내역은 삭제하지 않으며, 스냅샷은 잔액 조회 시 합산할 원장 범위를 줄이는 용도입니다.
+
+    ID 와 created_at 은 트랜잭션이 커밋되는 순서와 다를 수 있으므로, 범위는 트랜잭션 ID 로 정합니다.
+    현재 스냅샷의 xmin 보다 작은 트랜잭션은 모두 끝났으므로 그 내역까지 반영하고,
+    나중에 커밋되는 내역은 항상 xmin 이상의 트랜잭션 ID 를 가지므로 다음 압축에서 반영됩니다.
+    """
+    acquired = db_session.scalar(
+        select(func.pg_try_advisory_xact_lock(COIN_LEDGER_COMPACT_LOCK_KEY))
+    )
+    if not acquired:
+        return 0
+
+    completed_xid = db_session.scalar(select(get_completed_xid()))
+    deltas = (
+        select(
+            CoinLedger.user_id,
+            func.sum(CoinLedger.amount).label("balance"),
+            literal(completed_xid, BigInteger).label("ledger_xmin"),
+        )
+        .outerjoin(CoinSnapshot, CoinSnapshot.user_id == CoinLedger.user_id)
+        .where(
+            CoinLedger.created_xid >= func.coalesce(CoinSnapshot.ledger_xmin, 0),
+            CoinLedger.created_xid < completed_xid,
+        )
+        .group_by(CoinLedger.user_id)
+    )
+    stmt = insert(CoinSnapshot).from_select(
+        ["user_id", "balance", "ledger_xmin"], deltas
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CoinSnapshot.user_id],
+        set_={
+            "balance": CoinSnapshot.balance + stmt.excluded.balance,
+            "ledger_xmin": stmt.excluded.ledger_xmin,
+            "updated_at": func.now(),
+        },
+    )
+    result = db_session.execute(stmt)
+    return result.rowcount
@@ -1,10 +1,25 @@
-from typing import TypeVar, Type
+from collections import Counter
+from datetime import timedelta
+from typing import TypeVar, Type, Iterable
+
+import time
 
 from fastapi import status, HTTPException
-from sqlalchemy import select
+from sqlalchemy import select, delete, update, exists, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 
-from application.models import IdModel
+from application.models import (
+    IdModel,
+    RefreshTokenFamily,
+    RateLimitCounter,
+    StoredFile,
+    StoredFileOwner,
+)
+from application.images import ImageSize, get_variant_path
+from application.utils import StoredFileInfo, remove_file
 from config.dependencies import SessionDependency
+from config.settings import settings
 
 T = TypeVar("T", bound=IdModel)
 
@@ -51,3 +66,124 @@ def get_model_or_403(
             detail="권한이 없는 리소스입니다.",
         )
     return instance
+
+
+def purge_refresh_token_families(db_session: Session) -> int:
+    """
+    만료되었거나 폐기된 리프레시 토큰 계열을 삭제하고, 삭제된 개수를 반환합니다.
+    """
+    stmt = delete(RefreshTokenFamily).where(
+        or_(
+            RefreshTokenFamily.expires_at < func.now(),
+            RefreshTokenFamily.revoked.is_(True),
+        )
+    )
+    return db_session.execute(stmt).rowcount
+
+
+def purge_rate_limit_counters(db_session: Session) -> int:
+    """
+    슬라이딩 윈도우 계산에 더 이상 쓰이지 않는 시도 횟수 구간을 삭제하고, 삭제된 개수를 반환합니다.
+    """
+    stmt = delete(RateLimitCounter).where(
+        RateLimitCounter.bucket < time.time() - 2 * settings.RATE_LIMIT_WINDOW_SECONDS
+    )
+    return db_session.execute(stmt).rowcount
+
+
+def register_stored_files(
+    db_session: Session,
+    stored_files: Iterable[StoredFileInfo],
+    owner_id: int | None = None,
+) -> None:
+    """
+    저장한 파일의 참조 횟수를 1씩 증가시킵니다. 처음 참조되는 파일은 새로 등록합니다.
+    owner_id 가 주어지면 해당 사용자가 파일을 내려받을 수 있도록 등록합니다.
+    """
+    # 한 INSERT 에서 같은 행을 두 번 갱신할 수 없으므로 같은 파일은 하나로 합칩니다.
+    rows: dict[str, dict] = {}
+    for stored_file in stored_files:
+        row = rows.setdefault(
+            stored_file.path,
+            {
+                "sha256": stored_file.sha256,
+                "path": stored_file.path,
+                "size": stored_file.size,
+                "ref_count": 0,
+            },
+        )
+        row["ref_count"] += 1
+    if not rows:
+        return
+
+    stmt = insert(StoredFile).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StoredFile.path],
+        set_={
+            "ref_count": StoredFile.ref_count + stmt.excluded.ref_count,
+            "updated_at": func.now(),
+        },
+    ).returning(StoredFile.id)
+    stored_file_ids = db_session.scalars(stmt).all()
+
+    if owner_id is not None:
+        stmt = insert(StoredFileOwner).values(
+            [
+                {"stored_file_id": stored_file_id, "user_id": owner_id}
+                for stored_file_id in stored_file_ids
+            ]
+        )
+        db_session.execute(stmt.on_conflict_do_nothing())
+
+
+def is_file_owner(db_session: Session, user_id: int, path: str) -> bool:
+    """
+    사용자가 주어진 경로의 파일을 내려받을 수 있는지 확인합니다.
+    경로의 고유 인덱스와 stored_file_owners 의 기본 키로 한 번에 조회합니다.
+    """
+    stmt = select(
+        exists()
+        .where(StoredFile.path == path)
+        .where(StoredFileOwner.stored_file_id == StoredFile.id)
+        .where(StoredFileOwner.user_id == user_id)
+    )
+    return db_session.scalar(stmt)
+
+
+def release_stored_files(db_session: Session, paths: Iterable[str]) -> None:
+    """
+    더 이상 사용하지 않는 파일의 참조 횟수를 1씩 감소시킵니다.
+    파일은 바로 삭제하지 않고, 유예 기간이 지난 뒤 정리 작업에서 삭제합니다.
+    등록되지 않은 경로(내용 주소 방식 이전에 저장된 파일)는 무시합니다.
+    """
+    for path, ref_count in Counter(path for path in paths if path).items():
+        stmt = (
+            update(StoredFile)
+            .where(StoredFile.path == path)
+            .values(ref_count=StoredFile.ref_count - ref_count, updated_at=func.now())
+        )
+        db_session.execute(stmt)
+
+
+def reap_unreferenced_files(db_session: Session) -> int:
+    """
+    참조 횟수가 0이 된 뒤 유예 기간이 지난 파일을 삭제하고, 삭제된 개수를 반환합니다.
+    행을 먼저 삭제하고 커밋한 뒤에 파일을 지우므로, 커밋에 실패해도 참조 중인 파일이 사라지지 않습니다.
+    """
+    stmt = (
+        delete(StoredFile)
+        .where(
+            StoredFile.ref_count <= 0,
+            StoredFile.updated_at
+            < func.now() - timedelta(seconds=settings.UNREFERENCED_FILE_GRACE_SECONDS),
+        )
+        .returning(StoredFile.path)
+    )
+    paths = db_session.scalars(stmt).all()
+    db_session.commit()
+
+    for path in paths:
+        remove_file(path)
+        for size in ImageSize:
+            remove_file(get_variant_path(path, size))
+    return len(paths)
@@ -0,0 +1,141 @@
+from datetime import date
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from application.constants import DIARY_REWARD_COIN
+from application.emotion_analysis import schedule_emotion_analysis
+from application.emotion_days import add_unanalyzed_emotion_days
+from application.models import Diary, User, CoinReason
+from application.schemas import DiaryImportRow, DiaryImportRowResult
+from application.weekly_emotions import add_inserted_diary_counts
+
+# 한 줄의 최대 크기. 본문 5000자와 JSON 이스케이프를 고려해도 충분한 크기입니다.
+DIARY_IMPORT_MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_import_lines(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """
+    요청 본문을 읽으면서 (줄 번호, 줄 내용) 을 반환합니다.
+    DIARY_IMPORT_MAX_LINE_BYTES 보다 긴 줄은 메모리에 모으지 않고 내용을 None 으로 반환합니다.
+    """
+    buffer = bytearray()
+    too_long = False
+    line_number = 0
+    async for chunk in stream:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            line_number += 1
+            if not too_long:
+                buffer += chunk[start:end]
+                too_long = len(buffer) > DIARY_IMPORT_MAX_LINE_BYTES
+            yield line_number, None if too_long else bytes(buffer)
+            buffer.clear()
+            too_long = False
+            start = end + 1
+
+        if not too_long:
+            buffer += chunk[start:]
+            if len(buffer) > DIARY_IMPORT_MAX_LINE_BYTES:
+                buffer.clear()
+                too_long = True
+
+    if buffer or too_long:
+        yield line_number + 1, None if too_long else bytes(buffer)
+
+
+def parse_import_line(
+    line_number: int, raw: bytes | None
+) -> DiaryImportRow | DiaryImportRowResult:
+    """
+    한 줄을 검증하여 DiaryImportRow 를, 형식 오류이면 invalid 결과를 반환합니다.
+    """
+    if raw is None:
+        return DiaryImportRowResult(
+            line=line_number,
+            status="invalid",
+            detail=f"한 줄은 {DIARY_IMPORT_MAX_LINE_BYTES} 바이트를 넘을 수 없습니다.",
+        )
+    try:
+        return DiaryImportRow.model_validate_json(raw)
+    except ValidationError as e:
+        error = e.errors()[0]
+        location = ".".join(str(part) for part in error["loc"])
+        return DiaryImportRowResult(
+            line=line_number,
+            status="invalid",
+            detail=f"{location}: {error['msg']}" if location else error["msg"],
+        )
+
+
+def import_diary_batch(
+    db_session: Session,
+    user: User,
+    lines: list[tuple[int, bytes | None]],
+    analyze: bool = False,
+) -> list[DiaryImportRowResult]:
+    """
+    여러 줄의 일기를 검증하고 하나의 INSERT ... ON CONFLICT (user_id, date) DO NOTHING 으로 추가한 뒤,
+    줄 번호 순서의 줄별 결과를 반환합니다. 커밋은 호출하는 쪽에서 합니다.
+
+    일기마다 exists() 확인, flush, refresh 를 하지 않고, 이미 같은 날짜의 일기가 있는 줄은
+    RETURNING 에 포함되지 않는 것으로 확인합니다. 매퍼 이벤트가 발생하지 않으므로
+    감정 통계(user_emotion_days, 주간 감정 캐시) 는 직접 갱신하고, 코인은 배치마다 한 번 적립합니다.
+    """
+    results: dict[int, DiaryImportRowResult] = {}
+    rows: dict[date, tuple[int, DiaryImportRow]] = {}
+    for line_number, raw in lines:
+        parsed = parse_import_line(line_number, raw)
+        if isinstance(parsed, DiaryImportRowResult):
+            results[line_number] = parsed
+        elif parsed.diary_date in rows:
+            # 같은 배치 안에서 같은 날짜가 반복되면 첫 번째 줄만 추가합니다.
+            results[line_number] = DiaryImportRowResult(
+                line=line_number, status="duplicate", diary_date=parsed.diary_date
+            )
+        else:
+            rows[parsed.diary_date] = (line_number, parsed)
+
+    user_id = user.id
+    inserted: dict[date, int] = {}
+    if rows:
+        stmt = (
+            insert(Diary)
+            .values(
+                [
+                    {
+                        "user_id": user_id,
+                        "date": row.diary_date,
+                        "weather": row.weather,
+                        "title": row.title,
+                        "content": row.content,
+                        "image_urls": [],
+                    }
+                    for _, row in rows.values()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Diary.user_id, Diary.date])
+            .returning(Diary.id, Diary.date)
+        )
+        inserted = {day: diary_id for diary_id, day in db_session.execute(stmt)}
+
+    for day, (line_number, _) in rows.items():
+        results[line_number] = DiaryImportRowResult(
+            line=line_number,
+            status="created" if day in inserted else "duplicate",
+            diary_id=inserted.get(day),
+            diary_date=day,
+        )
+
+    if inserted:
+        add_unanalyzed_emotion_days(db_session, user_id, list(inserted))
+        add_inserted_diary_counts(db_session, user_id, list(inserted))
+        user.add_coin(DIARY_REWARD_COIN * len(inserted), CoinReason.DIARY_REWARD)
+        if analyze:
+            schedule_emotion_analysis(db_session, list(inserted.values()))
+
+    return [results[line_number] for line_number in sorted(results)]
@@ -0,0 +1,149 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from application.ai import analyze_diary_emotion
+from application.constants import Emotion
+from application.models import Diary
+from config.db import SessionLocal
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EMOTION_ANALYSIS_SESSION_KEY = "emotion_analysis_diary_ids"
+
+
+def analyze_diaries(diary_ids: list[int]) -> int:
+    """
+    아직 감정이 분석되지 않은 일기들의 감정을 분석하여 한 번에 커밋하고, 분석한 일기 수를 반환합니다.
+    분석에 실패한 일기는 건너뛰며, 나중에 감정 분석 API 로 다시 분석할 수 있습니다.
+
+    일기 내용을 읽는 세션은 OpenAI 를 호출하기 전에 닫으므로, 호출하는 동안 트랜잭션과 DB 연결을 잡고 있지 않습니다.
+    결과는 짧은 트랜잭션 하나로 저장하며, 그 사이에 내용이 수정되었거나 이미 분석된 일기는 저장하지 않습니다.
+    """
+    with SessionLocal() as db_session:
+        stmt = select(Diary.id, Diary.content).where(
+            Diary.id.in_(diary_ids), Diary.analyzed_emotion.is_(None)
+        )
+        contents = dict(db_session.execute(stmt).tuples().all())
+
+    emotions: dict[int, Emotion] = {}
+    for diary_id, content in contents.items():
+        try:
+            emotions[diary_id] = analyze_diary_emotion(content)
+        except Exception:
+            logger.exception("일기 감정 분석 실패: diary_id=%s", diary_id)
+    if not emotions:
+        return 0
+
+    analyzed = 0
+    with SessionLocal() as db_session:
+        stmt = (
+            select(Diary)
+            .where(Diary.id.in_(emotions), Diary.analyzed_emotion.is_(None))
+            .with_for_update()
+        )
+        for diary in db_session.scalars(stmt):
+            if diary.content == contents[diary.id]:
+                diary.analyze_emotion(emotions[diary.id])
+                analyzed += 1
+        db_session.commit()
+    return analyzed
+
+
+class EmotionAnalysisQueue:
+    """
+    일기 감정 분석(OpenAI 호출)을 batch_size 개씩 묶어 크기가 제한된 스레드 풀에서 실행합니다.
+    대기 중인 묶음이 max_pending 을 넘으면 작업을 버리며, 버려진 일기는 감정 분석 API 로 분석할 수 있습니다.
+    """
+
+    def __init__(self, max_workers: int, batch_size: int, max_pending: int):
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._analyzed = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="emotion-analysis",
+            )
+        return self._executor
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.exception() is not None:
+                self._failed += 1
+                logger.warning("일기 감정 분석 작업 실패: %s", future.exception())
+            else:
+                self._analyzed += future.result()
+
+    def submit(self, diary_ids: list[int]) -> None:
+        """
+        주어진 일기들의 감정 분석을 batch_size 개씩 나누어 예약합니다.
+        """
+        for start in range(0, len(diary_ids), self.batch_size):
+            batch = diary_ids[start : start + self.batch_size]
+            with self._lock:
+                if self._pending >= self.max_pending:
+                    self._dropped += len(batch)
+                    continue
+                self._pending += 1
+                future = self._get_executor().submit(analyze_diaries, batch)
+            future.add_done_callback(self._on_done)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "analyzed": self._analyzed,
+                "dropped": self._dropped,
+                "failed": self._failed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+emotion_analysis_queue = EmotionAnalysisQueue(
+    max_workers=settings.EMOTION_ANALYSIS_WORKERS,
+    batch_size=settings.EMOTION_ANALYSIS_BATCH_SIZE,
+    max_pending=settings.EMOTION_ANALYSIS_MAX_PENDING,
+)
+
+
+def schedule_emotion_analysis(db_session: Session, diary_ids: list[int]) -> None:
+    """
+    트랜잭션이 커밋되면 주어진 일기들의 감정 분석을 예약합니다.
+    """
+    if not db_session.in_transaction():
+        db_session.begin()
+    db_session.info.setdefault(EMOTION_ANALYSIS_SESSION_KEY, []).extend(diary_ids)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _submit_emotion_analysis(db_session: Session) -> None:
+    diary_ids = db_session.info.pop(EMOTION_ANALYSIS_SESSION_KEY, None)
+    if diary_ids:
+        emotion_analysis_queue.submit(diary_ids)
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_emotion_analysis(db_session: Session, previous_transaction) -> None:
+    db_session.info.pop(EMOTION_ANALYSIS_SESSION_KEY, None)
@@ -0,0 +1,249 @@
+import logging
+from datetime import date, timedelta
+from typing import Sequence
+
+from sqlalchemy import (
+    select,
+    func,
+    delete,
+    event,
+    inspect,
+    text,
+    bindparam,
+    cast,
+    and_,
+    true,
+    Date,
+    Integer,
+    Select,
+)
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from application.constants import Emotion
+from application.models import Diary, UserEmotionDay
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTITION_NAME = f"{UserEmotionDay.__tablename__}_default"
+# 여러 워커가 동시에 파티션을 생성하지 않도록 사용하는 advisory lock 키
+EMOTION_DAY_PARTITION_LOCK_KEY = 1002
+# 기본 파티션을 잠그려고 기다리는 동안 일기 작성도 대기하므로, 오래 기다리지 않고 다음 주기에 다시 시도합니다.
+EMOTION_DAY_PARTITION_LOCK_TIMEOUT = "5s"
+
+
+def get_emotion_code(emotion: Emotion | None) -> int | None:
+    return emotion.code if emotion is not None else None
+
+
+def select_emotion_timelines(
+    user_ids: Sequence[int], start_date: date, end_date: date
+) -> Select:
+    """
+    사용자별로 시작 날짜부터 끝 날짜까지의 모든 날짜와 감정 코드를 (user_id, date, emotion) 으로 조회하는 쿼리
+    날짜 목록은 generate_series 로 만들고 user_emotion_days 를 LEFT JOIN 하므로,
+    감정이 없는 날짜도 emotion 이 NULL 인 행으로 포함됩니다.
+    """
+    users = (
+        func.unnest(bindparam("user_ids", list(user_ids), type_=ARRAY(Integer)))
+        .table_valued("user_id")
+        .render_derived(name="target_users")
+    )
+    days = select(
+        cast(func.generate_series(start_date, end_date, timedelta(days=1)), Date).label(
+            "day"
+        )
+    ).subquery("days")
+    return (
+        select(users.c.user_id, days.c.day, UserEmotionDay.emotion)
+        .select_from(users)
+        .join(days, true())
+        .outerjoin(
+            UserEmotionDay,
+            and_(
+                UserEmotionDay.user_id == users.c.user_id,
+                UserEmotionDay.date == days.c.day,
+            ),
+        )
+        .order_by(users.c.user_id, days.c.day)
+    )
+
+
+def get_emotion_timelines(
+    db_session: Session, user_ids: Sequence[int], start_date: date, end_date: date
+) -> dict[int, dict[date, Emotion | None]]:
+    """
+    여러 사용자의 {사용자 ID: {날짜: 감정}} 을 하나의 쿼리로 반환합니다.
+    일기가 없거나 감정이 분석되지 않은 날짜는 None 입니다.
+    """
+    timelines: dict[int, dict[date, Emotion | None]] = {
+        user_id: {} for user_id in user_ids
+    }
+    if not user_ids or start_date > end_date:
+        return timelines
+
+    stmt = select_emotion_timelines(user_ids, start_date, end_date)
+    for user_id, day, emotion_code in db_session.execute(stmt):
+        timelines[user_id][day] = (
+            Emotion.from_code(emotion_code) if emotion_code is not None else None
+        )
+    return timelines
+
+
+def get_emotion_timeline(
+    db_session: Session, user_id: int, start_date: date, end_date: date
+) -> dict[date, Emotion | None]:
+    """
+    시작 날짜부터 끝 날짜까지 {날짜: 감정} 을 반환합니다.
+    일기가 없거나 감정이 분석되지 않은 날짜는 None 입니다.
+    """
+    return get_emotion_timelines(db_session, [user_id], start_date, end_date)[user_id]
+
+
+def _upsert_emotion_day(
+    connection: Connection, user_id: int, day: date, emotion: int | None
+) -> None:
+    stmt = insert(UserEmotionDay).values(user_id=user_id, date=day, emotion=emotion)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserEmotionDay.user_id, UserEmotionDay.date],
+        set_={UserEmotionDay.emotion: stmt.excluded.emotion},
+    )
+    connection.execute(stmt)
+
+
+def _delete_emotion_day(connection: Connection, user_id: int, day: date) -> None:
+    connection.execute(
+        delete(UserEmotionDay).where(
+            UserEmotionDay.user_id == user_id,
+            UserEmotionDay.date == day,
+        )
+    )
+
+
+@event.listens_for(Diary, "after_insert")
+def _insert_emotion_day(mapper, connection: Connection, diary: Diary) -> None:
+    _upsert_emotion_day(
+        connection,
+        diary.user_id,
+        diary.date,
+        get_emotion_code(diary.analyzed_emotion),
+    )
+
+
+@event.listens_for(Diary, "after_update")
+def _update_emotion_day(mapper, connection: Connection, diary: Diary) -> None:
+    state = inspect(diary)
+    user_id_history = state.attrs.user_id.history
+    date_history = state.attrs.date.history
+    if user_id_history.deleted or date_history.deleted:
+        _delete_emotion_day(
+            connection,
+            (user_id_history.deleted or [diary.user_id])[0],
+            (date_history.deleted or [diary.date])[0],
+        )
+    elif not state.attrs.analyzed_emotion.history.has_changes():
+        return
+
+    _upsert_emotion_day(
+        connection,
+        diary.user_id,
+        diary.date,
+        get_emotion_code(diary.analyzed_emotion),
+    )
+
+
+@event.listens_for(Diary, "after_delete")
+def _delete_diary_emotion_day(mapper, connection: Connection, diary: Diary) -> None:
+    _delete_emotion_day(connection, diary.user_id, diary.date)
+
+
+def add_unanalyzed_emotion_days(
+    db_session: Session, user_id: int, days: Sequence[date]
+) -> None:
+    """
+    ORM 을 거치지 않고 한 번에 추가한 일기의 날짜들을 감정이 분석되지 않은 상태로 기록합니다.
+    Core INSERT 로 추가한 일기에는 매퍼 이벤트가 발생하지 않으므로, 같은 트랜잭션에서 직접 호출해야 합니다.
+    """
+    if not days:
+        return
+    stmt = insert(UserEmotionDay).values(
+        [{"user_id": user_id, "date": day, "emotion": None} for day in days]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserEmotionDay.user_id, UserEmotionDay.date],
+        set_={UserEmotionDay.emotion: stmt.excluded.emotion},
+    )
+    db_session.execute(stmt)
+
+
+def get_month_start(day: date, months: int = 0) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def get_partition_name(month_start: date) -> str:
+    return f"{UserEmotionDay.__tablename__}_{month_start:%Y_%m}"
+
+
+def create_emotion_day_partition(db_session: Session, month_start: date) -> bool:
+    """
+    주어진 월의 파티션을 생성하고, 생성했는지 여부를 반환합니다. 커밋은 호출하는 쪽에서 합니다.
+    기본 파티션에 이미 해당 월의 행이 있으면 새 파티션으로 옮긴 뒤 연결합니다.
+    행을 옮기기 전에 기본 파티션을 ACCESS EXCLUSIVE 로 잠그므로, 옮긴 뒤 연결하기 전에
+    해당 월의 행이 기본 파티션에 추가되어 연결이 실패하는 일이 없습니다.
+    """
+    partition_name = get_partition_name(month_start)
+    if db_session.scalar(select(func.to_regclass(partition_name))) is not None:
+        return False
+
+    table_name = UserEmotionDay.__tablename__
+    start, end = month_start, get_month_start(month_start, months=1)
+    db_session.execute(
+        text(f"SET LOCAL lock_timeout = '{EMOTION_DAY_PARTITION_LOCK_TIMEOUT}'")
+    )
+    db_session.execute(
+        text(f"CREATE TABLE {partition_name} (LIKE {table_name} INCLUDING DEFAULTS)")
+    )
+    db_session.execute(
+        text(f"LOCK TABLE {DEFAULT_PARTITION_NAME} IN ACCESS EXCLUSIVE MODE")
+    )
+    db_session.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {DEFAULT_PARTITION_NAME} "
+            f"WHERE date >= :start AND date < :end "
+            f"RETURNING user_id, date, emotion) "
+            f"INSERT INTO {partition_name} (user_id, date, emotion) "
+            f"SELECT user_id, date, emotion FROM moved"
+        ),
+        {"start": start, "end": end},
+    )
+    db_session.execute(
+        text(
+            f"ALTER TABLE {table_name} ATTACH PARTITION {partition_name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+    logger.info("감정 통계 파티션 생성: %s", partition_name)
+    return True
+
+
+def create_upcoming_emotion_day_partitions(db_session: Session) -> None:
+    """
+    이번 달부터 설정된 개월 수만큼 앞선 달까지의 파티션을 미리 생성합니다.
+    기본 파티션을 잠그는 시간을 줄이도록 파티션마다 별도의 트랜잭션으로 생성하고 커밋합니다.
+    """
+    this_month = get_month_start(date.today())
+    for months in range(settings.USER_EMOTION_DAY_PARTITION_MONTHS_AHEAD + 1):
+        acquired = db_session.scalar(
+            select(func.pg_try_advisory_xact_lock(EMOTION_DAY_PARTITION_LOCK_KEY))
+        )
+        if not acquired:
+            return
+
+        create_emotion_day_partition(
+            db_session, get_month_start(this_month, months=months)
+        )
+        db_session.commit()
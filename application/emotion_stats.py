@@ -0,0 +1,131 @@
+from datetime import date
+from typing import Any, Dict, Literal
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from application.constants import Emotion, NEGATIVE_EMOTIONS, POSITIVE_EMOTIONS
+from application.models import UserEmotionDay
+
+Granularity = Literal["day", "week", "month"]
+
+# 감정 코드는 1 부터 시작하며, 0 은 일기가 없거나 감정이 분석되지 않은 날짜입니다.
+EMOTIONS = sorted(Emotion, key=lambda emotion: emotion.code)
+MAX_EMOTION_CODE = max(emotion.code for emotion in Emotion)
+ROLLING_WINDOW_DAYS = 7
+# numpy 의 datetime64 에서 1970-01-01 은 목요일이므로, 1970-01-05 (월요일) 을 주의 기준으로 사용합니다.
+WEEK_EPOCH = "1970-01-05"
+
+
+def load_daily_emotion_codes(
+    db_session: Session, user_id: int, start_date: date, end_date: date
+) -> np.ndarray:
+    """
+    시작 날짜부터 끝 날짜까지 하루에 하나씩 감정 코드를 담은 numpy 배열을 반환합니다.
+    user_emotion_days 에서 (시작 날짜로부터의 일 수, 감정 코드) 만 조회하여 배열에 바로 채웁니다.
+    """
+    stmt = select(UserEmotionDay.date - start_date, UserEmotionDay.emotion).where(
+        UserEmotionDay.user_id == user_id,
+        UserEmotionDay.date >= start_date,
+        UserEmotionDay.date <= end_date,
+        UserEmotionDay.emotion.is_not(None),
+    )
+    rows = np.array(db_session.execute(stmt).all(), dtype=np.int32).reshape(-1, 2)
+
+    codes = np.zeros((end_date - start_date).days + 1, dtype=np.int8)
+    codes[rows[:, 0]] = rows[:, 1]
+    return codes
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """
+    True 가 연속으로 나타나는 가장 긴 구간의 길이를 반환합니다.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    if not edges.size:
+        return 0
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def _ratios(numerators: np.ndarray, denominators: np.ndarray) -> list[float | None]:
+    """
+    분모가 0 인 경우 None 으로 채운 비율 목록을 반환합니다.
+    """
+    ratios = np.divide(
+        numerators,
+        denominators,
+        out=np.full(len(numerators), np.nan),
+        where=denominators > 0,
+    ).round(4)
+    return [None if ratio != ratio else ratio for ratio in ratios.tolist()]
+
+
+def compute_emotion_stats(
+    codes: np.ndarray, start_date: date, granularity: Granularity
+) -> Dict[str, Any]:
+    """
+    하루 단위 감정 코드 배열로부터 감정 통계를 계산합니다.
+    모든 계산은 날짜 수만큼의 numpy 배열 연산으로 이루어지며, 날짜마다 파이썬 코드를 실행하지 않습니다.
+
+    - emotion_counts: 감정별 일 수
+    - ratio_series: 기간(granularity)별 분석된 일 수와 긍정/부정 감정 비율
+    - longest_streaks: 일기 작성(감정 분석), 긍정 감정, 부정 감정이 연속된 최장 일 수
+    - transition_matrix: 전날 감정(행)에서 다음 날 감정(열)으로 바뀐 횟수
+    - rolling_negative_ratios: 날짜별 최근 7일간의 부정 감정 비율
+    """
+    analyzed = codes > 0
+    positive = np.isin(codes, [emotion.code for emotion in POSITIVE_EMOTIONS])
+    negative = np.isin(codes, [emotion.code for emotion in NEGATIVE_EMOTIONS])
+
+    counts = np.bincount(codes, minlength=MAX_EMOTION_CODE + 1)
+
+    days = np.datetime64(start_date, "D") + np.arange(len(codes))
+    if granularity == "day":
+        period_keys = np.arange(len(codes))
+    elif granularity == "week":
+        period_keys = (days - np.datetime64(WEEK_EPOCH, "D")).astype(np.int64) // 7
+    else:
+        period_keys = days.astype("datetime64[M]").astype(np.int64)
+    _, period_starts, periods = np.unique(
+        period_keys, return_index=True, return_inverse=True
+    )
+    analyzed_per_period = np.bincount(periods, weights=analyzed)
+    positive_per_period = np.bincount(periods, weights=positive)
+    negative_per_period = np.bincount(periods, weights=negative)
+
+    previous, following = codes[:-1], codes[1:]
+    transitions = (previous > 0) & (following > 0)
+    transition_matrix = np.bincount(
+        (previous[transitions].astype(np.int64) - 1) * MAX_EMOTION_CODE
+        + following[transitions]
+        - 1,
+        minlength=MAX_EMOTION_CODE * MAX_EMOTION_CODE,
+    ).reshape(MAX_EMOTION_CODE, MAX_EMOTION_CODE)
+
+    analyzed_sums = np.concatenate(([0], np.cumsum(analyzed)))
+    negative_sums = np.concatenate(([0], np.cumsum(negative)))
+    window_starts = np.maximum(np.arange(1, len(codes) + 1) - ROLLING_WINDOW_DAYS, 0)
+    rolling_analyzed = analyzed_sums[1:] - analyzed_sums[window_starts]
+    rolling_negative = negative_sums[1:] - negative_sums[window_starts]
+
+    return {
+        "emotions": [emotion.name for emotion in EMOTIONS],
+        "analyzed_days": int(analyzed.sum()),
+        "emotion_counts": {
+            emotion.name: int(counts[emotion.code]) for emotion in EMOTIONS
+        },
+        "ratio_series": {
+            "start_dates": days[period_starts].astype(object).tolist(),
+            "analyzed_days": analyzed_per_period.astype(np.int64).tolist(),
+            "positive_ratios": _ratios(positive_per_period, analyzed_per_period),
+            "negative_ratios": _ratios(negative_per_period, analyzed_per_period),
+        },
+        "longest_streaks": {
+            "analyzed": _longest_run(analyzed),
+            "positive": _longest_run(positive),
+            "negative": _longest_run(negative),
+        },
+        "transition_matrix": transition_matrix.tolist(),
+        "rolling_negative_ratios": _ratios(rolling_negative, rolling_analyzed),
+    }
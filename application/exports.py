@@ -0,0 +1,219 @@
+import io
+import json
+import logging
+import time
+import zipfile
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import Select, select
+
+from application.models import Diary, MindContent, WeeklyReport, MonthlyReport
+from application.storage import get_storage
+from config.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# 서버 측 커서에서 한 번에 읽을 행 수
+EXPORT_YIELD_PER = 500
+# 이미지 경로를 한 번에 조회할 일기 수
+EXPORT_IMAGE_PAGE_SIZE = 100
+# 압축된 데이터가 이 크기 이상 쌓이면 응답으로 전송합니다.
+EXPORT_FLUSH_SIZE = 64 * 1024
+# 압축 파일 안에서 이미지 파일을 저장하는 디렉터리
+EXPORT_IMAGES_DIR = "images"
+
+
+class ZipOutputStream(io.RawIOBase):
+    """
+    zipfile 이 쓴 바이트를 모아 두었다가 꺼낼 수 있는, 되감을 수 없는 출력 스트림
+    seek 를 지원하지 않으므로 zipfile 은 각 파일의 크기와 CRC 를 파일 내용 뒤(data descriptor)에 기록합니다.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self, min_size: int = 0) -> bytes:
+        """
+        쌓인 데이터가 min_size 이상이면 꺼내서 반환하고, 그렇지 않으면 빈 바이트를 반환합니다.
+        """
+        if not self._buffer or len(self._buffer) < min_size:
+            return b""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def get_image_archive_name(path: str) -> str:
+    return f"{EXPORT_IMAGES_DIR}/{path}"
+
+
+def serialize_diary(diary: Diary) -> dict[str, Any]:
+    return {
+        "id": diary.id,
+        "date": diary.date,
+        "weather": diary.weather,
+        "title": diary.title,
+        "content": diary.content,
+        "analyzed_emotion": (
+            diary.analyzed_emotion.name if diary.analyzed_emotion else None
+        ),
+        "images": [get_image_archive_name(path) for path in diary.image_urls or []],
+        "created_at": diary.created_at,
+        "updated_at": diary.updated_at,
+    }
+
+
+def serialize_mind_content(mind_content: MindContent) -> dict[str, Any]:
+    return {
+        "id": mind_content.id,
+        "diary_id": mind_content.diary_id,
+        "level": mind_content.level,
+        "content": mind_content.content,
+        "created_at": mind_content.created_at,
+        "updated_at": mind_content.updated_at,
+    }
+
+
+def serialize_report(report: WeeklyReport | MonthlyReport) -> dict[str, Any]:
+    return {
+        "id": report.id,
+        "start_date": report.start_date,
+        "end_date": report.end_date,
+        "advice": report.advice,
+    }
+
+
+def get_user_export_files(
+    user_id: int,
+) -> list[tuple[str, Select, Callable[[Any], dict[str, Any]]]]:
+    """
+    압축 파일에 담을 (파일 이름, 쿼리, 한 행을 dict 로 변환하는 함수) 목록을 반환합니다.
+    """
+    return [
+        (
+            "diaries.ndjson",
+            select(Diary).where(Diary.user_id == user_id).order_by(Diary.date),
+            serialize_diary,
+        ),
+        (
+            "mind_contents.ndjson",
+            select(MindContent)
+            .join(Diary, MindContent.diary_id == Diary.id)
+            .where(Diary.user_id == user_id)
+            .order_by(MindContent.id),
+            serialize_mind_content,
+        ),
+        (
+            "weekly_reports.ndjson",
+            select(WeeklyReport)
+            .where(WeeklyReport.user_id == user_id)
+            .order_by(WeeklyReport.start_date),
+            serialize_report,
+        ),
+        (
+            "monthly_reports.ndjson",
+            select(MonthlyReport)
+            .where(MonthlyReport.user_id == user_id)
+            .order_by(MonthlyReport.start_date),
+            serialize_report,
+        ),
+    ]
+
+
+def iter_user_image_path_pages(user_id: int) -> Iterator[list[str]]:
+    """
+    사용자의 일기에 첨부된 이미지 경로를 일기 날짜 순서로 EXPORT_IMAGE_PAGE_SIZE 개의 일기씩 나누어 반환합니다.
+    페이지마다 (user_id, date) 인덱스로 키셋 조회하는 짧은 세션을 열고, 세션을 닫은 뒤 페이지를 반환하므로
+    저장소에서 이미지를 읽어 보내는 동안에는 DB 연결을 잡고 있지 않습니다.
+    """
+    last_date = None
+    while True:
+        stmt = (
+            select(Diary.date, Diary.image_urls)
+            .where(Diary.user_id == user_id, Diary.image_urls.is_not(None))
+            .order_by(Diary.date)
+            .limit(EXPORT_IMAGE_PAGE_SIZE)
+        )
+        if last_date is not None:
+            stmt = stmt.where(Diary.date > last_date)
+        with SessionLocal() as db_session:
+            rows = db_session.execute(stmt).all()
+        if not rows:
+            return
+
+        last_date = rows[-1].date
+        yield [path for _, image_urls in rows for path in image_urls or []]
+
+
+def iter_user_export(user_id: int) -> Iterator[bytes]:
+    """
+    사용자의 일기, 마음챙김 콘텐츠, 리포트와 일기 이미지를 담은 zip 파일을 조각 단위로 반환합니다.
+
+    DB 는 yield_per 로 서버 측 커서에서 나누어 읽고, 이미지는 저장소에서 고정 크기 단위로 읽어
+    압축한 만큼 바로 반환하므로 계정의 데이터 크기와 관계없이 일정한 메모리만 사용합니다.
+    (zip 의 중앙 디렉터리를 위해 파일마다 이름과 크기 정보만 마지막까지 유지합니다.)
+    응답을 보내는 동안 요청의 DB 세션은 이미 닫혀 있으므로, 별도의 세션을 엽니다.
+    이 세션은 NDJSON 파일을 다 쓰면 닫고, 이미지는 페이지마다 경로만 짧게 조회합니다.
+    """
+    output = ZipOutputStream()
+    storage = get_storage()
+
+    with zipfile.ZipFile(output, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with SessionLocal() as db_session:
+            for name, stmt, serialize in get_user_export_files(user_id):
+                with archive.open(name, mode="w") as entry:
+                    rows = db_session.scalars(
+                        stmt.execution_options(yield_per=EXPORT_YIELD_PER)
+                    )
+                    for row in rows:
+                        line = json.dumps(
+                            serialize(row), ensure_ascii=False, default=str
+                        )
+                        entry.write(line.encode() + b"\n")
+                        if data := output.drain(EXPORT_FLUSH_SIZE):
+                            yield data
+                # 다음 파일을 읽는 동안 세션에 객체가 쌓이지 않도록 합니다.
+                db_session.expunge_all()
+
+        # 같은 이미지가 여러 일기에 첨부될 수 있으므로, 압축 파일에 담은 경로를 기억합니다.
+        archived_paths: set[str] = set()
+        for paths in iter_user_image_path_pages(user_id):
+            for path in paths:
+                if path in archived_paths:
+                    continue
+                archived_paths.add(path)
+
+                chunks = storage.stream(path)
+                try:
+                    first_chunk = next(chunks, b"")
+                except Exception:
+                    # 이미 응답을 보내는 중이므로, 읽을 수 없는 파일은 건너뜁니다.
+                    logger.exception("내보낼 이미지 파일을 읽을 수 없습니다: %s", path)
+                    continue
+
+                # 이미지는 이미 압축된 형식이므로 다시 압축하지 않습니다.
+                info = zipfile.ZipInfo(
+                    get_image_archive_name(path), date_time=time.localtime()[:6]
+                )
+                info.compress_type = zipfile.ZIP_STORED
+                with archive.open(info, mode="w") as entry:
+                    entry.write(first_chunk)
+                    for chunk in chunks:
+                        entry.write(chunk)
+                        if data := output.drain(EXPORT_FLUSH_SIZE):
+                            yield data
+
+    yield output.drain()
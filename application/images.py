@@ -0,0 +1,227 @@
+import importlib.util
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum
+from functools import cache
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from application.storage import get_storage
+from application.utils import get_objects_dir, create_temp_file
+from config.db import SessionLocal
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+IMAGE_VARIANTS_SESSION_KEY = "image_variants"
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+WEBP_QUALITY = 80
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImageSize(str, Enum):
+    THUMB = "thumb"
+    MEDIUM = "medium"
+
+    @property
+    def max_edge(self) -> int:
+        """
+        변환된 이미지의 긴 변의 최대 길이(px)
+        """
+        return {ImageSize.THUMB: 256, ImageSize.MEDIUM: 1024}[self]
+
+
+@cache
+def is_pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def has_variants(path: str) -> bool:
+    """
+    주어진 파일에 대해 크기별 WebP 이미지를 제공하는지 여부를 반환합니다.
+    경로가 곧 내용인 내용 주소 방식으로 저장된 이미지만 변환 대상입니다.
+    """
+    return (
+        is_pillow_available()
+        and path.startswith(
+            (f"{get_objects_dir()}/", f"{get_objects_dir(private=True)}/")
+        )
+        and os.path.splitext(path)[1] in IMAGE_EXTENSIONS
+    )
+
+
+def get_variant_path(path: str, size: ImageSize) -> str:
+    """
+    원본 이미지 옆에 저장되는 크기별 WebP 이미지의 경로를 반환합니다.
+    """
+    return f"{path}.{size.value}.webp"
+
+
+def get_image_urls(base_url: str, path: str) -> Dict[str, str]:
+    """
+    원본과 크기별 이미지의 URL 을 {'original': URL, 'medium': URL, 'thumb': URL} 형식으로 반환합니다.
+    변환 대상이 아닌 이미지는 모든 크기에 원본 URL 을 사용합니다.
+    비공개 영역의 이미지는 인증된 파일 API 의 URL 을 사용합니다.
+    """
+    if path.startswith(f"{get_objects_dir(private=True)}/"):
+        original_url = f"{base_url}api/v1/files/{os.path.basename(path)}"
+        variant_urls = {size: f"{original_url}?size={size.value}" for size in ImageSize}
+    else:
+        storage = get_storage()
+        original_url = storage.get_url(path, base_url)
+        variant_urls = {
+            size: storage.get_url(get_variant_path(path, size), base_url)
+            for size in ImageSize
+        }
+
+    urls = {"original": original_url}
+    for size in ImageSize:
+        urls[size.value] = variant_urls[size] if has_variants(path) else original_url
+    return urls
+
+
+def _generate_variants(path: str) -> list[str]:
+    """
+    원본 이미지로부터 크기별 WebP 이미지를 생성하고, 새로 생성된 파일의 경로를 반환합니다.
+    EXIF 의 회전 정보는 픽셀에 반영하고, EXIF 자체는 저장하지 않습니다.
+    """
+    from PIL import Image, ImageOps
+
+    storage = get_storage()
+    missing_sizes = [
+        size for size in ImageSize if not storage.exists(get_variant_path(path, size))
+    ]
+    if not missing_sizes:
+        return []
+
+    generated_paths = []
+    with storage.open(path) as f, Image.open(f) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for size in missing_sizes:
+            variant = image.copy()
+            variant.thumbnail((size.max_edge, size.max_edge))
+
+            variant_path = get_variant_path(path, size)
+            fd, temp_path = create_temp_file()
+            os.close(fd)
+            try:
+                variant.save(temp_path, "WEBP", quality=WEBP_QUALITY, exif=b"")
+                storage.put(variant_path, temp_path, "image/webp")
+            except:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            generated_paths.append(variant_path)
+    return generated_paths
+
+
+class ImageVariantGenerator:
+    """
+    크기별 WebP 이미지 생성을 크기가 제한된 별도 프로세스 풀에서 실행합니다.
+    업로드 직후에는 결과를 기다리지 않고 작업을 넘기며, 대기 중인 작업이 max_pending 을 넘으면
+    작업을 버립니다. 버려진 이미지는 처음 요청될 때 generate 로 생성됩니다.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._generated = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _submit(self, path: str, force: bool = False) -> Future | None:
+        with self._lock:
+            if not force and self._pending >= self.max_pending:
+                self._dropped += 1
+                return None
+            self._pending += 1
+            future = self._get_executor().submit(_generate_variants, path)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.exception() is not None:
+                self._failed += 1
+                logger.warning("이미지 변환 실패: %s", future.exception())
+            else:
+                self._generated += len(future.result())
+
+    def submit(self, paths: list[str]) -> None:
+        """
+        변환 대상인 이미지의 크기별 WebP 이미지 생성을 예약합니다.
+        """
+        for path in paths:
+            if has_variants(path):
+                self._submit(path)
+
+    def generate(self, path: str) -> None:
+        """
+        크기별 WebP 이미지를 생성하고 완료될 때까지 기다립니다.
+        """
+        self._submit(path, force=True).result()
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "generated": self._generated,
+                "dropped": self._dropped,
+                "failed": self._failed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+image_variant_generator = ImageVariantGenerator(
+    max_workers=settings.IMAGE_VARIANT_WORKERS,
+    max_pending=settings.IMAGE_VARIANT_MAX_PENDING,
+)
+
+
+def schedule_image_variants(db_session: Session, paths: list[str]) -> None:
+    """
+    트랜잭션이 커밋되면 주어진 이미지의 크기별 WebP 이미지 생성을 예약합니다.
+    """
+    if not db_session.in_transaction():
+        db_session.begin()
+    db_session.info.setdefault(IMAGE_VARIANTS_SESSION_KEY, []).extend(paths)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _submit_image_variants(db_session: Session) -> None:
+    paths = db_session.info.pop(IMAGE_VARIANTS_SESSION_KEY, None)
+    if paths:
+        image_variant_generator.submit(paths)
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard_image_variants(db_session: Session, previous_transaction) -> None:
+    db_session.info.pop(IMAGE_VARIANTS_SESSION_KEY, None)
@@ -4,6 +4,7 @@ from typing import List
 
 from sqlalchemy import (
     String,
+    Text,
     Date,
     DateTime,
     func,
@@ -12,13 +13,61 @@ from sqlalchemy import (
     Boolean,
     false,
     Integer,
+    BigInteger,
+    SmallInteger,
+    Index,
+    Sequence,
+    select,
+    text,
+    TypeDecorator,
+    FetchedValue,
+    cast,
+    ColumnElement,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    WriteOnlyMapped,
+    mapped_column,
+    relationship,
+    column_property,
+    object_session,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from application.constants import Emotion
 from config.db import Base
 
 
+def get_completed_xid() -> ColumnElement[int]:
+    """
+    현재 스냅샷의 xmin 을 bigint 로 반환하는 SQL 식
+    이보다 작은 ID 의 트랜잭션은 모두 끝났으며, 이후에 커밋되는 트랜잭션은 항상 이 값 이상의 ID 를 가집니다.
+    """
+    return cast(
+        cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger
+    )
+
+
+class EmotionType(TypeDecorator):
+    """
+    Emotion 을 감정 코드(Emotion.code)로 저장하는 smallint 컬럼 타입
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Emotion | str | None, dialect) -> int | None:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = Emotion.from_name(value)
+        return value.code
+
+    def process_result_value(self, value: int | None, dialect) -> Emotion | None:
+        if value is None:
+            return None
+        return Emotion.from_code(value)
+
+
 class IdModel(Base):
     __abstract__ = True
 
@@ -50,7 +99,10 @@ class User(IdModel, TimeStampedModel):
     login_id: Mapped[str] = mapped_column(String(30), unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(100))
     nickname: Mapped[str] = mapped_column(String(30))
-    coin: Mapped[int] = mapped_column(default=0)
+    # 값이 바뀌면 이전에 발급된 토큰이 모두 무효화됩니다.
+    token_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     diaries: Mapped[List["Diary"]] = relationship("Diary", back_populates="user")
     weekly_reports: Mapped[List["WeeklyReport"]] = relationship(
@@ -60,6 +112,9 @@ class User(IdModel, TimeStampedModel):
         "MonthlyReport", back_populates="user"
     )
     items: Mapped[List["UserItem"]] = relationship("UserItem", back_populates="user")
+    coin_ledger: WriteOnlyMapped["CoinLedger"] = relationship(
+        "CoinLedger", order_by="CoinLedger.id"
+    )
 
     @property
     def equipped_accessory(self) -> "StoreItem":
@@ -84,11 +139,14 @@ class User(IdModel, TimeStampedModel):
                 return user_item.item
         return None
 
-    def add_coin(self, amount: int) -> None:
-        """사용자에게 코인을 추가합니다."""
+    def add_coin(self, amount: int, reason: "CoinReason") -> None:
+        """
+        사용자에게 코인을 추가합니다.
+        users 행을 수정하지 않고 코인 원장에 적립 내역을 추가합니다.
+        """
         if amount < 0:
             raise ValueError("코인은 음수로 추가할 수 없습니다.")
-        self.coin += amount
+        self.coin_ledger.add(CoinLedger(amount=amount, reason=reason))
 
     def has_item(self, item: "StoreItem") -> bool:
         """
@@ -108,7 +166,13 @@ class User(IdModel, TimeStampedModel):
     def purchase_item(self, item: "StoreItem") -> "UserItem":
         """
         아이템을 구매합니다.
+        동시에 구매하여 잔액이 음수가 되지 않도록, 사용자 행을 잠근 뒤 잔액을 다시 계산합니다.
+        잠금은 트랜잭션이 끝날 때까지 유지됩니다.
         """
+        db_session = object_session(self)
+        db_session.execute(select(User.id).where(User.id == self.id).with_for_update())
+        db_session.refresh(self, ["coin"])
+
         if self.coin < item.price:
             raise ValueError("코인이 부족합니다.")
 
@@ -117,8 +181,8 @@ class User(IdModel, TimeStampedModel):
             if user_item.item_id == item.id:
                 raise ValueError("이미 구매한 아이템입니다.")
 
-        # 코인 차감, 아이템 구매 기록 생성
-        self.coin -= item.price
+        # 코인 차감 내역, 아이템 구매 기록 생성
+        self.coin_ledger.add(CoinLedger(amount=-item.price, reason=CoinReason.PURCHASE))
         user_item = UserItem(user_id=self.id, item_id=item.id)
 
         return user_item
@@ -159,32 +223,101 @@ class User(IdModel, TimeStampedModel):
 
 class Diary(IdModel, TimeStampedModel):
     __tablename__ = "diaries"
+    __table_args__ = (
+        Index("ix_diaries_user_id_change_xid_id", "user_id", "change_xid", "id"),
+        # 사용자는 날짜마다 일기를 하나만 작성할 수 있습니다.
+        Index("ix_diaries_user_id_date", "user_id", "date", unique=True),
+    )
 
     weather: Mapped[str] = mapped_column(String(20), nullable=False)
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     content: Mapped[str] = mapped_column(String(5000), nullable=False)
     date: Mapped[date] = mapped_column(
-        Date, nullable=False, default=func.current_date()
+        Date, nullable=False, default=func.current_date(), active_history=True
     )
     image_urls: Mapped[List[str]] = mapped_column(JSON, default=list)
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    analyzed_emotion: Mapped[str] = mapped_column(String(20), nullable=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id"), nullable=False, active_history=True
+    )
+    analyzed_emotion: Mapped[Emotion | None] = mapped_column(
+        EmotionType, nullable=True, active_history=True
+    )
+    # 마지막으로 작성/수정한 트랜잭션의 ID (pg_current_xact_id)
+    # 트리거가 채우며, 변경 내역 조회에서 커밋 순서를 보장하는 커서로 사용합니다.
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("0"),
+        server_onupdate=FetchedValue(),
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="diaries")
 
     def analyze_emotion(self, emotion: Emotion) -> None:
         """일기에 감정 분석 결과를 추가합니다."""
-        self.analyzed_emotion = emotion.name
+        self.analyzed_emotion = emotion
 
     def get_analyzed_emotion_enum(self) -> Emotion | None:
-        if not self.analyzed_emotion:
+        return self.analyzed_emotion
+
+    def __repr__(self):
+        return f"Diary(id={self.id}, user_id={self.user_id}, date={self.created_at}, title={self.title})"
+
+
+# 일기 검색 대상 문자열 (제목 + 본문)
+# 검색 쿼리에서 인덱스와 같은 식을 사용해야 ix_diaries_user_id_search_text 를 사용할 수 있습니다.
+diary_search_text = Diary.title + " " + Diary.content
+
+# 한국어는 조사가 단어에 붙어 있어 tsvector 로는 형태소 분석 없이 검색하기 어려우므로,
+# 트라이그램(pg_trgm) GIN 인덱스를 사용합니다. user_id 는 btree_gin 으로 함께 색인하여
+# 사용자 범위 검색에서도 같은 인덱스만으로 대상 일기를 찾을 수 있도록 합니다.
+Index(
+    "ix_diaries_user_id_search_text",
+    Diary.user_id,
+    diary_search_text.label("search_text"),
+    postgresql_using="gin",
+    postgresql_ops={"search_text": "gin_trgm_ops"},
+)
+
+
+class UserEmotionDay(Base):
+    """
+    사용자의 날짜별 감정 코드(Emotion.code)를 저장하는 감정 통계용 테이블
+    일기가 작성, 감정 분석, 수정, 삭제될 때 같은 트랜잭션에서 함께 갱신됩니다.
+    감정이 아직 분석되지 않은 일기는 emotion 이 NULL 입니다.
+    날짜 기준 월 단위로 파티션되며, (user_id, date) 인덱스만으로 감정까지 조회할 수 있습니다.
+    """
+
+    __tablename__ = "user_emotion_days"
+    __table_args__ = (
+        Index(
+            "ix_user_emotion_days_user_id_date",
+            "user_id",
+            "date",
+            unique=True,
+            postgresql_include=["emotion"],
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    emotion: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+
+    # 파티션 테이블은 기본 키 대신 (user_id, date) 유니크 인덱스를 사용합니다.
+    __mapper_args__ = {"primary_key": [user_id, date]}
+
+    def get_emotion_enum(self) -> Emotion | None:
+        if self.emotion is None:
             return None
 
-        return Emotion.from_name(self.analyzed_emotion)
+        return Emotion.from_code(self.emotion)
 
     def __repr__(self):
-        return f"Diary(id={self.id}, user_id={self.user_id}, date={self.created_at}, title={self.title})"
+        return f"UserEmotionDay(user_id={self.user_id}, date={self.date}, emotion={self.emotion})"
 
 
 class MindContent(IdModel, TimeStampedModel):
@@ -239,6 +372,12 @@ class ItemCategory(str, Enum):
     BACKGROUND = "background"
 
 
+# 상점 카탈로그가 변경될 때마다 증가하는 버전
+store_catalog_version_seq = Sequence(
+    "store_catalog_version_seq", metadata=Base.metadata
+)
+
+
 class StoreItem(IdModel):
     __tablename__ = "store_items"
 
@@ -269,3 +408,169 @@ class UserItem(IdModel, TimeStampedModel):
 
     def __repr__(self):
         return f"UserItem(user_id={self.user_id}, item_id={self.item_id}, equipped={self.equipped})"
+
+
+class RefreshTokenFamily(IdModel, TimeStampedModel):
+    """
+    한 번의 로그인으로 시작된 리프레시 토큰 계열을 추적하는 모델
+    토큰을 재발급할 때마다 generation 이 1씩 증가하며, 이전 세대의 토큰이 다시 사용되면
+    탈취된 것으로 보고 계열 전체를 폐기합니다.
+    """
+
+    __tablename__ = "refresh_token_families"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id"), nullable=False, index=True
+    )
+    generation: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revoked: Mapped[bool] = mapped_column(Boolean, server_default=false())
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    def __repr__(self):
+        return f"RefreshTokenFamily(id={self.id}, user_id={self.user_id}, generation={self.generation}, revoked={self.revoked})"
+
+
+class RateLimitCounter(Base):
+    """
+    로그인/회원가입 시도 제한을 여러 워커가 공유할 때 사용하는 구간별 시도 횟수
+    key 는 "제한 이름:대상의 sha256 해시" 이고, bucket 은 구간이 시작되는 시각(epoch 초)입니다.
+    """
+
+    __tablename__ = "rate_limit_counters"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"RateLimitCounter(key={self.key}, bucket={self.bucket}, count={self.count})"
+
+
+class StoredFile(IdModel, TimeStampedModel):
+    """
+    내용의 sha256 해시로 저장된 업로드 파일과 그 파일을 참조하는 횟수
+    같은 내용의 파일은 한 번만 저장되며, 참조 횟수가 0이 된 뒤 유예 기간이 지나면 삭제됩니다.
+    """
+
+    __tablename__ = "stored_files"
+    __table_args__ = (
+        Index(
+            "ix_stored_files_unreferenced",
+            "updated_at",
+            postgresql_where=text("ref_count <= 0"),
+        ),
+    )
+
+    # 공개/비공개 영역에 같은 내용의 파일이 각각 저장될 수 있으므로 경로로 구분합니다.
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    path: Mapped[str] = mapped_column(String(200), unique=True, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"StoredFile(id={self.id}, path={self.path}, ref_count={self.ref_count})"
+
+
+class StoredFileOwner(Base):
+    """
+    비공개 영역에 저장된 파일을 내려받을 수 있는 사용자
+    같은 내용의 파일을 여러 사용자가 올리면 사용자마다 한 행씩 추가됩니다.
+    """
+
+    __tablename__ = "stored_file_owners"
+
+    stored_file_id: Mapped[int] = mapped_column(
+        ForeignKey("stored_files.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+
+    def __repr__(self):
+        return f"StoredFileOwner(stored_file_id={self.stored_file_id}, user_id={self.user_id})"
+
+
+class CoinReason(str, Enum):
+    DIARY_REWARD = "diary_reward"
+    PURCHASE = "purchase"
+
+
+class CoinLedger(IdModel):
+    """
+    코인 적립/차감 내역을 기록하는 추가 전용(append-only) 원장 모델
+    금액이 양수이면 적립, 음수이면 차감입니다.
+    """
+
+    __tablename__ = "coin_ledger"
+    __table_args__ = (
+        Index("ix_coin_ledger_user_id_created_xid", "user_id", "created_xid"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[CoinReason] = mapped_column(String(20), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    # 내역을 추가한 트랜잭션의 ID (pg_current_xact_id)
+    # ID 나 created_at 과 달리 커밋 순서와 관계없이, 스냅샷에 반영되었는지를 판단하는 데 사용합니다.
+    created_xid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("pg_current_xact_id()::text::bigint"),
+    )
+
+    user: Mapped["User"] = relationship("User", viewonly=True)
+
+    def __repr__(self):
+        return f"CoinLedger(id={self.id}, user_id={self.user_id}, amount={self.amount}, reason={self.reason})"
+
+
+class CoinSnapshot(Base):
+    """
+    사용자별 코인 잔액 스냅샷 모델
+    트랜잭션 ID(created_xid) 가 ledger_xmin 보다 작은 원장 내역이 balance 에 반영되어 있습니다.
+    """
+
+    __tablename__ = "coin_snapshots"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ledger_xmin: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"CoinSnapshot(user_id={self.user_id}, balance={self.balance}, ledger_xmin={self.ledger_xmin})"
+
+
+# 코인 잔액 = 최신 스냅샷 잔액 + 스냅샷 이후의 원장 내역 합계
+_snapshot_balance = (
+    select(CoinSnapshot.balance)
+    .where(CoinSnapshot.user_id == User.id)
+    .scalar_subquery()
+)
+_snapshot_ledger_xmin = (
+    select(CoinSnapshot.ledger_xmin)
+    .where(CoinSnapshot.user_id == User.id)
+    .correlate_except(CoinSnapshot)
+    .scalar_subquery()
+)
+_recent_ledger_sum = (
+    select(func.coalesce(func.sum(CoinLedger.amount), 0))
+    .where(
+        CoinLedger.user_id == User.id,
+        CoinLedger.created_xid >= func.coalesce(_snapshot_ledger_xmin, 0),
+    )
+    .scalar_subquery()
+)
+User.coin = column_property(
+    func.coalesce(_snapshot_balance, 0) + _recent_ledger_sum,
+    deferred=True,
+)
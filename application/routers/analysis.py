@@ -1,18 +1,25 @@
-import datetime
+from typing import Annotated
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from sqlalchemy import select
 
 from application.constants import Emotion
 from application.crud import get_model_or_403
+from application.emotion_days import get_emotion_timeline
+from application.emotion_stats import load_daily_emotion_codes, compute_emotion_stats
 from application.models import Diary, WeeklyReport, MonthlyReport
 from application.ai import (
     analyze_diary_emotion,
     analyze_weekly_emotions,
     analyze_monthly_emotions,
 )
-from application.schemas import WeeklyReportRequest, MonthlyReportRequest
-from config.dependencies import SessionDependency, CurrentUser
+from application.schemas import (
+    WeeklyReportRequest,
+    MonthlyReportRequest,
+    EmotionStatsParams,
+    EmotionStatsResponse,
+)
+from config.dependencies import SessionDependency, CurrentUserId
 
 router = APIRouter()
 
@@ -24,13 +31,13 @@ router = APIRouter()
 )
 def analyze_mood(
     diary_id: int,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
     diary = get_model_or_403(
         model_pk=diary_id,
         db_session=db_session,
-        user_id=current_user.id,
+        user_id=current_user_id,
         model_class=Diary,
     )
 
@@ -61,34 +68,23 @@ def analyze_mood(
 )
 def analyze_monthly(
     monthly_report_request: MonthlyReportRequest,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
-    # 시작 날짜, 끝 날짜까지 일기 불러오기
-    stmt = select(Diary).where(
-        Diary.user_id == current_user.id,
-        Diary.date >= monthly_report_request.start_date,
-        Diary.date <= monthly_report_request.end_date,
-    )
-    diaries = db_session.execute(stmt).scalars().all()
-
     # 날짜: 감정 형태로 변환, 감정이 없을 경우 None으로 설정, 일기가 작성되지 않은 경우에도 날짜는 포함
-    emotion_timeline = {}
-    _start_date, _end_date = (
-        monthly_report_request.start_date,
-        monthly_report_request.end_date,
-    )
-    while _start_date <= _end_date:
-        emotion_timeline[_start_date] = None
-        _start_date = _start_date + datetime.timedelta(days=1)
-
-    for diary in diaries:
-        emotion = diary.get_analyzed_emotion_enum()
-        emotion_timeline[diary.date] = emotion.korean_name if emotion else None
+    emotion_timeline = {
+        day: emotion.korean_name if emotion else None
+        for day, emotion in get_emotion_timeline(
+            db_session,
+            current_user_id,
+            monthly_report_request.start_date,
+            monthly_report_request.end_date,
+        ).items()
+    }
 
     # 이미 월간 리포트가 존재하는지 확인
     stmt = select(MonthlyReport).where(
-        MonthlyReport.user_id == current_user.id,
+        MonthlyReport.user_id == current_user_id,
         MonthlyReport.start_date == monthly_report_request.start_date,
         MonthlyReport.end_date == monthly_report_request.end_date,
     )
@@ -102,7 +98,7 @@ def analyze_monthly(
         }
 
     monthly_report = MonthlyReport(
-        user_id=current_user.id,
+        user_id=current_user_id,
         start_date=monthly_report_request.start_date,
         end_date=monthly_report_request.end_date,
         advice=analyze_monthly_emotions(emotion_timeline),
@@ -125,44 +121,23 @@ def analyze_monthly(
 )
 def analyze_weekly(
     weekly_report_request: WeeklyReportRequest,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
-    # 시작 날짜, 끝 날짜까지 일기 불러오기
-    stmt = select(Diary).where(
-        Diary.user_id == current_user.id,
-        Diary.date >= weekly_report_request.start_date,
-        Diary.date <= weekly_report_request.end_date,
-    )
-    diaries = db_session.execute(stmt).scalars().all()
-
     # 날짜: 감정 형태로 변환, 감정이 없을 경우 None으로 설정, 일기가 작성되지 않은 경우에도 날짜는 포함
-    # 스파게티 코드 ...
-    # "emotion_timeline": {
-    #     "2025-06-02": null,
-    #     "2025-06-03": null,
-    #     "2025-06-04": null,
-    #     "2025-06-05": null,
-    #     "2025-06-06": null,
-    #     "2025-06-07": "불안",
-    #     "2025-06-08": null
-    #   },
-    emotion_timeline = {}
-    _start_date, _end_date = (
-        weekly_report_request.start_date,
-        weekly_report_request.end_date,
-    )
-    while _start_date <= _end_date:
-        emotion_timeline[_start_date] = None
-        _start_date = _start_date + datetime.timedelta(days=1)
-
-    for diary in diaries:
-        emotion = diary.get_analyzed_emotion_enum()
-        emotion_timeline[diary.date] = emotion.korean_name if emotion else None
+    emotion_timeline = {
+        day: emotion.korean_name if emotion else None
+        for day, emotion in get_emotion_timeline(
+            db_session,
+            current_user_id,
+            weekly_report_request.start_date,
+            weekly_report_request.end_date,
+        ).items()
+    }
 
     # 이미 주간 리포트가 존재하는지 확인
     stmt = select(WeeklyReport).where(
-        WeeklyReport.user_id == current_user.id,
+        WeeklyReport.user_id == current_user_id,
         WeeklyReport.start_date == weekly_report_request.start_date,
         WeeklyReport.end_date == weekly_report_request.end_date,
     )
@@ -176,7 +151,7 @@ def analyze_weekly(
         }
 
     weekly_report = WeeklyReport(
-        user_id=current_user.id,
+        user_id=current_user_id,
         start_date=weekly_report_request.start_date,
         end_date=weekly_report_request.end_date,
         advice=analyze_weekly_emotions(emotion_timeline),
@@ -190,3 +165,25 @@ def analyze_weekly(
         "emotion_timeline": emotion_timeline,
         "advice": weekly_report.advice,
     }
+
+
+@router.get(
+    "/stats",
+    response_model=EmotionStatsResponse,
+    summary="감정 통계 조회",
+    description="기간 내 감정별 일 수, 기간별 긍정/부정 감정 비율, 최장 연속 일 수, 감정 전이 행렬, 최근 7일 부정 감정 비율을 조회하는 API입니다. 최대 3660일까지 조회할 수 있습니다.",
+)
+def read_emotion_stats(
+    params: Annotated[EmotionStatsParams, Query()],
+    current_user_id: CurrentUserId,
+    db_session: SessionDependency,
+):
+    codes = load_daily_emotion_codes(
+        db_session, current_user_id, params.from_date, params.to_date
+    )
+    return EmotionStatsResponse(
+        start_date=params.from_date,
+        end_date=params.to_date,
+        granularity=params.granularity,
+        **compute_emotion_stats(codes, params.from_date, params.granularity),
+    )
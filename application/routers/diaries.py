@@ -4,25 +4,77 @@ from datetime import timedelta
 from datetime import date
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, HTTPException, Form, Path
 from fastapi.params import Query
-from sqlalchemy import func, and_, exists, select
+from sqlalchemy import (
+    func,
+    and_,
+    exists,
+    select,
+    tuple_,
+    literal,
+    cast,
+    Double,
+)
+from sqlalchemy.orm import load_only
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
+from starlette.responses import Response
 
-from application.constants import Emotion, MindContentType
-from application.crud import get_model_or_404, get_model_or_403
-from application.models import Diary, MindContent
+from application.conditional import (
+    make_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag,
+)
+from application.constants import MindContentType, DIARY_REWARD_COIN
+from application.diary_import import iter_import_lines, import_diary_batch
+from application.images import schedule_image_variants
+from application.crud import (
+    get_model_or_404,
+    get_model_or_403,
+    register_stored_files,
+)
+from application.models import (
+    Diary,
+    MindContent,
+    CoinReason,
+    WeeklyReport,
+    diary_search_text,
+    get_completed_xid,
+)
 from application.schemas import (
     DiaryResponse,
     DiaryCreateInput,
     DiaryListParams,
     DiaryCalendarResponse,
+    DiaryChangesParams,
+    DiaryChangesResponse,
+    DiaryImportResponse,
+    DiaryImportRowResult,
+    DiarySearchParams,
+    DiarySearchResponse,
+    DiarySearchResult,
+    DiaryMonthBundleResponse,
+    DiaryBundleEntry,
+    WeekBundle,
+    WeeklyReportSummary,
     MindContentRecommendationResponse,
     MindContentCreateRequest,
 )
-from application.utils import write_file
-from config.dependencies import CurrentUser, SessionDependency
+from application.weekly_emotions import weekly_emotion_cache
+from application.utils import (
+    write_files,
+    track_uploaded_files,
+    encode_cursor,
+    decode_cursor,
+    encode_search_cursor,
+    decode_search_cursor,
+)
+from config.dependencies import CurrentUser, SessionDependency, CurrentUserId
+from config.ratelimit import limit_user_imports
+from config.settings import settings
 
 router = APIRouter()
 
@@ -55,25 +107,81 @@ def create_diary(
             detail="이미 해당 날짜에 일기가 존재합니다.",
         )
 
+    stored_files = write_files(request_formdata.image_files, private=True)
+    track_uploaded_files(db_session, stored_files)
+    register_stored_files(db_session, stored_files, owner_id=current_user.id)
+    schedule_image_variants(db_session, [f.path for f in stored_files])
+
     diary = Diary(
         user_id=current_user.id,
         date=request_formdata.diary_date,
         weather=request_formdata.weather,
         title=request_formdata.title,
         content=request_formdata.content,
-        image_urls=[
-            write_file(current_user.login_id, file)
-            for file in request_formdata.image_files
-        ],
+        image_urls=[stored_file.path for stored_file in stored_files],
     )
     db_session.add(diary)
     db_session.flush()
-    current_user.add_coin(100)
+    current_user.add_coin(DIARY_REWARD_COIN, CoinReason.DIARY_REWARD)
     db_session.refresh(diary)
 
     return DiaryResponse.from_diary(request=request, diary=diary)
 
 
+@router.post(
+    "/import",
+    response_model=DiaryImportResponse,
+    summary="일기 가져오기",
+    description='다른 일기 앱에서 내보낸 일기를 한 번에 가져오는 API입니다. 요청 본문은 한 줄에 일기 하나({"date", "weather", "title", "content"})인 NDJSON 이며, 줄마다 추가 여부를 반환합니다. 미래 날짜나 너무 오래된 날짜의 일기는 가져올 수 없으며, 이미 일기가 있는 날짜는 건너뛰고, 추가된 일기마다 코인이 적립됩니다. analyze 가 true 이면 추가된 일기의 감정을 백그라운드에서 분석합니다.',
+)
+async def import_diaries(
+    request: Request,
+    current_user: CurrentUser,
+    db_session: SessionDependency,
+    analyze: bool = False,
+):
+    """
+    요청 본문을 읽으면서 DIARY_IMPORT_BATCH_SIZE 줄씩 추가하고 배치마다 커밋합니다.
+    한 요청에서는 DIARY_IMPORT_MAX_ROWS 줄까지 처리하며, 나머지는 next_line 부터 다시 요청해야 합니다.
+    """
+    await run_in_threadpool(limit_user_imports, current_user.id)
+
+    def import_batch(
+        lines: list[tuple[int, bytes | None]],
+    ) -> list[DiaryImportRowResult]:
+        batch_results = import_diary_batch(db_session, current_user, lines, analyze)
+        db_session.commit()
+        return batch_results
+
+    results: list[DiaryImportRowResult] = []
+    batch: list[tuple[int, bytes | None]] = []
+    next_line = None
+    row_count = 0
+    async for line_number, raw in iter_import_lines(request.stream()):
+        if raw is not None and not raw.strip():
+            continue
+        if row_count >= settings.DIARY_IMPORT_MAX_ROWS:
+            next_line = line_number
+            break
+        row_count += 1
+        batch.append((line_number, raw))
+        if len(batch) >= settings.DIARY_IMPORT_BATCH_SIZE:
+            results += await run_in_threadpool(import_batch, batch)
+            batch = []
+    if batch:
+        results += await run_in_threadpool(import_batch, batch)
+
+    created = sum(result.status == "created" for result in results)
+    return DiaryImportResponse(
+        created=created,
+        duplicates=sum(result.status == "duplicate" for result in results),
+        invalid=sum(result.status == "invalid" for result in results),
+        coins=created * DIARY_REWARD_COIN,
+        results=results,
+        next_line=next_line,
+    )
+
+
 @router.get(
     "/",
     response_model=dict[date, DiaryCalendarResponse],
@@ -82,19 +190,34 @@ def create_diary(
 )
 def read_diaries(
     request: Request,
-    current_user: CurrentUser,
+    response: Response,
+    current_user_id: CurrentUserId,
     params: Annotated[DiaryListParams, Query()],
     db_session: SessionDependency,
 ):
-    stmt = (
-        select(Diary)
-        .where(
-            Diary.user_id == current_user.id,
-            func.extract("year", Diary.date) == params.year,
-            func.extract("month", Diary.date) == params.month,
-        )
-        .order_by(Diary.date.desc())
+    month_filter = (
+        Diary.user_id == current_user_id,
+        Diary.date >= params.start_date,
+        Diary.date <= params.end_date,
     )
+
+    # 일기를 불러오기 전에 개수와 마지막 변경 트랜잭션 ID 만으로 변경 여부를 확인
+    # updated_at 은 트랜잭션 시작 시각이라 늦게 커밋된 변경이 더 이른 값을 가질 수 있지만,
+    # change_xid 는 작성, 수정, 감정 분석마다 새 트랜잭션 ID 로 갱신되므로 변경이 있으면 값이 달라집니다.
+    stmt = select(func.count(Diary.id), func.max(Diary.change_xid)).where(*month_filter)
+    diaries_count, last_change_xid = db_session.execute(stmt).one()
+    etag = make_etag(
+        "diaries",
+        current_user_id,
+        params.year_and_month,
+        diaries_count,
+        last_change_xid,
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+
+    stmt = select(Diary).where(*month_filter).order_by(Diary.date.desc())
     diaries = db_session.execute(stmt).scalars().all()
 
     return {
@@ -103,6 +226,230 @@ def read_diaries(
     }
 
 
+@router.get(
+    "/changes",
+    response_model=DiaryChangesResponse,
+    summary="일기 변경 내역 조회",
+    description="커서 이후에 작성, 수정, 감정 분석된 일기 목록을 변경이 커밋된 순서로 조회하는 API입니다. 응답의 next_cursor 를 다음 요청의 since 로 전달하면 이어서 조회할 수 있습니다.",
+)
+def read_diary_changes(
+    request: Request,
+    current_user_id: CurrentUserId,
+    params: Annotated[DiaryChangesParams, Query()],
+    db_session: SessionDependency,
+):
+    """
+    (user_id, change_xid, id) 인덱스를 사용하는 키셋 페이지네이션으로 변경된 일기만 조회합니다.
+
+    updated_at(now()) 은 트랜잭션 시작 시각이라, 먼저 시작했지만 나중에 커밋된 변경이
+    이미 전달한 커서보다 앞에 놓여 누락될 수 있습니다. 대신 변경한 트랜잭션 ID 를 커서로 사용하고,
+    현재 스냅샷의 xmin 보다 작은(모두 끝난) 트랜잭션의 변경만 반환합니다. 이후에 커밋되는 변경은
+    항상 xmin 이상의 트랜잭션 ID 를 가지므로, 다음 커서보다 뒤에 놓입니다.
+    진행 중인 트랜잭션이 있으면 그보다 나중의 변경은 트랜잭션이 끝날 때까지 반환이 늦춰집니다.
+    일기 삭제 기능이 생기면 삭제 내역(tombstone)도 함께 반환해야 합니다.
+    """
+    stmt = select(Diary).where(
+        Diary.user_id == current_user_id,
+        Diary.change_xid < get_completed_xid(),
+    )
+    if params.since:
+        try:
+            since_change_xid, since_id = decode_cursor(params.since)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="유효하지 않은 커서입니다.",
+            )
+        stmt = stmt.where(
+            tuple_(Diary.change_xid, Diary.id) > tuple_(since_change_xid, since_id)
+        )
+    stmt = stmt.order_by(Diary.change_xid, Diary.id).limit(params.limit + 1)
+    diaries = db_session.execute(stmt).scalars().all()
+
+    has_more = len(diaries) > params.limit
+    diaries = diaries[: params.limit]
+    next_cursor = (
+        encode_cursor(diaries[-1].change_xid, diaries[-1].id)
+        if diaries
+        else params.since
+    )
+
+    return DiaryChangesResponse(
+        diaries=[
+            DiaryResponse.from_diary(request=request, diary=diary) for diary in diaries
+        ],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=DiarySearchResponse,
+    summary="일기 검색",
+    description="현재 로그인한 사용자의 일기를 제목과 본문으로 검색하는 API입니다. 검색어와 비슷한 순서로 반환하며, 응답의 next_cursor 를 다음 요청의 cursor 로 전달하면 이어서 조회할 수 있습니다.",
+)
+def search_diaries(
+    request: Request,
+    current_user_id: CurrentUserId,
+    params: Annotated[DiarySearchParams, Query()],
+    db_session: SessionDependency,
+):
+    """
+    (user_id, 제목 + 본문) 트라이그램 GIN 인덱스로 검색어와 비슷한 부분이 있는 일기를 찾고,
+    word_similarity 점수와 ID 순서의 키셋 페이지네이션으로 반환합니다.
+    """
+    query = literal(params.q)
+    # real 로 계산되는 점수를 double 로 변환하여, 커서에 담긴 점수와 정확히 비교되도록 합니다.
+    rank = cast(func.word_similarity(query, diary_search_text), Double)
+
+    stmt = (
+        select(Diary, rank)
+        .options(
+            load_only(
+                Diary.id,
+                Diary.weather,
+                Diary.title,
+                Diary.image_urls,
+                Diary.analyzed_emotion,
+                Diary.created_at,
+            )
+        )
+        .where(
+            Diary.user_id == current_user_id,
+            # <% 는 || 와 우선순위가 같으므로, 검색 대상 문자열을 괄호로 묶도록 합니다.
+            query.op("<%", precedence=5, is_comparison=True)(diary_search_text),
+        )
+    )
+    if params.cursor:
+        try:
+            cursor_rank, cursor_id = decode_search_cursor(params.cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="유효하지 않은 커서입니다.",
+            )
+        stmt = stmt.where(tuple_(rank, Diary.id) < tuple_(cursor_rank, cursor_id))
+    stmt = stmt.order_by(rank.desc(), Diary.id.desc()).limit(params.limit + 1)
+    rows = db_session.execute(stmt).all()
+
+    has_more = len(rows) > params.limit
+    rows = rows[: params.limit]
+
+    return DiarySearchResponse(
+        diaries=[
+            DiarySearchResult.from_diary_and_rank(
+                request=request, diary=diary, rank=round(diary_rank, 4)
+            )
+            for diary, diary_rank in rows
+        ],
+        next_cursor=(
+            encode_search_cursor(rows[-1][1], rows[-1][0].id) if has_more else None
+        ),
+    )
+
+
+@router.get(
+    "/months/{year_and_month}/bundle",
+    response_model=DiaryMonthBundleResponse,
+    summary="월간 캘린더 화면 조회",
+    description="캘린더 화면에 필요한 데이터를 한 번에 조회하는 API입니다. 해당 월의 일기 목록과 일기별 마음챙김 콘텐츠 저장 여부, 주차별 감정 개수와 이미 생성된 주간 리포트를 반환합니다.",
+)
+def read_month_bundle(
+    request: Request,
+    year_and_month: Annotated[
+        str,
+        Path(
+            description="조회할 연도와 월을 'YYYY-MM' 형식으로 입력하세요.",
+            pattern=r"^\d{4}-(0[1-9]|1[0-2])$",
+        ),
+    ],
+    current_user_id: CurrentUserId,
+    db_session: SessionDependency,
+):
+    """
+    해당 월이 걸쳐 있는 주(월요일~일요일) 전체를 범위로 두 번의 쿼리만 실행합니다.
+    """
+    params = DiaryListParams(year_and_month=year_and_month)
+    first_monday = params.start_date - timedelta(days=params.start_date.weekday())
+    last_sunday = params.end_date + timedelta(days=6 - params.end_date.weekday())
+
+    # 1. 주 범위의 일기와 마음챙김 콘텐츠 레벨 (본문 제외)
+    stmt = (
+        select(Diary, MindContent.level)
+        .outerjoin(MindContent, MindContent.diary_id == Diary.id)
+        .where(
+            Diary.user_id == current_user_id,
+            Diary.date >= first_monday,
+            Diary.date <= last_sunday,
+        )
+        .options(
+            load_only(
+                Diary.id,
+                Diary.weather,
+                Diary.title,
+                Diary.date,
+                Diary.image_urls,
+                Diary.analyzed_emotion,
+                Diary.created_at,
+            )
+        )
+        .order_by(Diary.date.desc())
+    )
+    rows = db_session.execute(stmt).all()
+
+    # 2. 주 범위의 주간 리포트
+    stmt = select(WeeklyReport).where(
+        WeeklyReport.user_id == current_user_id,
+        WeeklyReport.start_date >= first_monday,
+        WeeklyReport.end_date <= last_sunday,
+    )
+    weekly_reports = {
+        report.start_date: report for report in db_session.scalars(stmt).all()
+    }
+
+    weeks: dict[date, WeekBundle] = {}
+    week_start = first_monday
+    while week_start <= last_sunday:
+        report = weekly_reports.get(week_start)
+        weeks[week_start] = WeekBundle(
+            start_date=week_start,
+            end_date=week_start + timedelta(days=6),
+            emotion_counts={},
+            weekly_report=(
+                WeeklyReportSummary(
+                    start_date=report.start_date,
+                    end_date=report.end_date,
+                    advice=report.advice,
+                )
+                if report
+                else None
+            ),
+        )
+        week_start += timedelta(days=7)
+
+    diaries = {}
+    for diary, mind_content_level in rows:
+        emotion = diary.get_analyzed_emotion_enum()
+        if emotion:
+            week = weeks[diary.date - timedelta(days=diary.date.weekday())]
+            week.emotion_counts[emotion.name] = (
+                week.emotion_counts.get(emotion.name, 0) + 1
+            )
+        if params.start_date <= diary.date <= params.end_date:
+            diaries[diary.date] = DiaryBundleEntry.from_diary_and_level(
+                request=request,
+                diary=diary,
+                mind_content_level=mind_content_level,
+            )
+
+    return DiaryMonthBundleResponse(
+        year_and_month=year_and_month,
+        diaries=diaries,
+        weeks=list(weeks.values()),
+    )
+
+
 @router.get(
     "/{diary_id}",
     response_model=DiaryResponse,
@@ -111,23 +458,29 @@ def read_diaries(
 )
 def read_diary_by_id(
     request: Request,
+    response: Response,
     diary_id: int,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
-    stmt = select(Diary).where(
+    stmt = select(Diary.updated_at).where(
         Diary.id == diary_id,
-        Diary.user_id == current_user.id,
+        Diary.user_id == current_user_id,
     )
-    result = db_session.execute(stmt)
-    diary = result.scalar_one_or_none()
+    updated_at = db_session.execute(stmt).scalar_one_or_none()
 
-    if not diary:
+    if not updated_at:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="일기를 찾을 수 없습니다.",
         )
 
+    etag = make_etag("diary", diary_id, updated_at, request.base_url)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+
+    diary = db_session.get(Diary, diary_id)
     return DiaryResponse.from_diary(request=request, diary=diary)
 
 
@@ -138,7 +491,7 @@ def read_diary_by_id(
 )
 def read_mind_contents_level(
     diary_id: int,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
     """
@@ -147,52 +500,21 @@ def read_mind_contents_level(
     - 부정적인 감정 50% 이상 - Level3 자신을 칭찬하는 문장 3개 받기 (Input)
     """
 
-    negative_emotions = [
-        Emotion.SAD.name,
-        Emotion.ANXIOUS.name,
-        Emotion.ANGRY.name,
-        Emotion.TIRED.name,
-        Emotion.LONELY.name,
-        Emotion.BORED.name,
-        Emotion.REGRETFUL.name,
-        Emotion.JEALOUS.name,
-        Emotion.CONFUSED.name,
-    ]
-
-    diary = get_model_or_404(
+    diary = get_model_or_403(
         model_pk=diary_id,
         db_session=db_session,
+        user_id=current_user_id,
         model_class=Diary,
     )
 
-    # 오늘이 화~일요일일 경우 -> 이번 주의 월요일~일기까지의 부정적인 감정 비율을 계산
-    # 월요일부터 오늘까지의 일기만 조회
-    start_date = diary.date - timedelta(days=diary.date.weekday())
-    end_date = diary.date
-    total_diaries_count = (
-        db_session.query(Diary)
-        .filter(
-            Diary.user_id == current_user.id,
-            Diary.date >= start_date,
-            Diary.date <= end_date,
-        )
-        .count()
-    )
-
-    # 월요일부터 오늘까지의 일기에서 부정적인 감정 개수 조회
-    stmt = select(func.count()).where(
-        Diary.user_id == current_user.id,
-        Diary.date >= start_date,
-        Diary.date <= end_date,
-        Diary.analyzed_emotion.in_(negative_emotions),
+    # 이번 주의 월요일부터 일기 날짜까지의 부정적인 감정 비율을 계산
+    total_diaries_count, negative_emotion_count = weekly_emotion_cache.get(
+        db_session, current_user_id, diary.date
+    ).count_until(diary.date)
+    negative_emotion_ratio = (
+        negative_emotion_count / total_diaries_count if total_diaries_count else 0
     )
-    negative_emotion_count = db_session.execute(stmt).scalar_one_or_none() or 0
-    negative_emotion_ratio = negative_emotion_count / total_diaries_count
-    if (
-        negative_emotion_ratio < 0.3
-        or total_diaries_count == 0
-        or date.today().weekday() == 0
-    ):
+    if negative_emotion_ratio < 0.3 or date.today().weekday() == 0:
         return MindContentRecommendationResponse.from_mind_content_type(
             mind_content_type=MindContentType.from_level(1)
         )
@@ -213,14 +535,14 @@ def read_mind_contents_level(
 )
 def create_mind_content(
     diary_id: int,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
     mind_content_create_request: MindContentCreateRequest,
 ):
     diary = get_model_or_403(
         model_pk=diary_id,
         db_session=db_session,
-        user_id=current_user.id,
+        user_id=current_user_id,
         model_class=Diary,
     )
 
@@ -265,13 +587,13 @@ def create_mind_content(
 )
 def read_mind_content(
     diary_id: int,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
     diary = get_model_or_403(
         model_pk=diary_id,
         db_session=db_session,
-        user_id=current_user.id,
+        user_id=current_user_id,
         model_class=Diary,
     )
 
@@ -0,0 +1,88 @@
+import mimetypes
+import os
+import re
+
+from fastapi import APIRouter, HTTPException, status
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, RedirectResponse
+
+from application.crud import is_file_owner
+from application.images import (
+    ImageSize,
+    has_variants,
+    get_variant_path,
+    image_variant_generator,
+)
+from application.storage import LocalStorage, get_storage
+from application.utils import get_content_addressed_path
+from config.dependencies import SessionDependency, CurrentUserId
+from config.settings import settings
+
+router = APIRouter()
+
+FILE_NAME_PATTERN = re.compile(r"([0-9a-f]{64})(\.[a-z0-9]{1,10})?")
+# 내용이 바뀌지 않는 파일이므로, 인증된 사용자의 브라우저에만 오래 캐시
+PRIVATE_IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@router.get(
+    "/{file_name}",
+    response_class=FileResponse,
+    summary="파일 조회",
+    description="현재 로그인한 사용자가 업로드한 비공개 파일(일기 이미지 등)을 반환하는 API입니다. size 를 지정하면 크기별 WebP 이미지를 반환합니다.",
+)
+def read_file(
+    request: Request,
+    file_name: str,
+    current_user_id: CurrentUserId,
+    db_session: SessionDependency,
+    size: ImageSize | None = None,
+):
+    not_found_exception = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="찾을 수 없는 파일입니다.",
+    )
+
+    match = FILE_NAME_PATTERN.fullmatch(file_name)
+    if not match:
+        raise not_found_exception
+
+    path = get_content_addressed_path(match.group(1), file_name, private=True)
+    if not is_file_owner(db_session, current_user_id, path):
+        raise not_found_exception
+
+    storage = get_storage()
+    if size is not None and has_variants(path):
+        variant_path = get_variant_path(path, size)
+        try:
+            if not storage.exists(variant_path):
+                image_variant_generator.generate(path)
+            path = variant_path
+        except Exception:
+            # 변환할 수 없는 이미지는 원본을 그대로 반환
+            pass
+
+    # 오브젝트 스토리지는 만료 시간이 있는 서명된 URL 로 리다이렉트
+    if not isinstance(storage, LocalStorage):
+        return RedirectResponse(
+            storage.get_url(
+                path,
+                str(request.base_url),
+                expires_in=settings.S3_PRESIGNED_URL_EXPIRE_SECONDS,
+            ),
+            headers={"Cache-Control": "private, no-store"},
+        )
+
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    headers = {"Cache-Control": PRIVATE_IMMUTABLE_CACHE_CONTROL}
+
+    # nginx 를 거친 요청이면 파일 전송을 nginx 에 맡김 (sendfile, Range 처리)
+    if request.headers.get("x-sendfile-type") == "X-Accel-Redirect":
+        return Response(
+            media_type=media_type,
+            headers={**headers, "X-Accel-Redirect": f"/{path}"},
+        )
+
+    if not os.path.exists(path):
+        raise not_found_exception
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -0,0 +1,63 @@
+import re
+
+from fastapi import APIRouter, HTTPException, status
+from starlette.requests import Request
+from starlette.responses import FileResponse, RedirectResponse
+
+from application.images import (
+    IMMUTABLE_CACHE_CONTROL,
+    ImageSize,
+    has_variants,
+    get_variant_path,
+    image_variant_generator,
+)
+from application.storage import LocalStorage, get_storage
+from config.settings import settings
+
+router = APIRouter()
+
+VARIANT_PATH_PATTERN = re.compile(
+    r"(objects/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]{1,10})"
+    r"\.(thumb|medium)\.webp"
+)
+
+
+@router.get(
+    "/{variant_path:path}",
+    response_class=FileResponse,
+    summary="크기별 이미지 조회",
+    description="원본 이미지의 크기별 WebP 이미지를 반환하는 API입니다. 아직 생성되지 않은 경우 이 요청에서 생성합니다. 로컬 저장소에서는 nginx 에 파일이 없을 때만 호출되고, 오브젝트 스토리지에서는 생성 후 저장소 URL 로 리다이렉트합니다.",
+)
+def read_image_variant(request: Request, variant_path: str):
+    not_found_exception = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="찾을 수 없는 이미지입니다.",
+    )
+
+    match = VARIANT_PATH_PATTERN.fullmatch(variant_path)
+    if not match:
+        raise not_found_exception
+
+    storage = get_storage()
+    original_path = f"{settings.UPLOAD_DIR}/{match.group(1)}"
+    if not has_variants(original_path) or not storage.exists(original_path):
+        raise not_found_exception
+
+    path = get_variant_path(original_path, ImageSize(match.group(2)))
+    if not storage.exists(path):
+        try:
+            image_variant_generator.generate(original_path)
+        except Exception:
+            raise not_found_exception
+
+    if not isinstance(storage, LocalStorage):
+        return RedirectResponse(
+            storage.get_url(path, str(request.base_url)),
+            status_code=status.HTTP_301_MOVED_PERMANENTLY,
+            headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL},
+        )
+    return FileResponse(
+        path,
+        media_type="image/webp",
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
@@ -1,14 +1,21 @@
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
 from starlette.requests import Request
+from starlette.responses import Response
 
+from application.conditional import (
+    make_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag,
+)
+from application.catalog import store_catalog_cache, get_owned_items
 from application.models import StoreItem, ItemCategory
 from application.crud import get_model_or_404
 from application.schemas import (
     StoreItemResponse,
     UserItemResponse,
 )
-from config.dependencies import SessionDependency, CurrentUser
+from config.dependencies import SessionDependency, CurrentUser, CurrentUserId
 
 router = APIRouter()
 
@@ -21,25 +28,37 @@ router = APIRouter()
 )
 def get_store_items(
     request: Request,
+    response: Response,
     category: ItemCategory,
     db_session: SessionDependency,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
 ):
     """
     상점 아이템 목록을 조회합니다.
+    아이템 목록은 캐시된 카탈로그에서 가져오고, 사용자의 보유 여부만 DB 에서 조회합니다.
     """
-    stmt = (
-        select(StoreItem).where(StoreItem.category == category).order_by(StoreItem.id)
+    catalog = store_catalog_cache.get(db_session)
+    owned_items = get_owned_items(db_session, current_user_id)
+
+    etag = make_etag(
+        "store-items",
+        catalog.version,
+        category.value,
+        sorted(owned_items.items()),
+        request.base_url,
     )
-    store_items = db_session.scalars(stmt).all()
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
 
     return [
-        StoreItemResponse.from_store_item(
+        StoreItemResponse.from_catalog_item(
             request=request,
-            store_item=store_item,
-            current_user=current_user,
+            catalog=catalog,
+            catalog_item=catalog_item,
+            owned_items=owned_items,
         )
-        for store_item in store_items
+        for catalog_item in catalog.items_by_category.get(category.value, ())
     ]
 
 
@@ -52,17 +71,25 @@ def get_store_items(
 def get_store_item(
     item_id: int,
     request: Request,
-    current_user: CurrentUser,
+    current_user_id: CurrentUserId,
     db_session: SessionDependency,
 ):
     """
     주어진 ID로 상점 아이템의 상세 정보를 조회합니다.
     """
-    store_item = get_model_or_404(item_id, db_session, StoreItem)
-    return StoreItemResponse.from_store_item(
+    catalog = store_catalog_cache.get(db_session)
+    catalog_item = catalog.items_by_id.get(item_id)
+    if not catalog_item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="찾을 수 없는 리소스입니다.",
+        )
+
+    return StoreItemResponse.from_catalog_item(
         request=request,
-        store_item=store_item,
-        current_user=current_user,
+        catalog=catalog,
+        catalog_item=catalog_item,
+        owned_items=get_owned_items(db_session, current_user_id),
     )
 
 
@@ -1,21 +1,39 @@
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from jwt import InvalidTokenError
+from sqlalchemy import select, func
 from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
 
-from config.dependencies import SessionDependency, CurrentUser
+from config.dependencies import SessionDependency, CurrentUser, CurrentUserId
+from config.ratelimit import (
+    limit_login_attempts,
+    limit_signup_attempts,
+    limit_user_exports,
+)
+from config.settings import settings
 from config.security import (
     get_password_hash,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
+    decode_token,
+)
+from application.catalog import store_catalog_cache
+from application.conditional import (
+    make_etag,
+    is_not_modified,
+    not_modified_response,
+    set_etag,
 )
-from application.models import User, UserItem
+from application.exports import iter_user_export
+from application.models import User, UserItem, RefreshTokenFamily
 from application.schemas import (
     UserCreateInput,
     TokenResponse,
+    TokenRefreshRequest,
     UserResponse,
 )
 
@@ -25,6 +43,7 @@ router = APIRouter()
 @router.post(
     "/signup",
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_signup_attempts)],
     summary="회원가입",
     description="사용자 정보를 입력받아 새로운 사용자를 생성하는 API입니다.",
 )
@@ -62,14 +81,55 @@ def create_user(
 )
 def read_current_user(
     request: Request,
+    response: Response,
     current_user: CurrentUser,
+    db_session: SessionDependency,
 ):
+    # 보유/장착 아이템은 개수와 마지막 수정일시로, 아이템 이미지는 카탈로그 버전으로 변경 여부를 확인
+    stmt = select(func.count(UserItem.id), func.max(UserItem.updated_at)).where(
+        UserItem.user_id == current_user.id
+    )
+    items_count, items_updated_at = db_session.execute(stmt).one()
+    etag = make_etag(
+        "me",
+        current_user.id,
+        current_user.updated_at,
+        current_user.coin,
+        items_count,
+        items_updated_at,
+        store_catalog_cache.get(db_session).version,
+        request.base_url,
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+
     return UserResponse.from_user(request, current_user)
 
 
+@router.get(
+    "/me/export",
+    response_class=StreamingResponse,
+    summary="내 데이터 내보내기",
+    description="현재 로그인한 사용자의 일기, 마음챙김 콘텐츠, 주간/월간 리포트(NDJSON)와 일기 이미지를 zip 파일로 내려받는 API입니다. 압축 파일은 내려받는 동안 만들어집니다.",
+)
+def export_current_user_data(current_user_id: CurrentUserId):
+    limit_user_exports(current_user_id)
+    file_name = f"export-{current_user_id}-{date.today().isoformat()}.zip"
+    return StreamingResponse(
+        iter_user_export(current_user_id),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={file_name}",
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
 @router.post(
     "/login",
     response_model=TokenResponse,
+    dependencies=[Depends(limit_login_attempts)],
     summary="로그인",
     description="사용자 ID와 비밀번호를 입력받아 로그인하고, 액세스 토큰과 리프레시 토큰을 반환하는 API입니다.",
 )
@@ -81,17 +141,108 @@ def login(
         db_session.query(User).filter(User.login_id == oauth2_formdata.username).first()
     )
 
-    if not user or not verify_password(oauth2_formdata.password, user.hashed_password):
+    verified, new_hashed_password = (
+        verify_and_update_password(oauth2_formdata.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="잘못된 사용자 ID 또는 비밀번호입니다.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(str(user.login_id))
-    refresh_token = create_refresh_token(str(user.login_id))
+    # 해시 설정이 바뀐 경우, 로그인 시점에 새 설정으로 다시 해시하여 저장
+    if new_hashed_password:
+        user.hashed_password = new_hashed_password
+
+    family = RefreshTokenFamily(
+        user_id=user.id,
+        generation=0,
+        expires_at=get_refresh_token_expires_at(),
+    )
+    db_session.add(family)
+    db_session.flush()
+
+    return issue_tokens(user.id, user.token_version, family)
+
+
+@router.post(
+    "/token/refresh",
+    response_model=TokenResponse,
+    summary="토큰 재발급",
+    description="리프레시 토큰을 받아 새로운 액세스 토큰과 리프레시 토큰을 반환하는 API입니다. 사용된 리프레시 토큰은 더 이상 사용할 수 없으며, 다시 사용되면 해당 로그인의 모든 리프레시 토큰이 폐기됩니다.",
+)
+def refresh_tokens(
+    request_body: TokenRefreshRequest,
+    db_session: SessionDependency,
+):
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="유효하지 않은 리프레시 토큰입니다.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        payload = decode_token(request_body.refresh_token)
+        if payload.get("type") != "refresh":
+            raise ValueError("refresh 토큰이 아닙니다.")
+        user_id = int(payload["sub"])
+        token_version = int(payload["ver"])
+        family_id = int(payload["fam"])
+        generation = int(payload["gen"])
+    except (InvalidTokenError, KeyError, TypeError, ValueError):
+        raise invalid_token_exception
+
+    stmt = (
+        select(RefreshTokenFamily, User.token_version)
+        .join(User, User.id == RefreshTokenFamily.user_id)
+        .where(
+            RefreshTokenFamily.id == family_id,
+            RefreshTokenFamily.user_id == user_id,
+        )
+        .with_for_update(of=RefreshTokenFamily)
+    )
+    row = db_session.execute(stmt).one_or_none()
+    if not row:
+        raise invalid_token_exception
+
+    family, current_token_version = row
+    if family.revoked or current_token_version != token_version:
+        raise invalid_token_exception
+
+    # 이미 교체된 이전 세대의 토큰이 사용됨 -> 탈취로 보고 계열 전체를 폐기
+    if family.generation != generation:
+        family.revoked = True
+        db_session.commit()
+        raise invalid_token_exception
+
+    family.generation += 1
+    family.expires_at = get_refresh_token_expires_at()
+
+    return issue_tokens(user_id, token_version, family)
+
+
+def get_refresh_token_expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(
+        days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+    )
+
 
+def issue_tokens(
+    user_id: int, token_version: int, family: RefreshTokenFamily
+) -> TokenResponse:
+    """
+    액세스 토큰과 주어진 리프레시 토큰 계열의 현재 세대 리프레시 토큰을 발급합니다.
+    """
     return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
+        access_token=create_access_token(str(user_id), token_version),
+        refresh_token=create_refresh_token(
+            str(user_id),
+            token_version,
+            family_id=family.id,
+            generation=family.generation,
+            expire=family.expires_at,
+        ),
     )
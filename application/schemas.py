@@ -1,13 +1,24 @@
 import calendar
+from typing import Literal
 
 from fastapi import UploadFile
-from pydantic import BaseModel, Field, field_validator, root_validator, model_validator
-from datetime import date, datetime
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    root_validator,
+    model_validator,
+)
+from datetime import date, datetime, timedelta
 
 from pydantic_core.core_schema import ValidationInfo
 from starlette.requests import Request
 
+from application.catalog import StoreCatalog, CatalogItem
 from application.constants import MindContentType
+from application.images import ImageSize, get_image_urls
+from application.storage import get_storage
 from application.models import Diary, User, StoreItem
 
 
@@ -33,12 +44,16 @@ class UserResponse(BaseModel):
             nickname=user.nickname,
             coin=user.coin,
             equipped_accessory_image_url=(
-                f"{request.base_url}{user.equipped_accessory.applied_image_url}"
+                get_storage().get_url(
+                    user.equipped_accessory.applied_image_url, str(request.base_url)
+                )
                 if user.equipped_accessory and user.equipped_accessory.applied_image_url
                 else None
             ),
             equipped_background_image_url=(
-                f"{request.base_url}{user.equipped_background.applied_image_url}"
+                get_storage().get_url(
+                    user.equipped_background.applied_image_url, str(request.base_url)
+                )
                 if user.equipped_background
                 and user.equipped_background.applied_image_url
                 else None
@@ -61,6 +76,10 @@ class TokenResponse(BaseModel):
     refresh_token: str
 
 
+class TokenRefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class DiaryCreateInput(BaseModel):
     diary_date: date = Field(
         ...,
@@ -113,12 +132,26 @@ class AnalyzedEmotion(BaseModel):
         )
 
 
+class ImageUrls(BaseModel):
+    original: str = Field(..., description="원본 이미지 URL")
+    medium: str = Field(..., description="긴 변이 최대 1024px 인 WebP 이미지 URL")
+    thumb: str = Field(..., description="긴 변이 최대 256px 인 WebP 이미지 URL")
+
+    @classmethod
+    def from_path(cls, request: Request, path: str) -> "ImageUrls":
+        return cls(**get_image_urls(str(request.base_url), path))
+
+
 class DiaryResponse(BaseModel):
     id: int
     weather: str
     title: str
     content: str
     image_urls: list[str]
+    images: list[ImageUrls] = Field(
+        default=[],
+        description="이미지별 원본/크기별 URL. image_urls 와 순서가 같습니다.",
+    )
     date: date
 
     created_at: datetime
@@ -138,10 +171,17 @@ class DiaryResponse(BaseModel):
             title=diary.title,
             content=diary.content,
             image_urls=(
-                [f"{request.base_url}{image_url}" for image_url in diary.image_urls]
+                [
+                    get_image_urls(str(request.base_url), image_url)["original"]
+                    for image_url in diary.image_urls
+                ]
                 if diary.image_urls
                 else []
             ),
+            images=[
+                ImageUrls.from_path(request, image_url)
+                for image_url in diary.image_urls or []
+            ],
             date=diary.date,
             created_at=diary.created_at,
             updated_at=diary.updated_at,
@@ -172,6 +212,89 @@ class DiaryListParams(BaseModel):
     def month(self) -> int:
         return int(self.year_and_month.split("-")[1])
 
+    @property
+    def start_date(self) -> date:
+        return date(self.year, self.month, 1)
+
+    @property
+    def end_date(self) -> date:
+        return date(
+            self.year, self.month, calendar.monthrange(self.year, self.month)[1]
+        )
+
+
+# 가져올 수 있는 가장 오래된 일기의 날짜 (오늘로부터의 일 수)
+DIARY_IMPORT_MAX_PAST_DAYS = 3660
+
+
+class DiaryImportRow(BaseModel):
+    """
+    일기 가져오기 요청(NDJSON) 의 한 줄
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    diary_date: date = Field(..., alias="date", description="일기의 날짜")
+    weather: str = Field(..., min_length=1, max_length=20, description="날씨")
+    title: str = Field(..., min_length=1, max_length=100, description="제목")
+    content: str = Field(..., min_length=1, max_length=5000, description="일기 본문")
+
+    @field_validator("diary_date")
+    @classmethod
+    def validate_diary_date(cls, value, info: ValidationInfo):
+        # 서버와 사용자의 시간대가 다를 수 있으므로 미래 날짜는 하루까지 허용합니다.
+        today = date.today()
+        if value > today + timedelta(days=1):
+            raise ValueError("미래 날짜의 일기는 가져올 수 없습니다.")
+        if value < today - timedelta(days=DIARY_IMPORT_MAX_PAST_DAYS):
+            raise ValueError(
+                f"최근 {DIARY_IMPORT_MAX_PAST_DAYS}일 이내의 일기만 가져올 수 있습니다."
+            )
+        return value
+
+
+class DiaryImportRowResult(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    line: int = Field(..., description="요청 본문의 줄 번호 (1부터 시작)")
+    status: Literal["created", "duplicate", "invalid"] = Field(
+        ...,
+        description="created: 추가됨, duplicate: 같은 날짜의 일기가 이미 있음, invalid: 형식 오류",
+    )
+    diary_id: int | None = Field(None, description="추가된 일기의 ID")
+    diary_date: date | None = Field(None, alias="date", description="일기의 날짜")
+    detail: str | None = Field(None, description="형식 오류의 내용")
+
+
+class DiaryImportResponse(BaseModel):
+    created: int = Field(..., description="추가된 일기 수")
+    duplicates: int = Field(
+        ..., description="같은 날짜의 일기가 이미 있어 건너뛴 줄 수"
+    )
+    invalid: int = Field(..., description="형식 오류로 건너뛴 줄 수")
+    coins: int = Field(..., description="추가된 일기로 적립된 코인")
+    results: list[DiaryImportRowResult]
+    next_line: int | None = Field(
+        ...,
+        description="한 번에 가져올 수 있는 일기 수를 넘어 가져오지 않은 첫 줄 번호. 모두 처리했으면 null",
+    )
+
+
+class DiaryChangesParams(BaseModel):
+    since: str | None = Field(
+        default=None,
+        description="이전 응답의 next_cursor 값. 비어 있으면 처음부터 조회합니다.",
+    )
+    limit: int = Field(default=100, ge=1, le=500, description="한 번에 조회할 개수")
+
+
+class DiaryChangesResponse(BaseModel):
+    diaries: list[DiaryResponse]
+    next_cursor: str | None = Field(..., description="다음 요청의 since 로 전달할 커서")
+    has_more: bool = Field(
+        ..., description="아직 조회하지 않은 변경 사항이 있는지 여부"
+    )
+
 
 class DiaryCalendarResponse(BaseModel):
     id: int
@@ -179,6 +302,9 @@ class DiaryCalendarResponse(BaseModel):
     title: str
     date: date
     analyzed_emotion: AnalyzedEmotion | None = None
+    thumbnail_url: str | None = Field(
+        None, description="첫 번째 이미지의 썸네일 URL. 이미지가 없으면 null"
+    )
 
     @classmethod
     def from_diary(
@@ -196,9 +322,98 @@ class DiaryCalendarResponse(BaseModel):
                 if diary.get_analyzed_emotion_enum()
                 else None
             ),
+            thumbnail_url=(
+                get_image_urls(str(request.base_url), diary.image_urls[0])[
+                    ImageSize.THUMB.value
+                ]
+                if diary.image_urls
+                else None
+            ),
         )
 
 
+class DiaryBundleEntry(DiaryCalendarResponse):
+    mind_content_level: int | None = Field(
+        None, description="저장된 마음챙김 콘텐츠의 레벨. 저장된 콘텐츠가 없으면 null"
+    )
+
+    @classmethod
+    def from_diary_and_level(
+        cls,
+        request: Request,
+        diary: Diary,
+        mind_content_level: int | None,
+    ) -> "DiaryBundleEntry":
+        return cls(
+            **DiaryCalendarResponse.from_diary(
+                request=request, diary=diary
+            ).model_dump(),
+            mind_content_level=mind_content_level,
+        )
+
+
+class DiarySearchParams(BaseModel):
+    q: str = Field(
+        ...,
+        min_length=2,
+        max_length=100,
+        description="검색어. 일기의 제목과 본문에서 검색하며, 오타나 조사가 붙은 단어도 비슷하면 검색됩니다.",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="이전 응답의 next_cursor 값. 비어 있으면 처음부터 조회합니다.",
+    )
+    limit: int = Field(default=20, ge=1, le=100, description="한 번에 조회할 개수")
+
+
+class DiarySearchResult(DiaryCalendarResponse):
+    rank: float = Field(
+        ..., description="검색어와 일치하는 정도 (0 ~ 1). 클수록 검색어와 비슷합니다."
+    )
+
+    @classmethod
+    def from_diary_and_rank(
+        cls,
+        request: Request,
+        diary: Diary,
+        rank: float,
+    ) -> "DiarySearchResult":
+        return cls(
+            **DiaryCalendarResponse.from_diary(
+                request=request, diary=diary
+            ).model_dump(),
+            rank=rank,
+        )
+
+
+class DiarySearchResponse(BaseModel):
+    diaries: list[DiarySearchResult]
+    next_cursor: str | None = Field(
+        ..., description="다음 요청의 cursor 로 전달할 커서. 마지막 페이지이면 null"
+    )
+
+
+class WeeklyReportSummary(BaseModel):
+    start_date: date
+    end_date: date
+    advice: str
+
+
+class WeekBundle(BaseModel):
+    start_date: date
+    end_date: date
+    emotion_counts: dict[str, int] = Field(
+        ..., description="해당 주에 분석된 감정별 일기 개수 {'감정 이름': 개수}"
+    )
+    weekly_report: WeeklyReportSummary | None = None
+
+
+class DiaryMonthBundleResponse(BaseModel):
+    year_and_month: str
+    diaries: dict[date, DiaryBundleEntry]
+    weeks: list[WeekBundle]
+
+
 class MindContentRecommendationResponse(BaseModel):
     level: int
     name: str
@@ -350,6 +565,68 @@ class MonthlyReportRequest(BaseModel):
         return value
 
 
+# 감정 통계를 조회할 수 있는 최대 기간(일)
+EMOTION_STATS_MAX_DAYS = 3660
+
+
+class EmotionStatsParams(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    from_date: date = Field(..., alias="from", description="조회 시작 날짜")
+    to_date: date = Field(..., alias="to", description="조회 끝 날짜")
+    granularity: Literal["day", "week", "month"] = Field(
+        default="week",
+        description="비율 시계열의 집계 단위 (day, week, month)",
+    )
+
+    @model_validator(mode="after")
+    def validate_range(self):
+        if self.to_date < self.from_date:
+            raise ValueError("끝 날짜는 시작 날짜보다 빠를 수 없습니다.")
+        if (self.to_date - self.from_date).days + 1 > EMOTION_STATS_MAX_DAYS:
+            raise ValueError(
+                f"최대 {EMOTION_STATS_MAX_DAYS}일까지만 조회할 수 있습니다."
+            )
+        return self
+
+
+class EmotionRatioSeries(BaseModel):
+    start_dates: list[date] = Field(..., description="기간별 시작 날짜")
+    analyzed_days: list[int] = Field(..., description="기간별 감정이 분석된 일 수")
+    positive_ratios: list[float | None] = Field(
+        ..., description="기간별 긍정 감정 비율. 분석된 일기가 없으면 null"
+    )
+    negative_ratios: list[float | None] = Field(
+        ..., description="기간별 부정 감정 비율. 분석된 일기가 없으면 null"
+    )
+
+
+class EmotionStreaks(BaseModel):
+    analyzed: int = Field(..., description="감정이 분석된 일기가 연속된 최장 일 수")
+    positive: int = Field(..., description="긍정 감정이 연속된 최장 일 수")
+    negative: int = Field(..., description="부정 감정이 연속된 최장 일 수")
+
+
+class EmotionStatsResponse(BaseModel):
+    start_date: date
+    end_date: date
+    granularity: Literal["day", "week", "month"]
+    emotions: list[str] = Field(
+        ..., description="transition_matrix 의 행과 열에 해당하는 감정 이름"
+    )
+    analyzed_days: int = Field(..., description="감정이 분석된 일 수")
+    emotion_counts: dict[str, int] = Field(..., description="감정별 일 수")
+    ratio_series: EmotionRatioSeries
+    longest_streaks: EmotionStreaks
+    transition_matrix: list[list[int]] = Field(
+        ..., description="전날 감정(행)에서 다음 날 감정(열)으로 바뀐 횟수"
+    )
+    rolling_negative_ratios: list[float | None] = Field(
+        ...,
+        description="시작 날짜부터 하루 단위로, 최근 7일간의 부정 감정 비율. 분석된 일기가 없으면 null",
+    )
+
+
 #########
 # STORE #
 #########
@@ -364,6 +641,8 @@ class StoreItemResponse(BaseModel):
 
     item_image_url: str | None
     applied_image_url: str | None
+    item_image: ImageUrls | None = None
+    applied_image: ImageUrls | None = None
 
     purchased: bool
     equipped: bool
@@ -382,12 +661,24 @@ class StoreItemResponse(BaseModel):
             description=store_item.description,
             price=store_item.price,
             item_image_url=(
-                f"{request.base_url}{store_item.item_image_url}"
+                get_storage().get_url(store_item.item_image_url, str(request.base_url))
                 if store_item.item_image_url
                 else None
             ),
             applied_image_url=(
-                f"{request.base_url}{store_item.applied_image_url}"
+                get_storage().get_url(
+                    store_item.applied_image_url, str(request.base_url)
+                )
+                if store_item.applied_image_url
+                else None
+            ),
+            item_image=(
+                ImageUrls.from_path(request, store_item.item_image_url)
+                if store_item.item_image_url
+                else None
+            ),
+            applied_image=(
+                ImageUrls.from_path(request, store_item.applied_image_url)
                 if store_item.applied_image_url
                 else None
             ),
@@ -395,6 +686,34 @@ class StoreItemResponse(BaseModel):
             equipped=current_user.is_item_equipped(item=store_item),
         )
 
+    @classmethod
+    def from_catalog_item(
+        cls,
+        request: Request,
+        catalog: StoreCatalog,
+        catalog_item: CatalogItem,
+        owned_items: dict[int, bool],
+    ) -> "StoreItemResponse":
+        item_image_url, applied_image_url = catalog.get_absolute_urls(
+            str(request.base_url)
+        )[catalog_item.id]
+        item_image, applied_image = catalog.get_image_urls(str(request.base_url))[
+            catalog_item.id
+        ]
+        return cls(
+            id=catalog_item.id,
+            name=catalog_item.name,
+            category=catalog_item.category,
+            description=catalog_item.description,
+            price=catalog_item.price,
+            item_image_url=item_image_url,
+            applied_image_url=applied_image_url,
+            item_image=ImageUrls(**item_image) if item_image else None,
+            applied_image=ImageUrls(**applied_image) if applied_image else None,
+            purchased=catalog_item.id in owned_items,
+            equipped=owned_items.get(catalog_item.id, False),
+        )
+
     @property
     class Config:
         from_attributes = True
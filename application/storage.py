@@ -0,0 +1,300 @@
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from typing import BinaryIO, Iterator, Protocol
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_delete_executor = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="storage-delete"
+)
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    size: int
+    modified_at: float
+
+
+class Storage(Protocol):
+    """
+    업로드 파일 저장소 인터페이스
+    key 는 DB 에 저장되는 파일 경로(예: uploads/objects/ab/cd/<sha256>.jpg)와 같습니다.
+    """
+
+    def put(self, key: str, source_path: str, content_type: str | None) -> None:
+        """
+        로컬 임시 파일을 주어진 키로 저장합니다. 원본 임시 파일은 옮겨지거나 삭제됩니다.
+        """
+        ...
+
+    def stream(self, key: str) -> Iterator[bytes]:
+        """
+        저장된 파일의 내용을 고정 크기 단위로 반환합니다.
+        """
+        ...
+
+    def open(self, key: str) -> BinaryIO:
+        """
+        저장된 파일을 되감을 수 있는 읽기 전용 파일 객체로 엽니다. 호출하는 쪽에서 닫아야 합니다.
+        """
+        ...
+
+    def get_url(self, key: str, base_url: str, expires_in: int | None = None) -> str:
+        """
+        파일을 내려받을 수 있는 URL 을 반환합니다.
+        expires_in 이 주어지면, 저장소가 지원하는 경우 만료 시간이 있는 서명된 URL 을 반환합니다.
+        """
+        ...
+
+    def delete(self, key: str) -> None: ...
+
+    def exists(self, key: str) -> bool: ...
+
+    def touch(self, key: str) -> bool:
+        """
+        저장된 파일의 수정 시각을 현재 시각으로 갱신합니다. 파일이 없으면 False 를 반환합니다.
+        """
+        ...
+
+    def get_modified_at(self, key: str) -> float | None:
+        """
+        저장된 파일의 수정 시각(유닉스 타임스탬프)을 반환합니다. 파일이 없으면 None 을 반환합니다.
+        """
+        ...
+
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        """
+        prefix 로 시작하는 파일을 키의 바이트 순서로 정렬하여 하나씩 반환합니다.
+        """
+        ...
+
+
+class LocalStorage:
+    """
+    애플리케이션 서버의 디스크에 파일을 저장합니다. 키가 곧 작업 디렉터리 기준 파일 경로이며,
+    nginx 가 같은 디렉터리를 직접 제공합니다.
+    """
+
+    def put(self, key: str, source_path: str, content_type: str | None) -> None:
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        os.replace(source_path, key)
+
+    def stream(self, key: str) -> Iterator[bytes]:
+        with open(key, "rb") as f:
+            while chunk := f.read(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    def open(self, key: str) -> BinaryIO:
+        return open(key, "rb")
+
+    def get_url(self, key: str, base_url: str, expires_in: int | None = None) -> str:
+        return f"{base_url}{key}"
+
+    def delete(self, key: str) -> None:
+        if os.path.exists(key):
+            os.remove(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(key)
+
+    def touch(self, key: str) -> bool:
+        try:
+            os.utime(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def get_modified_at(self, key: str) -> float | None:
+        try:
+            return os.stat(key).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        # prefix 는 디렉터리 경로로 취급합니다.
+        yield from self._walk(prefix.rstrip("/"))
+
+    def _walk(self, directory: str) -> Iterator[StoredObject]:
+        """
+        디렉터리를 한 단계씩 정렬하며 재귀적으로 순회합니다.
+        하위 디렉터리는 키에서 "이름/" 으로 시작하므로, 이름 뒤에 "/" 를 붙여 정렬해야
+        전체 키의 바이트 순서와 같아집니다.
+        """
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(
+                    it,
+                    key=lambda entry: (
+                        entry.name + "/"
+                        if entry.is_dir(follow_symlinks=False)
+                        else entry.name
+                    ),
+                )
+        except FileNotFoundError:
+            return
+
+        for entry in entries:
+            key = f"{directory}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._walk(key)
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                yield StoredObject(key, stat.st_size, stat.st_mtime)
+
+
+class S3Storage:
+    """
+    S3 프로토콜을 지원하는 오브젝트 스토리지(AWS S3, MinIO 등)에 파일을 저장합니다.
+    큰 파일은 멀티파트로 나누어 업로드하며, 여러 웹 서버가 디스크를 공유하지 않아도 됩니다.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None,
+        region: str | None,
+        access_key_id: str | None,
+        secret_access_key: str | None,
+        public_url: str | None,
+        multipart_chunk_size: int,
+    ):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+        self.public_url = (public_url or f"{endpoint_url}/{bucket}").rstrip("/")
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunk_size,
+            multipart_chunksize=multipart_chunk_size,
+        )
+
+    def put(self, key: str, source_path: str, content_type: str | None) -> None:
+        extra_args = {"ContentType": content_type} if content_type else {}
+        try:
+            self.client.upload_file(
+                source_path,
+                self.bucket,
+                key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
+            )
+        finally:
+            os.remove(source_path)
+
+    def stream(self, key: str) -> Iterator[bytes]:
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        yield from response["Body"].iter_chunks(STREAM_CHUNK_SIZE)
+
+    def open(self, key: str) -> BinaryIO:
+        # 응답 본문은 되감을 수 없으므로, 메모리에 모으지 않고 임시 파일에 내려받습니다.
+        f = tempfile.TemporaryFile()
+        try:
+            self.client.download_fileobj(
+                self.bucket, key, f, Config=self.transfer_config
+            )
+            f.seek(0)
+        except:
+            f.close()
+            raise
+        return f
+
+    def get_url(self, key: str, base_url: str, expires_in: int | None = None) -> str:
+        if expires_in is not None:
+            return self.client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket, "Key": key},
+                ExpiresIn=expires_in,
+            )
+        return f"{self.public_url}/{key}"
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list(self, prefix: str) -> Iterator[StoredObject]:
+        # ListObjectsV2 는 키를 UTF-8 바이트 순서로 정렬하여 반환합니다.
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield StoredObject(
+                    item["Key"], item["Size"], item["LastModified"].timestamp()
+                )
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def touch(self, key: str) -> bool:
+        # 오브젝트의 수정 시각은 같은 키로 복사해야만 갱신되며, 이때 메타데이터를 다시 지정해야 합니다.
+        head = self._head(key)
+        if head is None:
+            return False
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": key},
+            MetadataDirective="REPLACE",
+            ContentType=head.get("ContentType", "binary/octet-stream"),
+            Metadata=head.get("Metadata", {}),
+        )
+        return True
+
+    def get_modified_at(self, key: str) -> float | None:
+        head = self._head(key)
+        return head["LastModified"].timestamp() if head is not None else None
+
+    def _head(self, key: str) -> dict | None:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+
+@cache
+def get_storage() -> Storage:
+    """
+    설정된 저장소를 반환합니다. 프로세스마다 한 번만 생성됩니다.
+    """
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            public_url=settings.S3_PUBLIC_URL,
+            multipart_chunk_size=settings.S3_MULTIPART_CHUNK_SIZE,
+        )
+    return LocalStorage()
+
+
+def _delete_quietly(key: str) -> None:
+    try:
+        get_storage().delete(key)
+    except Exception:
+        logger.exception("파일 삭제 중 오류 발생: %s", key)
+
+
+def delete_in_background(key: str) -> None:
+    """
+    요청 처리를 기다리게 하지 않도록 파일을 백그라운드에서 삭제합니다.
+    """
+    _delete_executor.submit(_delete_quietly, key)
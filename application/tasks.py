@@ -0,0 +1,108 @@
+import logging
+import threading
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from application.analytics import refresh_analytics_views
+from application.catalog import StoreCatalogListener
+from application.coins import compact_coin_ledger
+from application.emotion_days import create_upcoming_emotion_day_partitions
+from application.upload_gc import collect_orphaned_uploads
+from application.crud import (
+    purge_refresh_token_families,
+    purge_rate_limit_counters,
+    reap_unreferenced_files,
+)
+from config.db import SessionLocal
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask(threading.Thread):
+    """
+    주어진 함수를 일정한 간격으로 실행하는 백그라운드 스레드입니다.
+    함수 실행 중 발생한 예외는 로그로 남기고, 다음 주기에 다시 실행합니다.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None]):
+        super().__init__(name=name, daemon=True)
+        self.interval = interval
+        self.func = func
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.func()
+            except Exception:
+                logger.exception("백그라운드 작업 실행 중 오류 발생: %s", self.name)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def run_in_session(func: Callable[[Session], None]) -> Callable[[], None]:
+    """
+    새로운 DB 세션을 열어 주어진 함수를 실행하고 커밋하는 함수를 반환합니다.
+    """
+
+    def wrapper() -> None:
+        with SessionLocal() as db_session:
+            try:
+                func(db_session)
+                db_session.commit()
+            except:
+                db_session.rollback()
+                raise
+
+    return wrapper
+
+
+def create_background_tasks() -> list[threading.Thread]:
+    """
+    애플리케이션 수명 동안 실행할 백그라운드 작업 목록을 생성합니다.
+    """
+    tasks = [
+        PeriodicTask(
+            name="coin-ledger-compactor",
+            interval=settings.COIN_LEDGER_COMPACT_INTERVAL_SECONDS,
+            func=run_in_session(compact_coin_ledger),
+        ),
+        StoreCatalogListener(),
+        PeriodicTask(
+            name="refresh-token-family-purger",
+            interval=settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS,
+            func=run_in_session(purge_refresh_token_families),
+        ),
+        PeriodicTask(
+            name="unreferenced-file-reaper",
+            interval=settings.UNREFERENCED_FILE_REAP_INTERVAL_SECONDS,
+            func=run_in_session(reap_unreferenced_files),
+        ),
+        PeriodicTask(
+            name="upload-gc",
+            interval=settings.UPLOAD_GC_INTERVAL_SECONDS,
+            func=run_in_session(collect_orphaned_uploads),
+        ),
+        PeriodicTask(
+            name="emotion-day-partitioner",
+            interval=settings.USER_EMOTION_DAY_PARTITION_INTERVAL_SECONDS,
+            func=run_in_session(create_upcoming_emotion_day_partitions),
+        ),
+        PeriodicTask(
+            name="analytics-view-refresher",
+            interval=settings.ANALYTICS_REFRESH_INTERVAL_SECONDS,
+            func=run_in_session(refresh_analytics_views),
+        ),
+    ]
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        tasks.append(
+            PeriodicTask(
+                name="rate-limit-counter-purger",
+                interval=settings.RATE_LIMIT_WINDOW_SECONDS,
+                func=run_in_session(purge_rate_limit_counters),
+            )
+        )
+    return tasks
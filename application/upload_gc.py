@@ -0,0 +1,251 @@
+import argparse
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import timedelta
+from typing import Dict, Iterator
+
+from sqlalchemy import select, delete, func, union, or_, Subquery
+from sqlalchemy.orm import Session
+
+from application.models import Diary, StoreItem, StoredFile
+from application.storage import StoredObject, get_storage
+from config.db import SessionLocal
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 크기별 WebP 이미지는 원본이 참조되는 동안 유지
+VARIANT_SUFFIX_PATTERN = re.compile(r"\.(thumb|medium)\.webp$")
+DELETE_BATCH_SIZE = 500
+REFERENCE_FETCH_SIZE = 1000
+
+
+@dataclass
+class UploadGCStats:
+    scanned: int = 0
+    referenced: int = 0
+    orphaned: int = 0
+    skipped_recent: int = 0
+    deleted: int = 0
+    failed: int = 0
+    deleted_bytes: int = 0
+    elapsed_seconds: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def scanned_per_second(self) -> float:
+        return self.scanned / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+_last_stats: UploadGCStats | None = None
+_last_stats_lock = threading.Lock()
+
+
+def get_upload_gc_metrics() -> Dict[str, Dict[str, int]]:
+    """
+    마지막 업로드 파일 정리 작업의 결과를 반환합니다.
+    """
+    with _last_stats_lock:
+        if _last_stats is None:
+            return {}
+        return {
+            "upload_gc": {
+                **asdict(_last_stats),
+                "scanned_per_second": round(_last_stats.scanned_per_second),
+            }
+        }
+
+
+def get_reference_key(key: str) -> str:
+    """
+    파일이 참조되고 있는지 확인할 때 사용할 경로를 반환합니다.
+    내용 주소 방식으로 저장된 크기별 WebP 이미지는 원본 이미지의 경로를 사용합니다.
+    원본과 변환 이미지의 키는 원본 경로를 접두사로 공유하므로, 바꾼 뒤에도 정렬 순서가 유지됩니다.
+    """
+    if "/objects/" in key:
+        return VARIANT_SUFFIX_PATTERN.sub("", key)
+    return key
+
+
+def select_references() -> Subquery:
+    """
+    일기, 상점 아이템, 최근에 등록되었거나 참조 중인 저장 파일의 경로를 중복 없이 조회하는 서브쿼리를 반환합니다.
+    """
+    diary_paths = select(
+        func.json_array_elements_text(Diary.image_urls).label("path")
+    ).where(func.json_typeof(Diary.image_urls) == "array")
+    item_image_paths = select(StoreItem.item_image_url.label("path")).where(
+        StoreItem.item_image_url.is_not(None)
+    )
+    applied_image_paths = select(StoreItem.applied_image_url).where(
+        StoreItem.applied_image_url.is_not(None)
+    )
+    # 업로드 직후 아직 일기가 커밋되지 않은 파일이나, 이미 있던 파일을 다시 사용하는 경우를 보호
+    stored_file_paths = select(StoredFile.path).where(
+        or_(
+            StoredFile.ref_count > 0,
+            StoredFile.updated_at
+            > func.now() - timedelta(seconds=settings.UPLOAD_GC_GRACE_SECONDS),
+        )
+    )
+    return union(
+        diary_paths, item_image_paths, applied_image_paths, stored_file_paths
+    ).subquery()
+
+
+def iter_referenced_paths(db_session: Session) -> Iterator[str]:
+    """
+    참조 중인 경로를 바이트 순서(COLLATE "C")로 정렬하여 하나씩 반환합니다.
+    서버 측 커서로 나누어 가져오므로 전체 경로를 메모리에 올리지 않습니다.
+    """
+    references = select_references()
+    stmt = (
+        select(references.c.path)
+        .where(references.c.path.is_not(None))
+        .order_by(references.c.path.collate("C"))
+        .execution_options(yield_per=REFERENCE_FETCH_SIZE)
+    )
+    yield from db_session.scalars(stmt)
+
+
+def delete_orphaned_objects(
+    candidates: list[StoredObject],
+    stats: UploadGCStats,
+    grace_deadline: float,
+) -> None:
+    """
+    삭제 후보 파일을 짧은 트랜잭션 하나에서 다시 확인한 뒤 삭제합니다.
+
+    병합에 사용한 참조 목록은 작업을 시작한 시점의 스냅샷이므로, 그 사이에 후보 파일을 참조하게 된 일기나
+    다시 등록된 저장 파일이 있을 수 있습니다. 후보의 저장 파일 행을 FOR UPDATE 로 잠가 커밋할 때까지
+    참조 횟수가 바뀌지 않도록 한 뒤, 새 스냅샷에서 참조 여부를 다시 확인합니다.
+    아직 행이 없는 파일을 업로드 중에 다시 사용하는 경우는 write_file 이 갱신한 수정 시각으로 확인합니다.
+    파일은 행을 잠근 동안 지우고, 참조 횟수가 0 인 행만 함께 삭제합니다.
+    """
+    storage = get_storage()
+    keys = {get_reference_key(candidate.key) for candidate in candidates}
+
+    with SessionLocal.begin() as db_session:
+        db_session.execute(
+            select(StoredFile.id)
+            .where(StoredFile.path.in_(keys))
+            .order_by(StoredFile.path)
+            .with_for_update()
+        )
+        references = select_references()
+        referenced = set(
+            db_session.scalars(
+                select(references.c.path).where(references.c.path.in_(keys))
+            )
+        )
+
+        modified_at: dict[str, float | None] = {}
+        deleted_keys: list[str] = []
+        for candidate in candidates:
+            key = get_reference_key(candidate.key)
+            if key in referenced:
+                stats.referenced += 1
+                continue
+            # 크기별 WebP 이미지는 원본 이미지의 수정 시각을 따릅니다.
+            if key not in modified_at:
+                modified_at[key] = storage.get_modified_at(key)
+            if max(candidate.modified_at, modified_at[key] or 0) > grace_deadline:
+                stats.skipped_recent += 1
+                continue
+
+            stats.orphaned += 1
+            if stats.dry_run:
+                logger.info("삭제 대상 파일: %s", candidate.key)
+                continue
+            try:
+                storage.delete(candidate.key)
+            except Exception:
+                logger.exception("파일 삭제 중 오류 발생: %s", candidate.key)
+                stats.failed += 1
+                continue
+            stats.deleted += 1
+            stats.deleted_bytes += candidate.size
+            deleted_keys.append(candidate.key)
+
+        # 삭제한 파일의 참조 횟수 행도 함께 정리
+        if deleted_keys:
+            db_session.execute(
+                delete(StoredFile).where(
+                    StoredFile.path.in_(deleted_keys), StoredFile.ref_count <= 0
+                )
+            )
+
+
+def collect_orphaned_uploads(
+    db_session: Session, dry_run: bool | None = None
+) -> UploadGCStats:
+    """
+    저장소의 업로드 파일 목록과 DB 에서 참조하는 경로 목록을 각각 정렬된 순서로 읽으며 병합하여,
+    어디에서도 참조하지 않고 유예 기간이 지난 파일을 삭제합니다.
+    두 목록을 하나씩만 읽으므로 파일 수와 관계없이 메모리 사용량이 일정합니다.
+
+    주어진 세션은 참조 목록을 읽는 데만 사용하며, 삭제는 후보를 모아 배치마다 별도의 짧은 트랜잭션에서 합니다.
+    목록을 읽는 트랜잭션에서 쓰기를 하면 트랜잭션 ID 가 할당되어, 작업이 끝날 때까지
+    트랜잭션 ID 로 커밋 여부를 판단하는 일기 변경 내역 조회와 코인 원장 압축이 멈추기 때문입니다.
+
+    :param: dry_run: True 이면 삭제하지 않고 삭제 대상만 기록합니다.
+    """
+    global _last_stats
+
+    if dry_run is None:
+        dry_run = settings.UPLOAD_GC_DRY_RUN
+    storage = get_storage()
+    stats = UploadGCStats(dry_run=dry_run)
+    started_at = time.monotonic()
+    grace_deadline = time.time() - settings.UPLOAD_GC_GRACE_SECONDS
+
+    references = iter_referenced_paths(db_session)
+    reference = next(references, None)
+    candidates: list[StoredObject] = []
+
+    for stored_object in storage.list(f"{settings.UPLOAD_DIR}/"):
+        stats.scanned += 1
+        key = get_reference_key(stored_object.key)
+        while reference is not None and reference < key:
+            reference = next(references, None)
+
+        if reference == key:
+            stats.referenced += 1
+            continue
+        if stored_object.modified_at > grace_deadline:
+            stats.skipped_recent += 1
+            continue
+
+        candidates.append(stored_object)
+        if len(candidates) >= DELETE_BATCH_SIZE:
+            delete_orphaned_objects(candidates, stats, grace_deadline)
+            candidates.clear()
+    if candidates:
+        delete_orphaned_objects(candidates, stats, grace_deadline)
+
+    stats.elapsed_seconds = round(time.monotonic() - started_at, 3)
+    logger.info(
+        "업로드 파일 정리 완료: %s (초당 %d 개 확인)",
+        stats,
+        stats.scanned_per_second,
+    )
+    with _last_stats_lock:
+        _last_stats = stats
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="참조되지 않는 업로드 파일을 정리합니다."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="삭제하지 않고 삭제 대상만 출력"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as session:
+        collect_orphaned_uploads(session, dry_run=args.dry_run)
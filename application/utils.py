@@ -1,53 +1,210 @@
+import base64
+import hashlib
 import os
-from datetime import datetime
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 from fastapi import UploadFile
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from application.storage import get_storage, delete_in_background
+from config.db import SessionLocal
 from config.settings import settings
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+UPLOADED_FILES_SESSION_KEY = "uploaded_files"
+FILE_EXTENSION_PATTERN = re.compile(r"\.[a-z0-9]{1,10}")
+
+_upload_executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix="upload")
 
-def write_file(child_folder_name: str, file: UploadFile) -> str:
+
+@dataclass(frozen=True)
+class StoredFileInfo:
+    """
+    내용 주소 방식으로 저장된 파일의 정보
+    created 는 이번 업로드로 파일이 새로 만들어졌는지 여부입니다.
     """
-    주어진 파일을 지정된 폴더에 저장하고, 저장된 파일의 경로를 반환합니다.
 
-    :param: child_folder_name: 파일을 저장할 하위 폴더 이름
-    :return: 저장된 파일의 경로
+    path: str
+    sha256: str
+    size: int
+    created: bool
+
+
+def write_file(file: UploadFile, private: bool = False) -> StoredFileInfo:
+    """
+    업로드된 파일을 내용의 sha256 해시로 정해지는 경로에 저장하고, 저장된 파일의 정보를 반환합니다.
+    파일을 고정 크기 단위로 로컬 임시 파일에 복사하면서 해시를 계산하므로 파일 전체를 메모리에 올리지 않으며,
+    임시 파일은 설정된 저장소로 옮겨집니다.
+    같은 내용의 파일이 이미 있으면 임시 파일을 버리고 기존 파일의 수정 시각만 갱신하여 그대로 사용합니다.
+
+    :param: private: True 이면 인증을 거쳐야만 내려받을 수 있는 비공개 영역에 저장합니다.
     """
     try:
-        upload_path = get_upload_path(child_folder_name, file)
-        os.makedirs(os.path.dirname(upload_path), exist_ok=True)
-        with open(upload_path, "wb") as f:
-            f.write(file.file.read())
-        return upload_path
+        fd, temp_path = create_temp_file()
+        try:
+            digest, size = hashlib.sha256(), 0
+            with os.fdopen(fd, "wb") as f:
+                while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+            sha256 = digest.hexdigest()
+            upload_path = get_content_addressed_path(sha256, file.filename, private)
+            storage = get_storage()
+            # 이미 있는 파일을 다시 사용할 때는, 이 요청이 커밋되기 전에 업로드 파일 정리 작업이
+            # 오래된 미참조 파일로 보고 삭제하지 않도록 수정 시각을 갱신합니다.
+            if storage.touch(upload_path):
+                os.remove(temp_path)
+                return StoredFileInfo(upload_path, sha256, size, created=False)
+
+            storage.put(upload_path, temp_path, file.content_type)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return StoredFileInfo(upload_path, sha256, size, created=True)
     except Exception as e:
         raise RuntimeError(f"파일 업로드 중 오류 발생: {e}")
     finally:
         file.file.close()
 
 
+def write_files(files: list[UploadFile], private: bool = False) -> list[StoredFileInfo]:
+    """
+    여러 파일을 병렬로 저장하고, 저장된 파일의 정보를 순서대로 반환합니다.
+    하나라도 실패하면 이번에 새로 저장된 파일을 모두 삭제하고 예외를 발생시킵니다.
+    """
+    futures = [_upload_executor.submit(write_file, file, private) for file in files]
+
+    stored_files, error = [], None
+    for future in futures:
+        try:
+            stored_files.append(future.result())
+        except RuntimeError as e:
+            error = e
+
+    if error:
+        for stored_file in stored_files:
+            if stored_file.created:
+                remove_file(stored_file.path)
+        raise error
+    return stored_files
+
+
+def track_uploaded_files(
+    db_session: Session, stored_files: list[StoredFileInfo]
+) -> None:
+    """
+    이번 업로드로 새로 만들어진 파일을 세션에 기록해 두고, 트랜잭션이 롤백되면 함께 삭제합니다.
+    이미 있던 파일은 다른 곳에서 참조하고 있을 수 있으므로 삭제하지 않습니다.
+    """
+    if not db_session.in_transaction():
+        db_session.begin()
+    db_session.info.setdefault(UPLOADED_FILES_SESSION_KEY, []).extend(
+        stored_file.path for stored_file in stored_files if stored_file.created
+    )
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _forget_uploaded_files(db_session: Session) -> None:
+    db_session.info.pop(UPLOADED_FILES_SESSION_KEY, None)
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _remove_uploaded_files(db_session: Session, previous_transaction) -> None:
+    for file_path in db_session.info.pop(UPLOADED_FILES_SESSION_KEY, []):
+        remove_file(file_path)
+
+
 def remove_file(file_path: str) -> None:
     """
-    주어진 파일 경로의 파일을 삭제합니다.
+    주어진 파일 경로의 파일을 저장소에서 백그라운드로 삭제합니다.
+    """
+    delete_in_background(file_path)
+
+
+def create_temp_file() -> tuple[int, str]:
+    """
+    저장소로 옮기기 전의 파일을 쓸 로컬 임시 파일을 만들고, (파일 디스크립터, 경로) 를 반환합니다.
+    로컬 저장소에서 파일을 복사 없이 옮길 수 있도록 업로드 디렉터리 아래에 만듭니다.
+    """
+    temp_dir = os.path.join(settings.UPLOAD_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    return tempfile.mkstemp(dir=temp_dir, suffix=".tmp")
+
+
+def get_objects_dir(private: bool = False) -> str:
+    """
+    내용 주소 방식으로 저장되는 파일의 최상위 디렉터리를 반환합니다.
+    """
+    if private:
+        return f"{settings.UPLOAD_DIR}/private/objects"
+    return f"{settings.UPLOAD_DIR}/objects"
+
+
+def get_content_addressed_path(
+    sha256: str, file_name: str | None, private: bool = False
+) -> str:
+    """
+    파일 내용의 sha256 해시로부터 저장 경로를 생성합니다.
+    한 디렉터리에 파일이 몰리지 않도록 해시 앞 4글자로 두 단계의 디렉터리를 나누고,
+    Content-Type 을 정할 수 있도록 원래 파일의 확장자를 붙입니다.
+    """
+    extension = os.path.splitext(file_name or "")[1].lower()
+    if not FILE_EXTENSION_PATTERN.fullmatch(extension):
+        extension = ""
+    return f"{get_objects_dir(private)}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def encode_cursor(change_xid: int, pk: int) -> str:
+    """
+    (변경 트랜잭션 ID, ID) 를 클라이언트에 전달할 불투명한 커서 문자열로 변환합니다.
+    """
+    raw = f"{change_xid}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """
+    커서 문자열을 (변경 트랜잭션 ID, ID) 로 변환합니다. 형식이 잘못된 경우 ValueError 를 발생시킵니다.
     """
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        change_xid, pk = raw.split("|")
+        return int(change_xid), int(pk)
     except Exception as e:
-        raise RuntimeError(f"파일 삭제 중 오류 발생: {e}")
+        raise ValueError(f"유효하지 않은 커서입니다: {cursor}") from e
 
 
-def get_timestamped_filename(file_name: str) -> str:
+def encode_search_cursor(rank: float, pk: int) -> str:
     """
-    랜덤한 문자열을 포함한 파일 이름을 생성합니다.
+    (검색 순위 점수, ID) 를 클라이언트에 전달할 불투명한 커서 문자열로 변환합니다.
     """
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    return f"{timestamp}_{file_name}"
+    raw = f"{rank!r}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """
+    검색 커서 문자열을 (검색 순위 점수, ID) 로 변환합니다. 형식이 잘못된 경우 ValueError 를 발생시킵니다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        rank, pk = raw.split("|")
+        return float(rank), int(pk)
+    except Exception as e:
+        raise ValueError(f"유효하지 않은 커서입니다: {cursor}") from e
 
 
-def get_upload_path(login_id, file: UploadFile) -> str:
+def escape_like(term: str, escape_char: str = "\\") -> str:
     """
-    주어진 사용자 ID와 파일로부터 업로드 경로를 생성합니다.
+    LIKE 패턴에서 특별한 의미를 갖는 문자(%, _, 이스케이프 문자)를 이스케이프합니다.
     """
-    today = datetime.now().date()
-    path = f"{settings.UPLOAD_DIR}/{login_id}/{today.year}/{today.month}/{today.day}"
-    timestamped_filename = get_timestamped_filename(file.filename)
-    return f"{path}/{timestamped_filename}"
+    for char in (escape_char, "%", "_"):
+        term = term.replace(char, escape_char + char)
+    return term
@@ -0,0 +1,235 @@
+import threading
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from typing import Hashable, Sequence
+
+from sqlalchemy import select, func, event, inspect
+from sqlalchemy.orm import Session
+
+from application.constants import Emotion, NEGATIVE_EMOTIONS
+from application.models import Diary, UserEmotionDay
+from config.cache import TTLCache
+from config.settings import settings
+
+WEEKLY_EMOTION_DELTAS_SESSION_KEY = "weekly_emotion_deltas"
+NEGATIVE_EMOTION_CODES = tuple(sorted(emotion.code for emotion in NEGATIVE_EMOTIONS))
+
+
+@dataclass(frozen=True)
+class WeeklyEmotionCounts:
+    """
+    한 사용자의 한 주(월요일~일요일) 동안 요일별 일기 개수와 부정적인 감정 일기 개수
+    """
+
+    week_start: date
+    totals: tuple[int, ...] = (0,) * 7
+    negatives: tuple[int, ...] = (0,) * 7
+
+    def count_until(self, day: date) -> tuple[int, int]:
+        """
+        월요일부터 주어진 날짜까지의 (전체 일기 개수, 부정적인 감정 일기 개수) 를 반환합니다.
+        """
+        end = day.weekday() + 1
+        return sum(self.totals[:end]), sum(self.negatives[:end])
+
+    def add(self, day: date, total: int, negative: int) -> "WeeklyEmotionCounts":
+        weekday = day.weekday()
+        totals, negatives = list(self.totals), list(self.negatives)
+        totals[weekday] += total
+        negatives[weekday] += negative
+        return replace(self, totals=tuple(totals), negatives=tuple(negatives))
+
+
+def get_week_key(user_id: int, day: date) -> Hashable:
+    iso_year, iso_week, _ = day.isocalendar()
+    return user_id, iso_year, iso_week
+
+
+def load_weekly_emotion_counts(
+    db_session: Session, user_id: int, day: date
+) -> WeeklyEmotionCounts:
+    """
+    주어진 날짜가 속한 주의 요일별 일기 개수를 하나의 집계 쿼리로 불러옵니다.
+    user_emotion_days 의 (user_id, date) 범위에서 COUNT(*) 와 COUNT(*) FILTER (WHERE emotion IN ...) 를 함께 계산합니다.
+    """
+    week_start = day - timedelta(days=day.weekday())
+    stmt = (
+        select(
+            UserEmotionDay.date,
+            func.count(),
+            func.count().filter(UserEmotionDay.emotion.in_(NEGATIVE_EMOTION_CODES)),
+        )
+        .where(
+            UserEmotionDay.user_id == user_id,
+            UserEmotionDay.date >= week_start,
+            UserEmotionDay.date <= week_start + timedelta(days=6),
+        )
+        .group_by(UserEmotionDay.date)
+    )
+    counts = WeeklyEmotionCounts(week_start=week_start)
+    for diary_date, total, negative in db_session.execute(stmt):
+        counts = counts.add(diary_date, total, negative)
+    return counts
+
+
+class WeeklyEmotionCache:
+    """
+    사용자별, ISO 주차별 감정 개수를 프로세스 메모리에 캐시합니다.
+    일기가 작성, 감정 분석, 수정, 삭제되면 트랜잭션이 커밋된 뒤 캐시된 개수를 바로 갱신하므로,
+    대부분의 경우 DB 를 조회하지 않습니다.
+    다른 워커에서 일어난 변경은 TTL 이 지난 뒤 다시 불러올 때 반영됩니다.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache: TTLCache[WeeklyEmotionCounts] = TTLCache(
+            max_size=max_size, ttl=ttl
+        )
+        self._lock = threading.Lock()
+        # 변경이 반영될 때마다 증가하는 번호와, DB 에서 불러오는 중인 주의 (불러오는 요청 수, 마지막 변경 번호)
+        self._sequence = 0
+        self._loading: dict[Hashable, tuple[int, int]] = {}
+
+    def get(self, db_session: Session, user_id: int, day: date) -> WeeklyEmotionCounts:
+        """
+        캐시된 개수를 반환하고, 캐시되지 않은 주는 DB 에서 불러와 캐시합니다.
+        불러오는 동안 같은 주에 변경이 반영되었다면, 불러온 개수에 그 변경이 포함되었는지 알 수 없으므로
+        캐시하지 않고 다음 조회 때 다시 불러옵니다.
+        """
+        key = get_week_key(user_id, day)
+        with self._lock:
+            counts = self._cache.get(key)
+            if counts is not None:
+                return counts
+            started_at = self._sequence
+            loads, changed_at = self._loading.get(key, (0, 0))
+            self._loading[key] = (loads + 1, changed_at)
+
+        try:
+            counts = load_weekly_emotion_counts(db_session, user_id, day)
+        except:
+            with self._lock:
+                self._finish_loading(key)
+            raise
+
+        with self._lock:
+            if self._finish_loading(key) <= started_at:
+                self._cache.set(key, counts)
+        return counts
+
+    def _finish_loading(self, key: Hashable) -> int:
+        """
+        불러오기가 끝났음을 기록하고, 그 주에 마지막으로 변경이 반영된 번호를 반환합니다.
+        """
+        loads, changed_at = self._loading.pop(key)
+        if loads > 1:
+            self._loading[key] = (loads - 1, changed_at)
+        return changed_at
+
+    def apply(self, user_id: int, day: date, total: int, negative: int) -> None:
+        """
+        캐시된 주의 개수를 갱신합니다. 캐시되지 않은 주는 다음 조회 때 DB 에서 불러옵니다.
+        """
+        key = get_week_key(user_id, day)
+        with self._lock:
+            self._sequence += 1
+            if key in self._loading:
+                loads, _ = self._loading[key]
+                self._loading[key] = (loads, self._sequence)
+
+            counts = self._cache.get(key)
+            if counts is not None:
+                self._cache.set(key, counts.add(day, total, negative))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+weekly_emotion_cache = WeeklyEmotionCache(
+    max_size=settings.WEEKLY_EMOTION_CACHE_MAX_SIZE,
+    ttl=settings.WEEKLY_EMOTION_CACHE_TTL_SECONDS,
+)
+
+
+def _is_negative(emotion: Emotion | None) -> int:
+    return int(emotion in NEGATIVE_EMOTIONS)
+
+
+def _get_previous_value(diary: Diary, attribute: str):
+    history = inspect(diary).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(diary, attribute)
+
+
+def _add_delta(
+    db_session: Session, user_id: int, day: date, total: int, negative: int
+) -> None:
+    if total or negative:
+        db_session.info.setdefault(WEEKLY_EMOTION_DELTAS_SESSION_KEY, []).append(
+            (user_id, day, total, negative)
+        )
+
+
+def add_inserted_diary_counts(
+    db_session: Session, user_id: int, days: Sequence[date]
+) -> None:
+    """
+    ORM 을 거치지 않고 한 번에 추가한 감정 분석 전 일기들을, 커밋되면 캐시에 반영하도록 예약합니다.
+    """
+    for day in days:
+        _add_delta(db_session, user_id, day, 1, 0)
+
+
+@event.listens_for(Diary, "after_insert")
+def _count_inserted_diary(mapper, connection, diary: Diary) -> None:
+    db_session = inspect(diary).session
+    _add_delta(
+        db_session, diary.user_id, diary.date, 1, _is_negative(diary.analyzed_emotion)
+    )
+
+
+@event.listens_for(Diary, "after_update")
+def _count_updated_diary(mapper, connection, diary: Diary) -> None:
+    state = inspect(diary)
+    if not any(
+        state.attrs[attribute].history.has_changes()
+        for attribute in ("user_id", "date", "analyzed_emotion")
+    ):
+        return
+
+    db_session = state.session
+    _add_delta(
+        db_session,
+        _get_previous_value(diary, "user_id"),
+        _get_previous_value(diary, "date"),
+        -1,
+        -_is_negative(_get_previous_value(diary, "analyzed_emotion")),
+    )
+    _add_delta(
+        db_session, diary.user_id, diary.date, 1, _is_negative(diary.analyzed_emotion)
+    )
+
+
+@event.listens_for(Diary, "after_delete")
+def _count_deleted_diary(mapper, connection, diary: Diary) -> None:
+    db_session = inspect(diary).session
+    _add_delta(
+        db_session,
+        diary.user_id,
+        diary.date,
+        -1,
+        -_is_negative(diary.analyzed_emotion),
+    )
+
+
+# 관리자 페이지는 별도의 세션을 사용하므로 모든 세션의 커밋을 확인합니다.
+@event.listens_for(Session, "after_commit")
+def _apply_weekly_emotion_deltas(db_session: Session) -> None:
+    deltas = db_session.info.pop(WEEKLY_EMOTION_DELTAS_SESSION_KEY, None)
+    for user_id, day, total, negative in deltas or ():
+        weekly_emotion_cache.apply(user_id, day, total, negative)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_weekly_emotion_deltas(db_session: Session, previous_transaction) -> None:
+    db_session.info.pop(WEEKLY_EMOTION_DELTAS_SESSION_KEY, None)
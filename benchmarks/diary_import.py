@@ -0,0 +1,85 @@
+"""
+일기 가져오기 처리량을 측정합니다. 가져온 일기는 롤백됩니다.
+
+    python -m benchmarks.diary_import --user-id 1
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+
+from application.diary_import import import_diary_batch
+from application.models import User
+from application.schemas import DIARY_IMPORT_MAX_PAST_DAYS
+from config.db import SessionLocal
+
+
+def benchmark(user_id: int, rows: int, batch_size: int) -> None:
+    """
+    설정된 DB 에서 임의의 일기 rows 개를 가져오는 시간을 측정합니다.
+    가져올 수 있는 가장 오래된 날짜부터의 날짜를 사용하며, 측정이 끝나면 롤백합니다.
+    """
+    start_date = date.today() - timedelta(days=DIARY_IMPORT_MAX_PAST_DAYS)
+    lines = [
+        (
+            line_number,
+            json.dumps(
+                {
+                    "date": (start_date + timedelta(days=line_number)).isoformat(),
+                    "weather": "맑음",
+                    "title": f"가져온 일기 {line_number}",
+                    "content": "오늘은 " * 200,
+                },
+                ensure_ascii=False,
+            ).encode(),
+        )
+        for line_number in range(1, rows + 1)
+    ]
+
+    with SessionLocal() as db_session:
+        user = db_session.get(User, user_id)
+        if user is None:
+            raise SystemExit(f"사용자를 찾을 수 없습니다: {user_id}")
+
+        created = 0
+        started_at = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            results = import_diary_batch(
+                db_session, user, lines[start : start + batch_size]
+            )
+            created += sum(result.status == "created" for result in results)
+        db_session.flush()
+        elapsed = time.perf_counter() - started_at
+        db_session.rollback()
+
+    print(
+        f"{rows}줄, 배치 {batch_size}: {elapsed:.3f}s, "
+        f"초당 {created / elapsed:.0f}개 추가 ({created}개)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="일기 가져오기 처리량을 측정합니다. 가져온 일기는 롤백됩니다."
+    )
+    parser.add_argument("--user-id", type=int, required=True, help="사용자 ID")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=3000,
+        help=f"가져올 줄 수 (최대 {DIARY_IMPORT_MAX_PAST_DAYS}, 가져올 수 있는 날짜 수)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[100, 500, 1000],
+        help="배치 크기 목록",
+    )
+    args = parser.parse_args()
+    if not 0 < args.rows <= DIARY_IMPORT_MAX_PAST_DAYS:
+        parser.error(f"--rows 는 1 이상 {DIARY_IMPORT_MAX_PAST_DAYS} 이하여야 합니다.")
+
+    for batch_size in args.batch_sizes:
+        benchmark(args.user_id, args.rows, batch_size)
@@ -0,0 +1,138 @@
+"""
+감정 통계 API 의 처리 시간을 측정합니다.
+
+    python -m benchmarks.emotion_stats --years 5
+    python -m benchmarks.emotion_stats --years 5 --user-id 1
+
+--user-id 를 주면 설정된 DB 에 해당 사용자의 임의 감정 데이터를 추가하여
+DB 조회(load_daily_emotion_codes)와 API 전체 처리 시간도 측정하고, 측정이 끝나면 롤백합니다.
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql import insert
+
+from application import create_app
+from application.emotion_stats import (
+    MAX_EMOTION_CODE,
+    Granularity,
+    compute_emotion_stats,
+    load_daily_emotion_codes,
+)
+from application.models import User, UserEmotionDay
+from config.db import SessionLocal
+from config.dependencies import get_db, get_current_user_id
+
+GRANULARITIES: tuple[Granularity, ...] = ("day", "week", "month")
+
+
+def measure(func: Callable[[], object], repeat: int) -> str:
+    """
+    한 번 실행하여 준비를 마친 뒤 repeat 번 실행한 시간의 중앙값과 최댓값을 반환합니다.
+    """
+    func()
+    elapsed = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        elapsed.append((time.perf_counter() - started_at) * 1000)
+    return f"중앙값 {np.median(elapsed):.3f}ms, 최대 {max(elapsed):.3f}ms"
+
+
+def benchmark_compute(years: int, repeat: int) -> None:
+    """
+    임의의 감정 코드 배열로 통계 계산 시간만 측정합니다.
+    """
+    start_date = date.today() - timedelta(days=365 * years)
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, MAX_EMOTION_CODE + 1, 365 * years + 1, dtype=np.int8)
+
+    for granularity in GRANULARITIES:
+        result = measure(
+            lambda: compute_emotion_stats(codes, start_date, granularity), repeat
+        )
+        print(f"계산 {years}년({len(codes)}일), {granularity}: {result}")
+
+
+def benchmark_endpoint(user_id: int, years: int, repeat: int) -> None:
+    """
+    사용자의 감정 데이터를 years 년치 채운 뒤 DB 조회 시간과 /analysis/stats 전체 처리 시간을 측정합니다.
+    이미 있는 날짜는 그대로 두며, 추가한 데이터는 측정이 끝나면 롤백합니다.
+    """
+    end_date = date.today()
+    start_date = end_date - timedelta(days=365 * years)
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, MAX_EMOTION_CODE + 1, 365 * years + 1).tolist()
+
+    with SessionLocal() as db_session:
+        if db_session.get(User, user_id) is None:
+            raise SystemExit(f"사용자를 찾을 수 없습니다: {user_id}")
+
+        stmt = insert(UserEmotionDay).values(
+            [
+                {
+                    "user_id": user_id,
+                    "date": start_date + timedelta(days=offset),
+                    "emotion": code or None,
+                }
+                for offset, code in enumerate(codes)
+            ]
+        )
+        db_session.execute(
+            stmt.on_conflict_do_nothing(
+                index_elements=[UserEmotionDay.user_id, UserEmotionDay.date]
+            )
+        )
+        db_session.flush()
+
+        # 요청도 같은 세션을 사용해야 커밋하지 않은 데이터를 조회할 수 있습니다.
+        app = create_app()
+        app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_current_user_id] = lambda: user_id
+        client = TestClient(app)
+
+        try:
+            result = measure(
+                lambda: load_daily_emotion_codes(
+                    db_session, user_id, start_date, end_date
+                ),
+                repeat,
+            )
+            print(f"DB 조회 {years}년({len(codes)}일): {result}")
+
+            for granularity in GRANULARITIES:
+                params = {
+                    "from": start_date.isoformat(),
+                    "to": end_date.isoformat(),
+                    "granularity": granularity,
+                }
+                result = measure(
+                    lambda: client.get(
+                        "/api/v1/analysis/stats", params=params
+                    ).raise_for_status(),
+                    repeat,
+                )
+                print(f"API {years}년({len(codes)}일), {granularity}: {result}")
+        finally:
+            db_session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="감정 통계 처리 시간을 측정합니다.")
+    parser.add_argument("--years", type=int, default=5, help="데이터 기간(년)")
+    parser.add_argument("--repeat", type=int, default=100, help="반복 횟수")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        help="DB 조회와 API 처리 시간을 측정할 사용자 ID. 주지 않으면 계산 시간만 측정합니다.",
+    )
+    args = parser.parse_args()
+
+    benchmark_compute(args.years, args.repeat)
+    if args.user_id is not None:
+        benchmark_endpoint(args.user_id, args.years, args.repeat)
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Annotated
 
 import jwt
@@ -5,9 +6,11 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from starlette import status
 
+from config.cache import TTLCache
 from config.db import SessionLocal
 from config.settings import settings
 from application.models import User
@@ -29,21 +32,81 @@ SessionDependency = Annotated[Session, Depends(get_db)]
 Token = Annotated[str, Depends(OAuth2PasswordBearer(tokenUrl=f"api/v1/users/login"))]
 
 
-def get_current_user(session: SessionDependency, token: Token) -> User:
+@dataclass(frozen=True)
+class UserPrincipal:
+    """인증된 사용자의 변하지 않는 식별 정보"""
+
+    id: int
+    login_id: str
+    token_version: int
+
+
+principal_cache: TTLCache[UserPrincipal] = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def get_current_principal(token: Token) -> UserPrincipal:
+    """
+    액세스 토큰을 검증하고 사용자 식별 정보를 반환합니다.
+    (사용자 ID, 토큰 버전) 으로 캐시된 정보가 있으면 DB 를 조회하지 않습니다.
+    """
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        token_data = payload.get("sub")
-    except (InvalidTokenError, ValidationError):
+        if payload.get("type") != "access":
+            raise InvalidTokenError("access 토큰이 아닙니다.")
+        user_id = int(payload["sub"])
+        token_version = int(payload["ver"])
+    except (InvalidTokenError, ValidationError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="유효하지 않은 토큰입니다.",
+        )
+
+    principal = principal_cache.get((user_id, token_version))
+    if principal:
+        return principal
+
+    with SessionLocal() as db_session:
+        stmt = select(User.id, User.login_id, User.token_version).where(
+            User.id == user_id
+        )
+        row = db_session.execute(stmt).one_or_none()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="없는 사용자입니다.")
+    if row.token_version != token_version:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="유효하지 않은 토큰입니다.",
         )
 
-    user = session.query(User).filter(User.login_id == token_data).first()
+    principal = UserPrincipal(
+        id=row.id,
+        login_id=row.login_id,
+        token_version=row.token_version,
+    )
+    principal_cache.set((user_id, token_version), principal)
+    return principal
+
+
+CurrentPrincipal = Annotated[UserPrincipal, Depends(get_current_principal)]
+
+
+def get_current_user_id(principal: CurrentPrincipal) -> int:
+    return principal.id
+
+
+CurrentUserId = Annotated[int, Depends(get_current_user_id)]
+
+
+def get_current_user(session: SessionDependency, principal: CurrentPrincipal) -> User:
+    user = session.get(User, principal.id)
 
     if not user:
         raise HTTPException(status_code=404, detail="없는 사용자입니다.")
@@ -0,0 +1,251 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Annotated, Dict, Protocol
+
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import text
+from starlette import status
+from starlette.requests import Request
+
+from config.db import engine
+from config.settings import settings
+
+
+class RateLimitStore(Protocol):
+    def hit(self, key: str, bucket: int, previous_bucket: int) -> tuple[int, int]:
+        """
+        현재 구간의 카운트를 1 증가시키고, (현재 구간 카운트, 이전 구간 카운트) 를 반환합니다.
+        """
+        ...
+
+
+class MemoryRateLimitStore:
+    """
+    프로세스 메모리에 카운트를 저장합니다. 워커마다 카운트가 따로 유지됩니다.
+    키가 max_keys 개를 넘으면 가장 오래 사용되지 않은 키부터 버립니다.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: OrderedDict[str, dict[int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, bucket: int, previous_bucket: int) -> tuple[int, int]:
+        with self._lock:
+            counters = self._counters.get(key)
+            if counters is None:
+                counters = self._counters[key] = {}
+                # 매번 다른 키로 시도하더라도 키의 수가 max_keys 를 넘지 않습니다.
+                while len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+
+            for stale_bucket in [b for b in counters if b < previous_bucket]:
+                del counters[stale_bucket]
+            counters[bucket] = counters.get(bucket, 0) + 1
+            return counters[bucket], counters.get(previous_bucket, 0)
+
+
+class PostgresRateLimitStore:
+    """
+    rate_limit_counters 테이블에 카운트를 저장하여 여러 워커가 카운트를 공유합니다.
+    요청의 트랜잭션과 별개로 즉시 커밋되므로, 요청이 실패해도 시도 횟수는 남습니다.
+    """
+
+    statement = text(
+        """
+        WITH hit AS (
+            INSERT INTO rate_limit_counters (key, bucket, count)
+            VALUES (:key, :bucket, 1)
+            ON CONFLICT (key, bucket)
+            DO UPDATE SET count = rate_limit_counters.count + 1
+            RETURNING count
+        )
+        SELECT
+            (SELECT count FROM hit),
+            COALESCE(
+                (
+                    SELECT count FROM rate_limit_counters
+                    WHERE key = :key AND bucket = :previous_bucket
+                ),
+                0
+            )
+        """
+    )
+
+    def hit(self, key: str, bucket: int, previous_bucket: int) -> tuple[int, int]:
+        with engine.begin() as connection:
+            row = connection.execute(
+                self.statement,
+                {"key": key, "bucket": bucket, "previous_bucket": previous_bucket},
+            ).one()
+        return row[0], row[1]
+
+
+class SlidingWindowLimiter:
+    """
+    슬라이딩 윈도우 카운터 방식으로 window 초 동안 limit 회까지 허용합니다.
+    이전 구간의 카운트를 경과 시간에 비례해 줄여 현재 구간의 카운트와 더한 값을 사용합니다.
+    """
+
+    def __init__(self, name: str, limit: int, window: int, store: RateLimitStore):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.store = store
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+
+    def hit(self, key: str) -> float | None:
+        """
+        시도를 기록합니다. 허용되면 None, 거부되면 다시 시도할 수 있을 때까지의 초를 반환합니다.
+        """
+        now = time.time()
+        bucket = int(now // self.window) * self.window
+        previous_bucket = bucket - self.window
+        # 로그인 ID 처럼 길이가 제한되지 않은 키도 저장할 수 있도록 해시로 저장합니다.
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        current_count, previous_count = self.store.hit(
+            f"{self.name}:{digest}", bucket, previous_bucket
+        )
+
+        elapsed_ratio = (now - bucket) / self.window
+        estimated_count = previous_count * (1 - elapsed_ratio) + current_count
+
+        with self._lock:
+            if estimated_count <= self.limit:
+                self._allowed += 1
+                return None
+            self._rejected += 1
+        return bucket + self.window - now
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "window_seconds": self.window,
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+            }
+
+
+def create_rate_limit_store() -> RateLimitStore:
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresRateLimitStore()
+    return MemoryRateLimitStore()
+
+
+_rate_limit_store = create_rate_limit_store()
+
+login_id_limiter = SlidingWindowLimiter(
+    name="login:id",
+    limit=settings.LOGIN_ATTEMPTS_PER_LOGIN_ID,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    store=_rate_limit_store,
+)
+login_ip_limiter = SlidingWindowLimiter(
+    name="login:ip",
+    limit=settings.LOGIN_ATTEMPTS_PER_IP,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    store=_rate_limit_store,
+)
+signup_ip_limiter = SlidingWindowLimiter(
+    name="signup:ip",
+    limit=settings.SIGNUP_ATTEMPTS_PER_IP,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    store=_rate_limit_store,
+)
+
+user_export_limiter = SlidingWindowLimiter(
+    name="export:user",
+    limit=settings.EXPORTS_PER_USER,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    store=_rate_limit_store,
+)
+user_import_limiter = SlidingWindowLimiter(
+    name="import:user",
+    limit=settings.DIARY_IMPORTS_PER_USER,
+    window=settings.RATE_LIMIT_WINDOW_SECONDS,
+    store=_rate_limit_store,
+)
+
+
+def get_rate_limit_metrics() -> Dict[str, Dict[str, int]]:
+    return {
+        limiter.name: limiter.metrics()
+        for limiter in (
+            login_id_limiter,
+            login_ip_limiter,
+            signup_ip_limiter,
+            user_export_limiter,
+            user_import_limiter,
+        )
+    }
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    nginx 가 추가한 X-Forwarded-For 의 마지막 값을 클라이언트 IP 로 사용합니다.
+    앞쪽 값은 클라이언트가 임의로 보낼 수 있으므로 사용하지 않습니다.
+    """
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if forwarded_for:
+        return forwarded_for.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _raise_too_many_requests(retry_after: float) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="시도 횟수가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
+
+def limit_login_attempts(
+    request: Request,
+    oauth2_formdata: Annotated[OAuth2PasswordRequestForm, Depends()],
+) -> None:
+    """
+    비밀번호를 검증하기 전에 로그인 ID 와 IP 별 로그인 시도 횟수를 확인합니다.
+    """
+    for limiter, key in (
+        (login_ip_limiter, get_client_ip(request)),
+        (login_id_limiter, oauth2_formdata.username),
+    ):
+        retry_after = limiter.hit(key)
+        if retry_after is not None:
+            _raise_too_many_requests(retry_after)
+
+
+def limit_signup_attempts(request: Request) -> None:
+    """
+    비밀번호를 해시하기 전에 IP 별 회원가입 시도 횟수를 확인합니다.
+    """
+    retry_after = signup_ip_limiter.hit(get_client_ip(request))
+    if retry_after is not None:
+        _raise_too_many_requests(retry_after)
+
+
+def limit_user_exports(user_id: int) -> None:
+    """
+    압축 파일을 만들기 전에 사용자별 데이터 내보내기 횟수를 확인합니다.
+    """
+    retry_after = user_export_limiter.hit(str(user_id))
+    if retry_after is not None:
+        _raise_too_many_requests(retry_after)
+
+
+def limit_user_imports(user_id: int) -> None:
+    """
+    요청 본문을 읽기 전에 사용자별 일기 가져오기 횟수를 확인합니다.
+    """
+    retry_after = user_import_limiter.hit(str(user_id))
+    if retry_after is not None:
+        _raise_too_many_requests(retry_after)
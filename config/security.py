@@ -1,25 +1,152 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, TypeVar
 
 import jwt
 from passlib.context import CryptContext
 
 from config.settings import settings
 
+T = TypeVar("T")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasherBusy(Exception):
+    """비밀번호 해시 작업 대기열이 가득 찬 경우 발생하는 예외"""
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    bcrypt 연산을 크기가 제한된 별도 프로세스 풀에서 실행합니다.
+    CPU 를 오래 점유하는 해시 연산이 API 워커의 GIL 을 잡지 않도록 하고,
+    대기 중인 작업이 max_pending 을 넘으면 PasswordHasherBusy 를 발생시킵니다.
+    워커 프로세스가 비정상 종료되어 풀이 망가지면 새 풀을 만들어 한 번 재시도합니다.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _replace_broken_executor(
+        self, broken: ProcessPoolExecutor
+    ) -> ProcessPoolExecutor:
+        """
+        망가진 풀을 버리고 새 풀을 반환합니다.
+        여러 요청이 동시에 같은 풀의 실패를 발견해도 풀은 한 번만 다시 만들어집니다.
+        """
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                self._restarts += 1
+                broken.shutdown(wait=False, cancel_futures=True)
+            return self._get_executor()
+
+    def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+            executor = self._get_executor()
+
+        try:
+            try:
+                return executor.submit(func, *args).result()
+            except BrokenProcessPool:
+                executor = self._replace_broken_executor(executor)
+                return executor.submit(func, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash_password, password)
+
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return self._run(_verify_and_update_password, plain_password, hashed_password)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "restarts": self._restarts,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 
 def verify_password(plain_password, hashed_password) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    verified, _ = password_hasher.verify_and_update(plain_password, hashed_password)
+    return verified
+
+
+def verify_and_update_password(
+    plain_password, hashed_password
+) -> tuple[bool, str | None]:
+    """
+    비밀번호를 검증하고, 해시 설정(BCRYPT_ROUNDS 등)이 바뀌었다면 새 해시를 함께 반환합니다.
+    """
+    return password_hasher.verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
-def create_access_token(sub: str) -> str:
-    to_encode = {"sub": sub}
+def create_access_token(sub: str, token_version: int) -> str:
+    to_encode = {"sub": sub, "ver": token_version}
     expire = datetime.now() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire, "type": "access"})
 
@@ -30,9 +157,19 @@ def create_access_token(sub: str) -> str:
     )
 
 
-def create_refresh_token(sub: str) -> str:
-    to_encode = {"sub": sub}
-    expire = datetime.now() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+def create_refresh_token(
+    sub: str,
+    token_version: int,
+    family_id: int,
+    generation: int,
+    expire: datetime,
+) -> str:
+    to_encode = {
+        "sub": sub,
+        "ver": token_version,
+        "fam": family_id,
+        "gen": generation,
+    }
     to_encode.update({"exp": expire, "type": "refresh"})
 
     return jwt.encode(
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +19,44 @@ class Settings(BaseSettings):
 
     UPLOAD_DIR: str = "uploads"
 
+    # 업로드 파일 저장소 (s3 는 boto3 가 필요하며, s3 extra 로 설치합니다.)
+    STORAGE_BACKEND: Literal["local", "s3"] = "local"
+    S3_BUCKET: str | None = None
+    S3_ENDPOINT_URL: str | None = None
+    S3_REGION: str | None = None
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_PUBLIC_URL: str | None = None
+    S3_PRESIGNED_URL_EXPIRE_SECONDS: int = 300
+    S3_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+
+    UNREFERENCED_FILE_GRACE_SECONDS: int = 86400
+    UNREFERENCED_FILE_REAP_INTERVAL_SECONDS: int = 3600
+    UPLOAD_GC_INTERVAL_SECONDS: int = 86400
+    UPLOAD_GC_GRACE_SECONDS: int = 86400
+    UPLOAD_GC_DRY_RUN: bool = False
+
+    # 감정 통계 테이블 파티션
+    USER_EMOTION_DAY_PARTITION_INTERVAL_SECONDS: int = 86400
+    USER_EMOTION_DAY_PARTITION_MONTHS_AHEAD: int = 3
+
+    # 관리자 통계
+    ANALYTICS_REFRESH_INTERVAL_SECONDS: int = 600
+    ANALYTICS_DASHBOARD_DAYS: int = 30
+
+    # 크기별 WebP 이미지 생성
+    IMAGE_VARIANT_WORKERS: int = 2
+    IMAGE_VARIANT_MAX_PENDING: int = 64
+
+    # 일기 가져오기
+    DIARY_IMPORT_BATCH_SIZE: int = 500
+    DIARY_IMPORT_MAX_ROWS: int = 10000
+
+    # 가져온 일기의 감정 분석
+    EMOTION_ANALYSIS_WORKERS: int = 2
+    EMOTION_ANALYSIS_BATCH_SIZE: int = 50
+    EMOTION_ANALYSIS_MAX_PENDING: int = 100
+
     POSTGRES_SERVER: str
     POSTGRES_PORT: int
     POSTGRES_USER: str
@@ -28,6 +68,36 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+
+    # 비밀번호 해시
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # 로그인/회원가입/데이터 내보내기/일기 가져오기 시도 제한
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    RATE_LIMIT_WINDOW_SECONDS: int = 300
+    LOGIN_ATTEMPTS_PER_LOGIN_ID: int = 10
+    LOGIN_ATTEMPTS_PER_IP: int = 50
+    SIGNUP_ATTEMPTS_PER_IP: int = 10
+    EXPORTS_PER_USER: int = 3
+    DIARY_IMPORTS_PER_USER: int = 3
+
+    # 상점 카탈로그의 base_url 별 이미지 URL 캐시
+    STORE_CATALOG_URL_CACHE_TTL_SECONDS: int = 3600
+    STORE_CATALOG_URL_CACHE_MAX_SIZE: int = 8
+
+    # 인증된 사용자 정보 캐시
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # 사용자별 주간 감정 개수 캐시
+    WEEKLY_EMOTION_CACHE_TTL_SECONDS: int = 600
+    WEEKLY_EMOTION_CACHE_MAX_SIZE: int = 10000
+
+    # Coin ledger
+    COIN_LEDGER_COMPACT_INTERVAL_SECONDS: int = 300
 
     # OpenAI
     OPENAI_API_KEY: str